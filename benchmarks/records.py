@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+"""
+Compare munchify with the lazy records on a products page, for a job that
+reads only a few fields of each item.
+
+    $ python -m benchmarks.records
+"""
+import json
+import timeit
+import tracemalloc
+
+from munch import munchify
+
+from tiendanube.resources.records import Product, to_records
+
+from .serializers import product
+
+
+def touch(page):
+    return [(p.id, p.variants[0].sku) for p in page]
+
+
+def measure(label, convert, data, number):
+    seconds = timeit.timeit(lambda: touch(convert(json.loads(data))),
+                            number=number)
+    tracemalloc.start()
+    page = convert(json.loads(data))
+    touch(page)
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print('{:<10} {:>10.3f} ms {:>10.1f} KiB held {:>10.1f} KiB peak'.format(
+        label, seconds * 1000 / number, current / 1024.0, peak / 1024.0))
+
+
+def main(number=20):
+    data = json.dumps([product(i) for i in range(200)])
+    measure('munchify', munchify, data, number)
+    measure('records', lambda page: to_records(page, Product), data, number)
+
+
+if __name__ == '__main__':
+    main()
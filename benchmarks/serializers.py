@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+"""
+Compare the JSON backends on product and order payloads shaped like the
+API's.
+
+    $ python -m benchmarks.serializers
+"""
+import datetime
+import timeit
+
+from tiendanube.serializers import SERIALIZERS
+
+
+def product(i):
+    return {
+        'id': i,
+        'name': {'es': u'Remera básica {}'.format(i), 'pt': u'Camiseta {}'.format(i)},
+        'description': {'es': u'<p>Algodón peinado, corte recto.</p>' * 5},
+        'handle': {'es': 'remera-basica-{}'.format(i)},
+        'published': True,
+        'free_shipping': False,
+        'tags': 'verano,algodon,basicos',
+        'created_at': '2024-01-10T12:00:00+0000',
+        'updated_at': '2024-03-01T09:30:00+0000',
+        'categories': [{'id': c, 'name': {'es': 'Cat {}'.format(c)}} for c in range(3)],
+        'images': [{'id': i * 10 + n, 'src': 'https://cdn.example.com/{}/{}.jpg'.format(i, n),
+                    'position': n} for n in range(4)],
+        'variants': [{'id': i * 100 + n, 'product_id': i, 'price': '1999.00',
+                      'promotional_price': None, 'stock': n * 3,
+                      'sku': 'SKU-{}-{}'.format(i, n), 'weight': '0.300',
+                      'values': [{'es': 'Talle {}'.format(n)}, {'es': 'Rojo'}]}
+                     for n in range(12)],
+    }
+
+
+def order(i):
+    return {
+        'id': i,
+        'number': 1000 + i,
+        'status': 'open',
+        'payment_status': 'paid',
+        'currency': 'ARS',
+        'total': '5997.00',
+        'contact_email': 'buyer{}@example.com'.format(i),
+        'customer': {'id': i, 'name': 'Buyer {}'.format(i), 'email': 'buyer{}@example.com'.format(i)},
+        'shipping_address': {'address': 'Av. Siempre Viva', 'number': '742', 'city': 'CABA'},
+        'products': [{'product_id': n, 'variant_id': n * 100, 'quantity': 1,
+                      'price': '1999.00', 'name': u'Remera básica {}'.format(n)}
+                     for n in range(3)],
+        'created_at': datetime.datetime(2024, 3, 1, 10, 30).isoformat(),
+    }
+
+
+def main(number=20):
+    payloads = {
+        'products page (200)': [product(i) for i in range(200)],
+        'orders page (200)': [order(i) for i in range(200)],
+        'price update': {'id': 1, 'price': '2099.00', 'promotional_price': '1899.00'},
+    }
+    print('{:<22} {:<8} {:>12} {:>12}'.format('payload', 'backend', 'dumps ms', 'loads ms'))
+    for label, payload in payloads.items():
+        for klass, module in SERIALIZERS:
+            if module is None:
+                continue
+            serializer = klass()
+            encoded = serializer.dumps(payload)
+            repeat = number if isinstance(payload, list) else number * 1000
+            dumps = timeit.timeit(lambda: serializer.dumps(payload), number=repeat)
+            loads = timeit.timeit(lambda: serializer.loads(encoded), number=repeat)
+            print('{:<22} {:<8} {:>12.4f} {:>12.4f}'.format(
+                label, serializer.name, dumps * 1000 / repeat, loads * 1000 / repeat))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+"""
+Compare building request URLs with a new furl object per call, as
+``APIClient.get_url`` used to, with the cached route builder.
+
+    $ python -m benchmarks.urls
+"""
+import timeit
+
+from furl import furl
+
+from tiendanube.api import APIClient
+from tiendanube.urls import build_url
+
+CALLS = [
+    ('46', 'products', []),
+    ('46', 'products', ['1234']),
+    ('46', 'products', ['1234', 'variants', '99']),
+    ('1017', 'orders', ['5678', 'close']),
+]
+
+
+def with_furl(id, resource, options):
+    url = furl(APIClient.API_ENDPOINT)
+    url.path.segments = [APIClient.API_VERSION, id]
+    if resource:
+        url.path.segments.append(resource)
+    url.path.segments.extend(options)
+    return str(url)
+
+
+def with_builder(id, resource, options):
+    return build_url(APIClient.API_ENDPOINT, APIClient.API_VERSION, id,
+                     resource, options)
+
+
+def measure(label, build, number):
+    seconds = timeit.timeit(lambda: [build(*call) for call in CALLS],
+                            number=number)
+    rate = number * len(CALLS) / seconds
+    print('{:<8} {:>12,.0f} URLs/s'.format(label, rate))
+    return rate
+
+
+def main(number=20000):
+    for call in CALLS:
+        assert with_furl(*call) == with_builder(*call)
+    before = measure('furl', with_furl, number)
+    after = measure('builder', with_builder, number)
+    print('{:.1f}x faster'.format(after / before))
+
+
+if __name__ == '__main__':
+    main()
@@ -10,6 +10,7 @@ setup(
     packages = [
         'tiendanube',
         'tiendanube.resources',
+        'tiendanube.aio',
     ],
     version = '1.2.2',
     description = '',
@@ -33,6 +34,9 @@ setup(
         "pytz==2024.1",
         "requests==2.31.0",
     ],
+    extras_require = {
+        'async': ["aiohttp>=3.9"],
+    },
 
     classifiers = (
         'Development Status :: 4 - Beta',
@@ -0,0 +1,139 @@
+import asyncio
+import json
+import unittest
+
+try:
+    from aiohttp import web
+    from aiohttp.test_utils import TestServer
+
+    from tiendanube.aio import AsyncAPIClient, AsyncNubeClient
+except ImportError:  # pragma: no cover
+    web = None
+
+from tiendanube.resources.exceptions import APIError
+from tiendanube.retry import RetryPolicy
+
+
+@unittest.skipUnless(web, 'aiohttp is not installed')
+class AsyncClientTest(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.requests = []
+        app = web.Application()
+        app.router.add_route('*', '/v1/{store}/{tail:.*}', self.handle)
+        self.server = TestServer(app)
+        await self.server.start_server()
+        self.client = AsyncNubeClient('test_api_key')
+        self.client._http_client.API_ENDPOINT = str(self.server.make_url(''))
+        self.store = self.client.get_store(46)
+
+    async def asyncTearDown(self):
+        await self.client.close()
+        await self.server.close()
+
+    async def handle(self, request):
+        body = await request.read()
+        self.requests.append((request.method, request.path,
+                              dict(request.query), body, request.headers))
+        tail = request.match_info['tail']
+        if tail == 'store':
+            return web.json_response({'id': 46, 'name': 'test store'})
+        if tail == 'products/404':
+            return web.json_response({'code': 404}, status=404,
+                                     reason='Not Found')
+        if (tail in ['products', 'products/991/variants'] and
+                request.method == 'GET'):
+            page = int(request.query.get('page', 1))
+            headers = {}
+            if page < 3:
+                headers['Link'] = '<{}?page={}>; rel="next"'.format(
+                    request.url, page + 1)
+            return web.json_response([{'id': page}], headers=headers)
+        if request.method in ['POST', 'PUT']:
+            return web.json_response(json.loads(body), status=201)
+        return web.json_response({'id': 991, 'name': 'test prod'})
+
+    async def test_get_store_info(self):
+        res = await self.store.get_info()
+
+        self.assertEqual({'id': 46, 'name': 'test store'}, res)
+        method, path, query, body, headers = self.requests[-1]
+        self.assertEqual(('GET', '/v1/46/store'), (method, path))
+        self.assertEqual('bearer test_api_key', headers['Authentication'])
+
+    async def test_get_product(self):
+        res = await self.store.products.get(991)
+
+        self.assertEqual('test prod', res.name)
+        self.assertEqual('/v1/46/products/991', self.requests[-1][1])
+
+    async def test_list_products_follows_pages(self):
+        pages = [page async for page in self.store.products.list(
+            filters={'published': 'true'}, fields='id')]
+
+        self.assertEqual([[{'id': 1}], [{'id': 2}], [{'id': 3}]], pages)
+        self.assertEqual({'published': 'true', 'fields': 'id', 'page': '3'},
+                         self.requests[-1][2])
+
+    async def test_list_variants_follows_pages(self):
+        pages = [page async for page in self.store.products.variants.list(
+            991, fields='id')]
+
+        self.assertEqual([[{'id': 1}], [{'id': 2}], [{'id': 3}]], pages)
+        self.assertEqual(('/v1/46/products/991/variants',
+                          {'fields': 'id', 'page': '3'}),
+                         self.requests[-1][1:3])
+
+    async def test_add_product(self):
+        res = await self.store.products.add({'name': {'es': 'nuevo'}})
+
+        self.assertEqual({'name': {'es': 'nuevo'}}, res)
+        method, path, query, body, headers = self.requests[-1]
+        self.assertEqual(('POST', '/v1/46/products'), (method, path))
+        self.assertEqual('application/json; charset=utf-8',
+                         headers['Content-Type'])
+
+    async def test_update_variant(self):
+        res = await self.store.products.variants.update(
+            991, {'id': 1, 'price': '10.00'})
+
+        self.assertEqual('10.00', res.price)
+        self.assertEqual(('PUT', '/v1/46/products/991/variants/1'),
+                         self.requests[-1][:2])
+
+    async def test_error_raises_api_error(self):
+        with self.assertRaises(APIError):
+            await self.store.products.get(404)
+
+    async def test_map_stores(self):
+        async def job(store):
+            if store.store.store_id == '2':
+                raise ValueError('broken store')
+            return (await store.get_info())['name']
+
+        seen = []
+        results = [r async for r in self.client.map_stores(
+            [1, 2, 3], job, concurrency=2,
+            progress=lambda result, done, total: seen.append((done, total)))]
+
+        self.assertEqual({1: 'test store', 3: 'test store'},
+                         {r.store_id: r.result for r in results if r.ok})
+        self.assertEqual([2], [r.store_id for r in results if not r.ok])
+        self.assertEqual([(1, 3), (2, 3), (3, 3)], seen)
+
+
+@unittest.skipUnless(web, 'aiohttp is not installed')
+class AsyncRetryPolicyTest(unittest.TestCase):
+
+    def test_aiohttp_errors_are_retried(self):
+        import aiohttp
+        policy = RetryPolicy()
+        cli = AsyncAPIClient('test_api_key', 'test user agent',
+                             retry_policy=policy)
+
+        self.assertTrue(cli.retry_policy.should_retry(
+            'get', 1, error=aiohttp.ClientConnectionError()))
+        self.assertTrue(cli.retry_policy.should_retry(
+            'get', 1, error=asyncio.TimeoutError()))
+        self.assertFalse(policy.should_retry(
+            'get', 1, error=aiohttp.ClientConnectionError()))
@@ -0,0 +1,219 @@
+import json
+import os
+import subprocess
+import sys
+import unittest
+
+import requests
+from mock import Mock, patch
+
+from tiendanube.api import APIClient
+from tiendanube.client import NubeClient
+from tiendanube.ratelimit import RateLimiter
+from tiendanube.retry import RetryPolicy
+from tiendanube.resources import ProductResource
+from tiendanube.resources.exceptions import APIError
+
+
+class APIClientPoolTest(unittest.TestCase):
+
+    @patch('tiendanube.api.requests.Session')
+    def test_resources_share_session(self, session_mock):
+        requests_mock = session_mock.return_value
+        response_mock = Mock()
+        response_mock.status_code = 200
+        response_mock.content = json.dumps({'id': 1})
+        requests_mock.get.return_value = response_mock
+        client = NubeClient('test_api_key')
+
+        client.get_store(46).products.get(1)
+        client.get_store(47).customers.get(1)
+
+        session_mock.assert_called_once_with()
+        self.assertEqual(2, requests_mock.get.call_count)
+
+    @patch('tiendanube.api.HTTPAdapter')
+    @patch('tiendanube.api.requests.Session')
+    def test_pool_options(self, session_mock, adapter_mock):
+        APIClient('test_api_key', 'test user agent',
+                  pool_connections=2, pool_maxsize=20, pool_block=True)
+
+        adapter_mock.assert_called_once_with(pool_connections=2,
+                                             pool_maxsize=20,
+                                             pool_block=True)
+        session_mock.return_value.mount.assert_any_call(
+            'https://', adapter_mock.return_value)
+
+    @patch('tiendanube.api.requests.Session')
+    def test_context_manager_closes_session(self, session_mock):
+        with NubeClient('test_api_key') as client:
+            client.get_store(46)
+
+        session_mock.return_value.close.assert_called_once_with()
+
+    @patch('tiendanube.api.time')
+    @patch('tiendanube.api.requests.Session')
+    def test_idle_pool_is_recycled(self, session_mock, time_mock):
+        requests_mock = session_mock.return_value
+        response_mock = Mock()
+        response_mock.status_code = 200
+        response_mock.content = json.dumps({'id': 1})
+        requests_mock.get.return_value = response_mock
+        cli = APIClient('test_api_key', 'test user agent', keep_alive=30)
+        p = ProductResource(cli, '46')
+
+        time_mock.monotonic.return_value = 100
+        p.get(1)
+        time_mock.monotonic.return_value = 110
+        p.get(1)
+        self.assertFalse(requests_mock.close.called)
+
+        time_mock.monotonic.return_value = 200
+        p.get(1)
+        requests_mock.close.assert_called_once_with()
+
+
+class RateLimiterTest(unittest.TestCase):
+
+    @patch('tiendanube.ratelimit.time')
+    def test_reserve_waits_once_bucket_is_full(self, time_mock):
+        time_mock.monotonic.return_value = 0
+        limiter = RateLimiter(capacity=4, leak_rate=2.0, margin=1)
+
+        delays = [limiter.reserve('46') for _ in range(5)]
+
+        self.assertEqual([0.0, 0.0, 0.0, 0.5, 1.0], delays)
+        self.assertEqual(0.0, limiter.reserve('47'))
+
+    @patch('tiendanube.ratelimit.time')
+    def test_bucket_leaks_over_time(self, time_mock):
+        time_mock.monotonic.return_value = 0
+        limiter = RateLimiter(capacity=4, leak_rate=2.0, margin=1)
+        for _ in range(3):
+            limiter.reserve('46')
+
+        time_mock.monotonic.return_value = 1
+        self.assertEqual(0.0, limiter.reserve('46'))
+
+    @patch('tiendanube.ratelimit.time')
+    def test_update_from_headers(self, time_mock):
+        time_mock.monotonic.return_value = 0
+        limiter = RateLimiter(capacity=40, leak_rate=2.0, margin=1)
+
+        limiter.update('46', 200, {
+            'x-rate-limit-limit': '10',
+            'x-rate-limit-remaining': '1',
+            'x-rate-limit-reset': '3000',
+        })
+
+        # 9 used out of 10, draining at 3 per second.
+        self.assertEqual(1 / 3.0, limiter.reserve('46'))
+
+    @patch('tiendanube.ratelimit.time')
+    def test_too_many_requests_fills_bucket(self, time_mock):
+        time_mock.monotonic.return_value = 0
+        limiter = RateLimiter(capacity=4, leak_rate=2.0, margin=1)
+
+        limiter.update('46', 429, {})
+
+        self.assertEqual(1.0, limiter.reserve('46'))
+
+    @patch('tiendanube.ratelimit.time')
+    @patch('tiendanube.api.requests.Session')
+    def test_too_many_requests_is_requeued(self, session_mock, time_mock):
+        time_mock.monotonic.return_value = 0
+        requests_mock = session_mock.return_value
+        throttled = Mock(status_code=429, headers={})
+        ok = Mock(status_code=200, headers={},
+                  content=json.dumps({'id': 1}))
+        requests_mock.get.side_effect = [throttled, ok]
+        cli = APIClient('test_api_key', 'test user agent',
+                        rate_limiter=RateLimiter(capacity=4, leak_rate=2.0))
+        p = ProductResource(cli, '46')
+
+        self.assertEqual({'id': 1}, p.get(1))
+
+        self.assertEqual(2, requests_mock.get.call_count)
+        time_mock.sleep.assert_called_once_with(1.0)
+        throttled.close.assert_called_once_with()
+
+    @patch('tiendanube.resources.base.time')
+    @patch('tiendanube.ratelimit.time')
+    @patch('tiendanube.api.requests.Session')
+    def test_too_many_requests_is_not_retried_by_resources(self, session_mock,
+                                                           time_mock,
+                                                           resource_time_mock):
+        time_mock.monotonic.return_value = 0
+        requests_mock = session_mock.return_value
+        requests_mock.get.return_value = Mock(
+            status_code=429, reason='Too Many Requests', text='', headers={})
+        cli = APIClient('test_api_key', 'test user agent',
+                        rate_limiter=RateLimiter(max_requeues=3))
+        p = ProductResource(cli, '46')
+
+        with self.assertRaises(APIError) as cm:
+            p.get(1)
+
+        self.assertEqual(429, cm.exception.code)
+        self.assertEqual(4, requests_mock.get.call_count)
+        resource_time_mock.sleep.assert_not_called()
+
+
+class RetryPolicyTest(unittest.TestCase):
+
+    def test_retries_idempotent_verbs_on_server_errors(self):
+        policy = RetryPolicy(max_attempts=3)
+
+        self.assertTrue(policy.should_retry('GET', 1, 502))
+        self.assertTrue(policy.should_retry('put', 2, 503))
+        self.assertFalse(policy.should_retry('GET', 3, 502))
+        self.assertFalse(policy.should_retry('post', 1, 502))
+        self.assertFalse(policy.should_retry('GET', 1, 404))
+
+    def test_too_many_requests_is_left_to_the_rate_limiter(self):
+        policy = RetryPolicy()
+
+        self.assertFalse(policy.should_retry('get', 1, 429))
+
+    def test_too_many_requests_is_retried_for_every_verb(self):
+        policy = RetryPolicy(statuses=(429, 503))
+
+        self.assertTrue(policy.should_retry('post', 1, 429))
+
+    def test_transport_errors(self):
+        policy = RetryPolicy()
+
+        self.assertTrue(policy.should_retry(
+            'get', 1, error=requests.ConnectionError()))
+        self.assertFalse(policy.should_retry(
+            'post', 1, error=requests.ConnectionError()))
+        self.assertFalse(policy.should_retry('get', 1, error=ValueError()))
+
+    def test_sync_client_does_not_import_aiohttp(self):
+        code = ('import sys, tiendanube.api, tiendanube.client; '
+                'sys.exit("aiohttp" in sys.modules)')
+        env = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+        self.assertEqual(0, subprocess.call([sys.executable, '-c', code],
+                                            env=env))
+
+    def test_exponential_backoff(self):
+        policy = RetryPolicy(backoff_factor=0.5, max_backoff=3, jitter=False)
+
+        self.assertEqual([0.5, 1, 2, 3],
+                         [policy.get_delay(a) for a in range(1, 5)])
+
+    def test_jitter_stays_below_backoff(self):
+        policy = RetryPolicy(backoff_factor=1, jitter=True)
+
+        for _ in range(20):
+            self.assertTrue(0 <= policy.get_delay(3) <= 4)
+
+    def test_retry_after_header(self):
+        policy = RetryPolicy(max_backoff=30)
+
+        self.assertEqual(7.0, policy.get_delay(
+            1, Mock(headers={'retry-after': '7'})))
+        self.assertEqual(30, policy.get_delay(
+            1, Mock(headers={'retry-after': '120'})))
+        self.assertEqual(0.0, policy.get_delay(
+            1, Mock(headers={'retry-after': 'Wed, 21 Oct 2015 07:28:00 GMT'})))
@@ -0,0 +1,178 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from mock import Mock, patch
+
+from tiendanube.api import APIClient
+from tiendanube.cache import CacheEntry, DiskCache, MemoryCache, get_cache_key
+from tiendanube.resources import ProductResource, StoreResource
+
+
+def response(status_code, body=None, headers=None):
+    return Mock(status_code=status_code, reason='',
+                content=json.dumps(body).encode('utf-8'),
+                headers=headers or {}, links={})
+
+
+class MemoryCacheTest(unittest.TestCase):
+
+    def test_evicts_least_recently_used(self):
+        cache = MemoryCache(maxsize=2)
+        cache.set('a?', 1)
+        cache.set('b?', 2)
+        cache.get('a?')
+        cache.set('c?', 3)
+
+        self.assertEqual(1, cache.get('a?'))
+        self.assertIsNone(cache.get('b?'))
+        self.assertEqual(3, cache.get('c?'))
+
+    def test_delete_prefix(self):
+        cache = MemoryCache()
+        for key in ['/products?', '/products/1?', '/products/1/images?',
+                    '/products/10?']:
+            cache.set(key, key)
+
+        cache.delete_prefix('/products/1/')
+        cache.delete_prefix('/products/1?')
+
+        self.assertEqual(['/products/10?', '/products?'],
+                         sorted(cache._entries))
+
+
+class DiskCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_round_trip(self):
+        cache = DiskCache(self.directory, ttl=30)
+        cache.set('/store?', CacheEntry(b'{}', {'etag': '"1"'}, 10))
+
+        entry = DiskCache(self.directory).get('/store?')
+
+        self.assertEqual(b'{}', entry.content)
+        self.assertEqual({'If-None-Match': '"1"'}, entry.validators)
+        self.assertIsNone(cache.get('/other?'))
+
+    def test_delete_prefix_and_clear(self):
+        cache = DiskCache(self.directory)
+        cache.set('/products?', CacheEntry(b'[]', {}, 10))
+        cache.set('/store?', CacheEntry(b'{}', {}, 10))
+
+        cache.delete_prefix('/products')
+        self.assertIsNone(cache.get('/products?'))
+        self.assertIsNotNone(cache.get('/store?'))
+
+        cache.clear()
+        self.assertIsNone(cache.get('/store?'))
+
+    def test_delete_prefix_matches_keys_like_memory_cache(self):
+        keys = ['/products?', '/products?page=2', '/products/1?',
+                '/products/1?fields=id', '/products/1/images?',
+                '/products/1/images/3?', '/products/10?', '/orders/1?']
+        for prefix in ['/products/1/', '/products/1?', '/products?page',
+                       '/products', '/prod', '/', '/products/1?fields']:
+            disk = DiskCache(tempfile.mkdtemp(dir=self.directory))
+            memory = MemoryCache()
+            for key in keys:
+                disk.set(key, CacheEntry(key.encode('utf-8'), {}, 10))
+                memory.set(key, key)
+
+            disk.delete_prefix(prefix)
+            memory.delete_prefix(prefix)
+
+            self.assertEqual(sorted(memory._entries),
+                             [k for k in sorted(keys) if disk.get(k)], prefix)
+
+    @patch('tiendanube.cache.pickle.load')
+    def test_delete_prefix_does_not_read_other_paths(self, load_mock):
+        cache = DiskCache(self.directory)
+        for i in range(20):
+            cache.set('/products/{}?'.format(i), CacheEntry(b'{}', {}, 10))
+
+        cache.delete_prefix('/products?')
+        cache.delete_prefix('/products/3?')
+        cache.delete_prefix('/products/3/')
+
+        load_mock.assert_not_called()
+        self.assertEqual(19, sum(1 for _, _, files in os.walk(self.directory)
+                                 for name in files if name.endswith('.cache')))
+
+
+class APIClientCacheTest(unittest.TestCase):
+
+    @patch('tiendanube.cache.time')
+    @patch('tiendanube.api.time')
+    @patch('tiendanube.api.requests.Session')
+    def test_fresh_entries_skip_the_network(self, session_mock, api_time,
+                                            cache_time):
+        cache_time.time.return_value = api_time.time.return_value = 100
+        requests_mock = session_mock.return_value
+        requests_mock.get.return_value = response(200, {'id': 46})
+        cli = APIClient('test_api_key', 'test user agent',
+                        cache=MemoryCache(ttl=60))
+        s = StoreResource(cli, '46')
+
+        self.assertEqual({'id': 46}, s.get())
+        self.assertEqual({'id': 46}, s.get())
+
+        self.assertEqual(1, requests_mock.get.call_count)
+
+    @patch('tiendanube.cache.time')
+    @patch('tiendanube.api.time')
+    @patch('tiendanube.api.requests.Session')
+    def test_stale_entries_are_revalidated(self, session_mock, api_time,
+                                           cache_time):
+        cache_time.time.return_value = api_time.time.return_value = 100
+        requests_mock = session_mock.return_value
+        requests_mock.get.side_effect = [
+            response(200, {'id': 991}, {'etag': '"v1"'}),
+            Mock(status_code=304, headers={}),
+        ]
+        cli = APIClient('test_api_key', 'test user agent',
+                        cache=MemoryCache(ttl=60))
+        p = ProductResource(cli, '46')
+        p.get(991)
+
+        cache_time.time.return_value = api_time.time.return_value = 200
+        self.assertEqual({'id': 991}, p.get(991))
+
+        requests_mock.get.assert_called_with(
+            url='https://api.tiendanube.com/v1/46/products/991',
+            headers={'Authentication': 'bearer test_api_key',
+                     'User-Agent': 'test user agent',
+                     'If-None-Match': '"v1"'},
+            params=None
+        )
+        self.assertTrue(cli.cache.get(
+            'https://api.tiendanube.com/v1/46/products/991?').fresh)
+
+    @patch('tiendanube.api.requests.Session')
+    def test_writes_invalidate_entries(self, session_mock):
+        requests_mock = session_mock.return_value
+        requests_mock.get.return_value = response(200, {'id': 991})
+        requests_mock.put.return_value = Mock(
+            status_code=200, text=json.dumps({'id': 1}), headers={})
+        cli = APIClient('test_api_key', 'test user agent', cache=MemoryCache())
+        p = ProductResource(cli, '46')
+        p.get(991)
+        p.get(992)
+        list(p.list())
+
+        p.variants.update(991, {'id': 1, 'price': '10.00'})
+
+        self.assertEqual(
+            ['https://api.tiendanube.com/v1/46/products/992?'],
+            list(cli.cache._entries))
+
+    def test_cache_key_sorts_params(self):
+        self.assertEqual('http://x/products?fields=id&page=2',
+                         get_cache_key('http://x/products',
+                                       {'page': 2, 'fields': 'id'}))
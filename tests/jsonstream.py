@@ -0,0 +1,31 @@
+# -*- coding: utf-8 -*-
+import json
+import unittest
+
+from tiendanube.jsonstream import iter_array
+
+
+def chunked(data, size):
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+class IterArrayTest(unittest.TestCase):
+
+    def test_items_split_across_chunks(self):
+        items = [{'id': i, 'name': u'ñandú {}'.format(i), 'tags': [1.5, None, True]}
+                 for i in range(20)] + [12345, 'text', []]
+        body = json.dumps(items, ensure_ascii=False).encode('utf-8')
+
+        for size in [1, 3, 64, 4096]:
+            self.assertEqual(items, list(iter_array(chunked(body, size))))
+
+    def test_number_cut_at_chunk_boundary(self):
+        self.assertEqual([123, 4], list(iter_array([b'[1', b'23,', b'4]'])))
+
+    def test_empty_array(self):
+        self.assertEqual([], list(iter_array([b' [', b' ] '])))
+
+    def test_invalid_documents(self):
+        for body in [b'{"id": 1}', b'[1 2]', b'[1,']:
+            with self.assertRaises(ValueError):
+                list(iter_array([body]))
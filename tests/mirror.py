@@ -0,0 +1,120 @@
+import datetime
+import json
+import unittest
+
+from mock import Mock, patch
+
+from tiendanube.api import APIClient
+from tiendanube.client import Store
+from tiendanube.resources.exceptions import APIError
+
+
+def product(id, minute, skus, handle):
+    return {'id': id, 'handle': {'es': handle},
+            'updated_at': '2024-03-01T10:{:02d}:00-0300'.format(minute),
+            'variants': [{'id': id * 10 + n, 'sku': sku,
+                          'updated_at': '2024-03-01T10:00:00-0300'}
+                         for n, sku in enumerate(skus)]}
+
+
+class StoreMirrorTest(unittest.TestCase):
+
+    def setUp(self):
+        patcher = patch('tiendanube.api.requests.Session')
+        self.requests_mock = patcher.start().return_value
+        self.addCleanup(patcher.stop)
+        self.data = {}
+        self.requests_mock.get.side_effect = self.get
+        self.store = Store(APIClient('test_api_key', 'test user agent'), '46')
+        self.mirror = self.store.mirror(':memory:')
+        self.addCleanup(self.mirror.close)
+
+    def get(self, url, params=None, **kwargs):
+        resource = url.rstrip('/').rsplit('/', 1)[1]
+        return Mock(status_code=200, headers={}, links={},
+                    content=json.dumps(self.data.get(resource, [])))
+
+    def test_sync_and_query(self):
+        self.data = {
+            'products': [product(1, 0, ['A-1', 'A-2'], 'shirt'),
+                         product(2, 5, ['B-1'], 'hat')],
+            'customers': [{'id': 7, 'email': 'jo@example.com',
+                           'updated_at': '2024-03-01T10:00:00-0300'}],
+            'orders': [{'id': 9, 'number': 100, 'contact_email': 'jo@example.com',
+                        'customer': {'id': 7},
+                        'updated_at': '2024-03-01T10:00:00-0300'}],
+        }
+
+        counts = self.mirror.sync()
+
+        self.assertEqual({'products': 2, 'customers': 1, 'orders': 1,
+                          'categories': 0}, counts)
+        self.assertEqual([1], [p.id for p in self.mirror.products_by_sku('A-2')])
+        self.assertEqual(20, self.mirror.variants_by_sku('B-1')[0].id)
+        self.assertEqual([2], [p.id for p in self.mirror.products_by_handle('hat')])
+        self.assertEqual(7, self.mirror.customers_by_email('jo@example.com')[0].id)
+        self.assertEqual([9], [o.id for o in self.mirror.orders_for_customer(7)])
+        self.assertEqual([9], [o.id for o in self.mirror.orders_by_email('jo@example.com')])
+        self.assertEqual('hat', self.mirror.get('products', 2).handle.es)
+        self.assertIsNone(self.mirror.get('products', 3))
+        since = datetime.datetime(2024, 3, 1, 13, 3, tzinfo=datetime.timezone.utc)
+        self.assertEqual([2], [p.id for p in self.mirror.updated_since('products', since)])
+
+        # The next pull starts from the stored watermark.
+        self.requests_mock.get.reset_mock()
+        self.mirror.sync(['products'])
+        params = self.requests_mock.get.call_args[1]['params']
+        self.assertIn('updated_at_min', params)
+
+    def test_sync_writes_in_batches(self):
+        self.data = {'products': [product(i, i, ['S-{}'.format(i)], 'p{}'.format(i))
+                                  for i in range(1, 6)]}
+        self.mirror.batch_size = 2
+        commits = []
+        self.mirror._db.set_trace_callback(
+            lambda sql: commits.append(sql) if sql == 'COMMIT' else None)
+
+        self.assertEqual({'products': 5}, self.mirror.sync(['products']))
+
+        # Two full batches, then the last one along with the watermark.
+        self.assertEqual(3, len(commits))
+        self.assertEqual(5, len(self.mirror.updated_since(
+            'products', datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc))))
+        self.assertIsNotNone(self.mirror.watermarks.load('46', 'products'))
+
+    def test_failed_sync_keeps_written_objects_without_watermark(self):
+        pages = [[product(1, 0, ['A'], 'a'), product(2, 1, ['B'], 'b')],
+                 [product(3, 2, ['C'], 'c')]]
+
+        def get(url, params=None, **kwargs):
+            page = (params or {}).get('page', 1)
+            if page > 1:
+                return Mock(status_code=400, reason='Bad Request', text='',
+                            headers={})
+            return Mock(status_code=200, headers={},
+                        links={'next': {'url': url}},
+                        content=json.dumps(pages[0]))
+        self.requests_mock.get.side_effect = get
+
+        with self.assertRaises(APIError):
+            self.mirror.sync(['products'])
+
+        self.assertEqual(2, self.mirror.get('products', 2).id)
+        self.assertIsNone(self.mirror.watermarks.load('46', 'products'))
+        self.assertRaises(ValueError, self.mirror.sync, ['scripts'])
+
+    def test_apply_and_remove(self):
+        self.mirror.apply('products', product(1, 0, ['A-1'], 'shirt'))
+        self.mirror.apply('products', product(1, 1, ['A-9'], 'tee'))
+
+        self.assertEqual([], self.mirror.products_by_sku('A-1'))
+        self.assertEqual([], self.mirror.products_by_handle('shirt'))
+        self.assertEqual([1], [p.id for p in self.mirror.products_by_handle('tee')])
+
+        self.mirror.remove('products', 1)
+
+        self.assertIsNone(self.mirror.get('products', 1))
+        self.assertEqual([], self.mirror.variants_by_sku('A-9'))
+        self.assertRaises(ValueError, self.mirror.apply, 'scripts', {'id': 1})
+        self.assertRaises(ValueError, self.mirror.by_handle,
+                          'products; DROP TABLE orders', 'tee')
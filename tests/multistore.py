@@ -0,0 +1,134 @@
+import json
+import threading
+import time
+import unittest
+
+from mock import Mock, patch
+
+from tiendanube.client import MultiStoreClient, NubeClient
+from tiendanube.scheduler import FairScheduler
+
+
+class FairSchedulerTest(unittest.TestCase):
+
+    def test_slots_go_round_robin(self):
+        scheduler = FairScheduler(max_concurrent=1)
+        scheduler.acquire('hot')
+        order = []
+
+        def request(store_id):
+            with scheduler.slot(store_id):
+                order.append(store_id)
+
+        threads = []
+        for n, store_id in enumerate(['hot', 'hot', 'hot', 'cold']):
+            thread = threading.Thread(target=request, args=(store_id,))
+            thread.start()
+            threads.append(thread)
+            while sum(len(q) for q in scheduler._waiting.values()) <= n:
+                time.sleep(0.001)
+        scheduler.release()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(['hot', 'cold', 'hot', 'hot'], order)
+        self.assertEqual(0, scheduler.active)
+
+    def test_free_slots(self):
+        scheduler = FairScheduler(max_concurrent=2)
+        scheduler.acquire('1')
+        scheduler.acquire('2')
+
+        self.assertEqual(2, scheduler.active)
+
+
+class MultiStoreClientTest(unittest.TestCase):
+
+    def setUp(self):
+        patcher = patch('tiendanube.api.requests.Session')
+        self.session_mock = patcher.start()
+        self.requests_mock = self.session_mock.return_value
+        self.addCleanup(patcher.stop)
+        self.requests_mock.get.return_value = Mock(
+            status_code=200, headers={}, links={}, content=json.dumps({'id': 1}))
+
+    def test_tokens_per_store(self):
+        client = MultiStoreClient({1: 'token-1', '2': 'token-2'})
+
+        client.get_store(1).products.get(1)
+        client.get_store(2).products.get(1)
+
+        self.assertEqual(1, self.session_mock.call_count)
+        tokens = [c[1]['headers']['Authentication']
+                  for c in self.requests_mock.get.call_args_list]
+        self.assertEqual(['bearer token-1', 'bearer token-2'], tokens)
+        self.assertRaises(KeyError, client.get_store, 3)
+
+    def test_token_loader(self):
+        client = MultiStoreClient(lambda store_id: 'token-' + store_id)
+
+        client.get_store(7).orders.get(1)
+
+        self.assertEqual('bearer token-7',
+                         self.requests_mock.get.call_args[1]['headers']['Authentication'])
+
+    def test_stores_are_bounded(self):
+        client = MultiStoreClient(lambda store_id: 'token', max_stores=2)
+
+        first = client.get_store(1)
+        client.get_store(2)
+        self.assertIs(first, client.get_store(1))
+        client.get_store(3)
+
+        self.assertEqual(['1', '3'], list(client._stores))
+
+
+class MapStoresTest(unittest.TestCase):
+
+    def setUp(self):
+        patcher = patch('tiendanube.api.requests.Session')
+        self.requests_mock = patcher.start().return_value
+        self.addCleanup(patcher.stop)
+        self.requests_mock.get.return_value = Mock(
+            status_code=200, headers={}, links={}, content=json.dumps({'id': 1}))
+        self.client = NubeClient('test_api_key')
+
+    def job(self, store):
+        if store.store.store_id == '2':
+            raise ValueError('broken store')
+        return store.get_info()['id']
+
+    def test_results_and_errors_per_store(self):
+        seen = []
+
+        results = list(self.client.map_stores(
+            [1, 2, 3], self.job, concurrency=2, ordered=True,
+            progress=lambda result, done, total: seen.append((result.store_id, done, total))))
+
+        self.assertEqual([1, 2, 3], [r.store_id for r in results])
+        self.assertEqual([True, False, True], [r.ok for r in results])
+        self.assertEqual(1, results[0].result)
+        self.assertIsInstance(results[1].error, ValueError)
+        self.assertEqual([(1, 1, 3), (2, 2, 3), (3, 3, 3)], seen)
+
+    def test_cancel(self):
+        cancel = threading.Event()
+        started = []
+
+        def job(store):
+            started.append(store.store.store_id)
+            cancel.set()
+
+        results = list(self.client.map_stores(iter(range(100)), job,
+                                              concurrency=1, cancel=cancel))
+
+        self.assertEqual(1, len(results))
+        self.assertEqual(['0'], started)
+
+    def test_multi_store_client(self):
+        client = MultiStoreClient(lambda store_id: 'token-' + store_id)
+
+        results = list(client.map_stores([1, 3], self.job))
+
+        self.assertEqual({1, 3}, {r.store_id for r in results})
+        self.assertTrue(all(r.ok for r in results))
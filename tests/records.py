@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+import copy
+import json
+import pickle
+import unittest
+
+from mock import Mock, patch
+
+from tiendanube.api import APIClient
+from tiendanube.resources import ProductResource
+from tiendanube.resources.records import (Category, Image, Product, Record,
+                                          Variant, to_records)
+
+
+PRODUCT = {
+    'id': 991,
+    'name': {'es': 'test prod'},
+    'variants': [{'id': 1, 'sku': 'A'}, {'id': 2, 'sku': 'B'}],
+    'images': [{'id': 5, 'src': 'http://example.com/image.jpg'}],
+    'categories': [{'id': 7, 'subcategories': []}],
+}
+
+
+class RecordTest(unittest.TestCase):
+
+    def test_attribute_and_item_access(self):
+        product = Product(PRODUCT)
+
+        self.assertEqual(991, product.id)
+        self.assertEqual(991, product['id'])
+        self.assertEqual('test prod', product.name.es)
+        self.assertEqual(None, product.get('missing'))
+        self.assertIn('variants', product)
+        with self.assertRaises(AttributeError):
+            product.missing
+
+    def test_nested_records_are_typed_and_cached(self):
+        product = Product(PRODUCT)
+
+        variants = product.variants
+        self.assertIsInstance(variants[0], Variant)
+        self.assertEqual('B', variants[1].sku)
+        self.assertIsInstance(product.images[0], Image)
+        self.assertIsInstance(product.categories[0], Category)
+        self.assertIs(variants, product.variants)
+
+    def test_records_have_no_instance_dict(self):
+        product = Product(PRODUCT)
+
+        with self.assertRaises(AttributeError):
+            product.__dict__
+        with self.assertRaises(AttributeError):
+            product.id = 1
+
+    def test_equality_and_conversion(self):
+        self.assertEqual(PRODUCT, Product(PRODUCT))
+        self.assertEqual(PRODUCT, Product(PRODUCT).to_dict())
+        self.assertEqual([Record({'id': 1})], to_records([{'id': 1}], Record))
+
+    def test_copy_and_pickle(self):
+        product = Product(PRODUCT)
+        product.variants
+
+        for clone in [copy.copy(product), copy.deepcopy(product),
+                      pickle.loads(pickle.dumps(product))]:
+            self.assertIsInstance(clone, Product)
+            self.assertEqual(product, clone)
+            self.assertEqual('B', clone.variants[1].sku)
+        self.assertRaises(AttributeError, getattr, product, '_missing')
+
+    @patch('tiendanube.api.requests.Session')
+    def test_resources_return_records(self, session_mock):
+        requests_mock = session_mock.return_value
+        response_mock = Mock()
+        response_mock.status_code = 200
+        response_mock.content = json.dumps(PRODUCT)
+        response_mock.links = {}
+        requests_mock.get.return_value = response_mock
+        cli = APIClient('test_api_key', 'test user agent')
+        p = ProductResource(cli, '46')
+
+        product = p.get(991, records=True)
+        self.assertIsInstance(product, Product)
+        self.assertEqual('A', product.variants[0].sku)
+
+        response_mock.content = json.dumps([PRODUCT])
+        page = next(p.list(records=True))
+        self.assertIsInstance(page[0], Product)
+
+        response_mock.content = json.dumps(PRODUCT['variants'])
+        variants = next(p.variants.list(991, records=True))
+        self.assertIsInstance(variants[0], Variant)
@@ -1,8 +1,11 @@
 import datetime
 import json
+import pickle
+import time
 import unittest
 
 from mock import Mock, patch
+from munch import Munch
 from pytz import utc
 
 from tiendanube.api import APIClient
@@ -10,12 +13,15 @@ from tiendanube.resources import (CustomerResource, StoreResource,
                                   ScriptResource, ProductResource,
                                   OrderResource, WebhookResource,
                                   CategoryResource)
+from tiendanube.resources.exceptions import APIError, PaginationError
+from tiendanube.retry import NO_RETRY, RetryPolicy
 
 
 class StoreResourceReadTest(unittest.TestCase):
 
-    @patch('tiendanube.api.requests')
-    def test_get_store_info(self, requests_mock):
+    @patch('tiendanube.api.requests.Session')
+    def test_get_store_info(self, session_mock):
+        requests_mock = session_mock.return_value
         response_mock = Mock()
         response_mock.status_code = 200
         response_mock.content = json.dumps({'id': 46, 'name': 'test store'})
@@ -33,11 +39,27 @@ class StoreResourceReadTest(unittest.TestCase):
             params=None
         )
 
+    @patch('tiendanube.api.requests.Session')
+    def test_get_store_info_result_modes(self, session_mock):
+        requests_mock = session_mock.return_value
+        body = json.dumps({'id': 46, 'name': 'test store'})
+        requests_mock.get.return_value = Mock(status_code=200, content=body)
+        cli = APIClient('test_api_key', 'test user agent')
+        s = StoreResource(cli, '46')
+
+        self.assertEqual('test store', s.get().name)
+        self.assertIs(dict, type(s.get(as_dict=True)))
+        self.assertEqual('test store', s.get(records=True).name)
+        self.assertEqual(body, s.get(raw=True))
+        cli.result_mode = 'dict'
+        self.assertIs(dict, type(s.get()))
+
 
 class ProductResourceReadTest(unittest.TestCase):
 
-    @patch('tiendanube.api.requests')
-    def test_list_products_base(self, requests_mock):
+    @patch('tiendanube.api.requests.Session')
+    def test_list_products_base(self, session_mock):
+        requests_mock = session_mock.return_value
         response_mock = Mock()
         response_mock.status_code = 200
         response_mock.content = json.dumps([
@@ -61,8 +83,9 @@ class ProductResourceReadTest(unittest.TestCase):
             params=None
         )
 
-    @patch('tiendanube.api.requests')
-    def test_list_products_fields(self, requests_mock):
+    @patch('tiendanube.api.requests.Session')
+    def test_list_products_fields(self, session_mock):
+        requests_mock = session_mock.return_value
         response_mock = Mock()
         response_mock.status_code = 200
         response_mock.content = json.dumps([
@@ -86,8 +109,9 @@ class ProductResourceReadTest(unittest.TestCase):
             params={'fields': 'id'}
         )
 
-    @patch('tiendanube.api.requests')
-    def test_list_products_filter(self, requests_mock):
+    @patch('tiendanube.api.requests.Session')
+    def test_list_products_filter(self, session_mock):
+        requests_mock = session_mock.return_value
         response_mock = Mock()
         response_mock.status_code = 200
         response_mock.content = json.dumps([
@@ -109,8 +133,9 @@ class ProductResourceReadTest(unittest.TestCase):
             params={'fields': 'id', 'since_id': 47}
         )
 
-    @patch('tiendanube.api.requests')
-    def test_list_products_filter_date(self, requests_mock):
+    @patch('tiendanube.api.requests.Session')
+    def test_list_products_filter_date(self, session_mock):
+        requests_mock = session_mock.return_value
         response_mock = Mock()
         response_mock.status_code = 200
         response_mock.content = json.dumps([
@@ -133,8 +158,9 @@ class ProductResourceReadTest(unittest.TestCase):
             params={'since_id': 47, 'created_at_min': '2013-01-01T00:00:00+00:00', 'fields': 'id'},
         )
 
-    @patch('tiendanube.api.requests')
-    def test_get_product(self, requests_mock):
+    @patch('tiendanube.api.requests.Session')
+    def test_get_product(self, session_mock):
+        requests_mock = session_mock.return_value
         response_mock = Mock()
         response_mock.status_code = 200
         response_mock.content = json.dumps({'id': 991, 'name': 'test prod'})
@@ -153,8 +179,9 @@ class ProductResourceReadTest(unittest.TestCase):
             params=None
         )
 
-    @patch('tiendanube.api.requests')
-    def test_get_product_variants(self, requests_mock):
+    @patch('tiendanube.api.requests.Session')
+    def test_get_product_variants(self, session_mock):
+        requests_mock = session_mock.return_value
         response_mock = Mock()
         response_mock.status_code = 200
         response_mock.content = json.dumps({'id': 991, 'name': 'test prod'})
@@ -173,6 +200,7 @@ class ProductResourceReadTest(unittest.TestCase):
             params=None
         )
         response_mock.content = json.dumps([{'id': 991, 'name': 'test prod variant'}])
+        response_mock.links = {}
         res = res.variants.list()
         self.assertEqual([{'id': 991, 'name': 'test prod variant'}], res)
 
@@ -182,8 +210,9 @@ class ProductResourceReadTest(unittest.TestCase):
             params=None
         )
 
-    @patch('tiendanube.api.requests')
-    def test_get_product_get_variant(self, requests_mock):
+    @patch('tiendanube.api.requests.Session')
+    def test_get_product_get_variant(self, session_mock):
+        requests_mock = session_mock.return_value
         response_mock = Mock()
         response_mock.status_code = 200
         response_mock.content = json.dumps({'id': 991, 'name': 'test prod'})
@@ -211,8 +240,9 @@ class ProductResourceReadTest(unittest.TestCase):
             params=None
         )
 
-    @patch('tiendanube.api.requests')
-    def test_get_product_images(self, requests_mock):
+    @patch('tiendanube.api.requests.Session')
+    def test_get_product_images(self, session_mock):
+        requests_mock = session_mock.return_value
         response_mock = Mock()
         response_mock.status_code = 200
         response_mock.content = json.dumps({'id': 991, 'name': 'test prod'})
@@ -231,6 +261,7 @@ class ProductResourceReadTest(unittest.TestCase):
             params=None
         )
         response_mock.content = json.dumps([{'id': 991, 'name': 'test prod image'}])
+        response_mock.links = {}
         res = res.images.list()
         self.assertEqual([{'id': 991, 'name': 'test prod image'}], res)
 
@@ -240,8 +271,9 @@ class ProductResourceReadTest(unittest.TestCase):
             params=None
         )
 
-    @patch('tiendanube.api.requests')
-    def test_get_product_get_image(self, requests_mock):
+    @patch('tiendanube.api.requests.Session')
+    def test_get_product_get_image(self, session_mock):
+        requests_mock = session_mock.return_value
         response_mock = Mock()
         response_mock.status_code = 200
         response_mock.content = json.dumps({'id': 991, 'name': 'test prod'})
@@ -272,8 +304,9 @@ class ProductResourceReadTest(unittest.TestCase):
 
 class CustomerResourceReadTest(unittest.TestCase):
 
-    @patch('tiendanube.api.requests')
-    def test_list_customer_base(self, requests_mock):
+    @patch('tiendanube.api.requests.Session')
+    def test_list_customer_base(self, session_mock):
+        requests_mock = session_mock.return_value
         response_mock = Mock()
         response_mock.status_code = 200
         response_mock.content = json.dumps([
@@ -297,8 +330,9 @@ class CustomerResourceReadTest(unittest.TestCase):
             params=None
         )
 
-    @patch('tiendanube.api.requests')
-    def test_list_customers_fields(self, requests_mock):
+    @patch('tiendanube.api.requests.Session')
+    def test_list_customers_fields(self, session_mock):
+        requests_mock = session_mock.return_value
         response_mock = Mock()
         response_mock.status_code = 200
         response_mock.content = json.dumps([
@@ -322,8 +356,9 @@ class CustomerResourceReadTest(unittest.TestCase):
             params={'fields': 'id'},
         )
 
-    @patch('tiendanube.api.requests')
-    def test_list_customers_filter(self, requests_mock):
+    @patch('tiendanube.api.requests.Session')
+    def test_list_customers_filter(self, session_mock):
+        requests_mock = session_mock.return_value
         response_mock = Mock()
         response_mock.status_code = 200
         response_mock.content = json.dumps([
@@ -345,8 +380,9 @@ class CustomerResourceReadTest(unittest.TestCase):
             params={'since_id': 47, 'fields': 'id'},
         )
 
-    @patch('tiendanube.api.requests')
-    def test_list_customers_filter_date(self, requests_mock):
+    @patch('tiendanube.api.requests.Session')
+    def test_list_customers_filter_date(self, session_mock):
+        requests_mock = session_mock.return_value
         response_mock = Mock()
         response_mock.status_code = 200
         response_mock.content = json.dumps([
@@ -369,8 +405,9 @@ class CustomerResourceReadTest(unittest.TestCase):
             params={'since_id': 47, 'created_at_min': '2013-01-01T00:00:00+00:00', 'fields': 'id'},
         )
 
-    @patch('tiendanube.api.requests')
-    def test_get_customer(self, requests_mock):
+    @patch('tiendanube.api.requests.Session')
+    def test_get_customer(self, session_mock):
+        requests_mock = session_mock.return_value
         response_mock = Mock()
         response_mock.status_code = 200
         response_mock.content = json.dumps({'id': 991, 'name': 'test prod'})
@@ -392,8 +429,9 @@ class CustomerResourceReadTest(unittest.TestCase):
 
 class OrderResourceReadTest(unittest.TestCase):
 
-    @patch('tiendanube.api.requests')
-    def test_list_orders_base(self, requests_mock):
+    @patch('tiendanube.api.requests.Session')
+    def test_list_orders_base(self, session_mock):
+        requests_mock = session_mock.return_value
         response_mock = Mock()
         response_mock.status_code = 200
         response_mock.content = json.dumps([
@@ -417,8 +455,9 @@ class OrderResourceReadTest(unittest.TestCase):
             params=None
         )
 
-    @patch('tiendanube.api.requests')
-    def test_list_orders_fields(self, requests_mock):
+    @patch('tiendanube.api.requests.Session')
+    def test_list_orders_fields(self, session_mock):
+        requests_mock = session_mock.return_value
         response_mock = Mock()
         response_mock.status_code = 200
         response_mock.content = json.dumps([
@@ -442,8 +481,9 @@ class OrderResourceReadTest(unittest.TestCase):
             params={'fields': 'id'}
         )
 
-    @patch('tiendanube.api.requests')
-    def test_list_orders_filter(self, requests_mock):
+    @patch('tiendanube.api.requests.Session')
+    def test_list_orders_filter(self, session_mock):
+        requests_mock = session_mock.return_value
         response_mock = Mock()
         response_mock.status_code = 200
         response_mock.content = json.dumps([
@@ -465,8 +505,9 @@ class OrderResourceReadTest(unittest.TestCase):
             params={'since_id': 47, 'fields': 'id'},
         )
 
-    @patch('tiendanube.api.requests')
-    def test_list_orders_filter_date(self, requests_mock):
+    @patch('tiendanube.api.requests.Session')
+    def test_list_orders_filter_date(self, session_mock):
+        requests_mock = session_mock.return_value
         response_mock = Mock()
         response_mock.status_code = 200
         response_mock.content = json.dumps([
@@ -489,8 +530,9 @@ class OrderResourceReadTest(unittest.TestCase):
             params={'since_id': 47, 'created_at_min': '2013-01-01T00:00:00+00:00', 'fields': 'id'},
         )
 
-    @patch('tiendanube.api.requests')
-    def test_get_order(self, requests_mock):
+    @patch('tiendanube.api.requests.Session')
+    def test_get_order(self, session_mock):
+        requests_mock = session_mock.return_value
         response_mock = Mock()
         response_mock.status_code = 200
         response_mock.content = json.dumps({'id': 991, 'name': 'test prod'})
@@ -512,8 +554,9 @@ class OrderResourceReadTest(unittest.TestCase):
 
 class ScriptResourceReadTest(unittest.TestCase):
 
-    @patch('tiendanube.api.requests')
-    def test_list_scripts_base(self, requests_mock):
+    @patch('tiendanube.api.requests.Session')
+    def test_list_scripts_base(self, session_mock):
+        requests_mock = session_mock.return_value
         response_mock = Mock()
         response_mock.status_code = 200
         response_mock.content = json.dumps([
@@ -537,8 +580,9 @@ class ScriptResourceReadTest(unittest.TestCase):
             params=None
         )
 
-    @patch('tiendanube.api.requests')
-    def test_list_scripts_fields(self, requests_mock):
+    @patch('tiendanube.api.requests.Session')
+    def test_list_scripts_fields(self, session_mock):
+        requests_mock = session_mock.return_value
         response_mock = Mock()
         response_mock.status_code = 200
         response_mock.content = json.dumps([
@@ -562,8 +606,9 @@ class ScriptResourceReadTest(unittest.TestCase):
             params={'fields': 'id'}
         )
 
-    @patch('tiendanube.api.requests')
-    def test_list_scripts_filter(self, requests_mock):
+    @patch('tiendanube.api.requests.Session')
+    def test_list_scripts_filter(self, session_mock):
+        requests_mock = session_mock.return_value
         response_mock = Mock()
         response_mock.status_code = 200
         response_mock.content = json.dumps([
@@ -585,8 +630,9 @@ class ScriptResourceReadTest(unittest.TestCase):
             params={'since_id': 47, 'fields': 'id'}
         )
 
-    @patch('tiendanube.api.requests')
-    def test_list_scripts_filter_date(self, requests_mock):
+    @patch('tiendanube.api.requests.Session')
+    def test_list_scripts_filter_date(self, session_mock):
+        requests_mock = session_mock.return_value
         response_mock = Mock()
         response_mock.status_code = 200
         response_mock.content = json.dumps([
@@ -609,8 +655,9 @@ class ScriptResourceReadTest(unittest.TestCase):
             params={'since_id': 47, 'created_at_min': '2013-01-01T00:00:00+00:00', 'fields': 'id'}
         )
 
-    @patch('tiendanube.api.requests')
-    def test_get_script(self, requests_mock):
+    @patch('tiendanube.api.requests.Session')
+    def test_get_script(self, session_mock):
+        requests_mock = session_mock.return_value
         response_mock = Mock()
         response_mock.status_code = 200
         response_mock.content = json.dumps({'id': 991, 'name': 'test prod'})
@@ -632,8 +679,9 @@ class ScriptResourceReadTest(unittest.TestCase):
 
 class WebhookResourceReadTest(unittest.TestCase):
 
-    @patch('tiendanube.api.requests')
-    def test_list_webhooks_base(self, requests_mock):
+    @patch('tiendanube.api.requests.Session')
+    def test_list_webhooks_base(self, session_mock):
+        requests_mock = session_mock.return_value
         response_mock = Mock()
         response_mock.status_code = 200
         response_mock.content = json.dumps([
@@ -657,8 +705,9 @@ class WebhookResourceReadTest(unittest.TestCase):
             params=None
         )
 
-    @patch('tiendanube.api.requests')
-    def test_list_webhooks_fields(self, requests_mock):
+    @patch('tiendanube.api.requests.Session')
+    def test_list_webhooks_fields(self, session_mock):
+        requests_mock = session_mock.return_value
         response_mock = Mock()
         response_mock.status_code = 200
         response_mock.content = json.dumps([
@@ -682,8 +731,9 @@ class WebhookResourceReadTest(unittest.TestCase):
             params={'fields': 'id'}
         )
 
-    @patch('tiendanube.api.requests')
-    def test_list_webhooks_filter(self, requests_mock):
+    @patch('tiendanube.api.requests.Session')
+    def test_list_webhooks_filter(self, session_mock):
+        requests_mock = session_mock.return_value
         response_mock = Mock()
         response_mock.status_code = 200
         response_mock.content = json.dumps([
@@ -705,8 +755,9 @@ class WebhookResourceReadTest(unittest.TestCase):
             params={'since_id': 47, 'fields': 'id'}
         )
 
-    @patch('tiendanube.api.requests')
-    def test_list_webhooks_filter_date(self, requests_mock):
+    @patch('tiendanube.api.requests.Session')
+    def test_list_webhooks_filter_date(self, session_mock):
+        requests_mock = session_mock.return_value
         response_mock = Mock()
         response_mock.status_code = 200
         response_mock.content = json.dumps([
@@ -729,8 +780,9 @@ class WebhookResourceReadTest(unittest.TestCase):
             params={'since_id': 47, 'created_at_min': '2013-01-01T00:00:00+00:00', 'fields': 'id'}
         )
 
-    @patch('tiendanube.api.requests')
-    def test_get_webhook(self, requests_mock):
+    @patch('tiendanube.api.requests.Session')
+    def test_get_webhook(self, session_mock):
+        requests_mock = session_mock.return_value
         response_mock = Mock()
         response_mock.status_code = 200
         response_mock.content = json.dumps({'id': 991, 'name': 'test prod'})
@@ -752,8 +804,9 @@ class WebhookResourceReadTest(unittest.TestCase):
 
 class CategoryResourceReadTest(unittest.TestCase):
 
-    @patch('tiendanube.api.requests')
-    def test_list_categories_base(self, requests_mock):
+    @patch('tiendanube.api.requests.Session')
+    def test_list_categories_base(self, session_mock):
+        requests_mock = session_mock.return_value
         response_mock = Mock()
         response_mock.status_code = 200
         response_mock.content = json.dumps([
@@ -777,8 +830,9 @@ class CategoryResourceReadTest(unittest.TestCase):
             params=None
         )
 
-    @patch('tiendanube.api.requests')
-    def test_list_categories_fields(self, requests_mock):
+    @patch('tiendanube.api.requests.Session')
+    def test_list_categories_fields(self, session_mock):
+        requests_mock = session_mock.return_value
         response_mock = Mock()
         response_mock.status_code = 200
         response_mock.content = json.dumps([
@@ -802,8 +856,9 @@ class CategoryResourceReadTest(unittest.TestCase):
             params={'fields': 'id'},
         )
 
-    @patch('tiendanube.api.requests')
-    def test_list_categories_filter(self, requests_mock):
+    @patch('tiendanube.api.requests.Session')
+    def test_list_categories_filter(self, session_mock):
+        requests_mock = session_mock.return_value
         response_mock = Mock()
         response_mock.status_code = 200
         response_mock.content = json.dumps([
@@ -825,8 +880,9 @@ class CategoryResourceReadTest(unittest.TestCase):
             params={'since_id': 47, 'fields': 'id'},
         )
 
-    @patch('tiendanube.api.requests')
-    def test_list_categories_filter_date(self, requests_mock):
+    @patch('tiendanube.api.requests.Session')
+    def test_list_categories_filter_date(self, session_mock):
+        requests_mock = session_mock.return_value
         response_mock = Mock()
         response_mock.status_code = 200
         response_mock.content = json.dumps([
@@ -849,8 +905,9 @@ class CategoryResourceReadTest(unittest.TestCase):
             params={'since_id': 47, 'created_at_min': '2013-01-01T00:00:00+00:00', 'fields': 'id'}
         )
 
-    @patch('tiendanube.api.requests')
-    def test_get_category(self, requests_mock):
+    @patch('tiendanube.api.requests.Session')
+    def test_get_category(self, session_mock):
+        requests_mock = session_mock.return_value
         response_mock = Mock()
         response_mock.status_code = 200
         response_mock.content = json.dumps({'id': 991, 'name': 'test prod'})
@@ -872,8 +929,9 @@ class CategoryResourceReadTest(unittest.TestCase):
 
 class ProductResourceWriteTest(unittest.TestCase):
 
-    @patch('tiendanube.api.requests')
-    def test_add_product(self, requests_mock):
+    @patch('tiendanube.api.requests.Session')
+    def test_add_product(self, session_mock):
+        requests_mock = session_mock.return_value
         response_mock = Mock()
         response_mock.status_code = 201
         response_mock.text = json.dumps(
@@ -895,8 +953,9 @@ class ProductResourceWriteTest(unittest.TestCase):
             data=json.dumps({'id': 46, 'name': 'test prod'})
         )
 
-    @patch('tiendanube.api.requests')
-    def test_update_product(self, requests_mock):
+    @patch('tiendanube.api.requests.Session')
+    def test_update_product(self, session_mock):
+        requests_mock = session_mock.return_value
         response_mock = Mock()
         response_mock.status_code = 200
         response_mock.text = json.dumps(
@@ -917,8 +976,9 @@ class ProductResourceWriteTest(unittest.TestCase):
 
 class CustomerResourceWriteTest(unittest.TestCase):
 
-    @patch('tiendanube.api.requests')
-    def test_add_customer(self, requests_mock):
+    @patch('tiendanube.api.requests.Session')
+    def test_add_customer(self, session_mock):
+        requests_mock = session_mock.return_value
         response_mock = Mock()
         response_mock.status_code = 201
         response_mock.text = json.dumps(
@@ -940,8 +1000,9 @@ class CustomerResourceWriteTest(unittest.TestCase):
             data=json.dumps({'id': 46, 'name': 'test cust'})
         )
 
-    @patch('tiendanube.api.requests')
-    def test_update_customer(self, requests_mock):
+    @patch('tiendanube.api.requests.Session')
+    def test_update_customer(self, session_mock):
+        requests_mock = session_mock.return_value
         response_mock = Mock()
         response_mock.status_code = 200
         response_mock.text = json.dumps(
@@ -962,8 +1023,9 @@ class CustomerResourceWriteTest(unittest.TestCase):
 
 class OrderResourceWriteTest(unittest.TestCase):
 
-    @patch('tiendanube.api.requests')
-    def test_add_order(self, requests_mock):
+    @patch('tiendanube.api.requests.Session')
+    def test_add_order(self, session_mock):
+        requests_mock = session_mock.return_value
         response_mock = Mock()
         response_mock.status_code = 201
         response_mock.text = json.dumps(
@@ -985,8 +1047,9 @@ class OrderResourceWriteTest(unittest.TestCase):
             data=json.dumps({'id': 46, 'name': 'test order'})
         )
 
-    @patch('tiendanube.api.requests')
-    def test_update_order(self, requests_mock):
+    @patch('tiendanube.api.requests.Session')
+    def test_update_order(self, session_mock):
+        requests_mock = session_mock.return_value
         response_mock = Mock()
         response_mock.status_code = 200
         response_mock.text = json.dumps(
@@ -1006,8 +1069,9 @@ class OrderResourceWriteTest(unittest.TestCase):
 
 class ScriptResourceWriteTest(unittest.TestCase):
 
-    @patch('tiendanube.api.requests')
-    def test_add_script(self, requests_mock):
+    @patch('tiendanube.api.requests.Session')
+    def test_add_script(self, session_mock):
+        requests_mock = session_mock.return_value
         response_mock = Mock()
         response_mock.status_code = 201
         response_mock.text = json.dumps(
@@ -1029,8 +1093,9 @@ class ScriptResourceWriteTest(unittest.TestCase):
             data=json.dumps({'id': 46, 'name': 'test script'})
         )
 
-    @patch('tiendanube.api.requests')
-    def test_update_script(self, requests_mock):
+    @patch('tiendanube.api.requests.Session')
+    def test_update_script(self, session_mock):
+        requests_mock = session_mock.return_value
         response_mock = Mock()
         response_mock.status_code = 200
         response_mock.text = json.dumps(
@@ -1050,8 +1115,9 @@ class ScriptResourceWriteTest(unittest.TestCase):
 
 class WebhookResourceWriteTest(unittest.TestCase):
 
-    @patch('tiendanube.api.requests')
-    def test_add_webhook(self, requests_mock):
+    @patch('tiendanube.api.requests.Session')
+    def test_add_webhook(self, session_mock):
+        requests_mock = session_mock.return_value
         response_mock = Mock()
         response_mock.status_code = 201
         response_mock.text = json.dumps(
@@ -1073,8 +1139,9 @@ class WebhookResourceWriteTest(unittest.TestCase):
             data=json.dumps({'id': 46, 'name': 'test webhook'})
         )
 
-    @patch('tiendanube.api.requests')
-    def test_update_webhook(self, requests_mock):
+    @patch('tiendanube.api.requests.Session')
+    def test_update_webhook(self, session_mock):
+        requests_mock = session_mock.return_value
         response_mock = Mock()
         response_mock.status_code = 200
         response_mock.text = json.dumps(
@@ -1094,8 +1161,9 @@ class WebhookResourceWriteTest(unittest.TestCase):
 
 class CategoryResourceWriteTest(unittest.TestCase):
 
-    @patch('tiendanube.api.requests')
-    def test_add_category(self, requests_mock):
+    @patch('tiendanube.api.requests.Session')
+    def test_add_category(self, session_mock):
+        requests_mock = session_mock.return_value
         response_mock = Mock()
         response_mock.status_code = 201
         response_mock.text = json.dumps(
@@ -1117,8 +1185,9 @@ class CategoryResourceWriteTest(unittest.TestCase):
             data=json.dumps({'id': 46, 'name': 'test category'})
         )
 
-    @patch('tiendanube.api.requests')
-    def test_update_category(self, requests_mock):
+    @patch('tiendanube.api.requests.Session')
+    def test_update_category(self, session_mock):
+        requests_mock = session_mock.return_value
         response_mock = Mock()
         response_mock.status_code = 200
         response_mock.text = json.dumps(
@@ -1135,3 +1204,897 @@ class CategoryResourceWriteTest(unittest.TestCase):
             headers={'Authentication': 'bearer test_api_key', 'User-Agent': 'test user agent', 'Content-Type': 'application/json; charset=utf-8'},
             data=json.dumps({'id': 991, 'name': 'test cat updated'})
         )
+
+
+def paged_responses(pages, headers=None):
+    """
+    Build a ``Session.get`` side effect serving ``pages`` by page number,
+    with a ``next`` link on every page but the last one.
+    """
+    def get(url, params=None, **kwargs):
+        page = (params or {}).get('page', 1)
+        response = Mock()
+        response.headers = dict(headers or {})
+        if page > len(pages):
+            response.status_code = 404
+            response.reason = 'Not Found'
+            response.text = 'Last page is {}'.format(len(pages))
+            return response
+        response.status_code = 200
+        response.content = json.dumps(pages[page - 1])
+        response.links = {'next': {'url': url}} if page < len(pages) else {}
+        return response
+    return get
+
+
+class ListResourcePrefetchTest(unittest.TestCase):
+
+    @patch('tiendanube.api.requests.Session')
+    def test_prefetch_yields_pages_in_order(self, session_mock):
+        requests_mock = session_mock.return_value
+        pages = [[{'id': i}] for i in range(1, 8)]
+        requests_mock.get.side_effect = paged_responses(pages)
+        cli = APIClient('test_api_key', 'test user agent')
+        p = ProductResource(cli, '46')
+
+        res = list(p.list(fields='id', prefetch=3))
+
+        self.assertEqual(pages, res)
+
+    @patch('tiendanube.api.requests.Session')
+    def test_prefetch_ignores_pages_past_the_end(self, session_mock):
+        requests_mock = session_mock.return_value
+        requests_mock.get.side_effect = paged_responses([[{'id': 1}]])
+        cli = APIClient('test_api_key', 'test user agent')
+        p = ProductResource(cli, '46')
+
+        res = list(p.list(prefetch=4))
+
+        self.assertEqual([[{'id': 1}]], res)
+
+    @patch('tiendanube.api.requests.Session')
+    def test_prefetch_stops_when_closed(self, session_mock):
+        requests_mock = session_mock.return_value
+        pages = [[{'id': i}] for i in range(1, 101)]
+        requests_mock.get.side_effect = paged_responses(pages)
+        cli = APIClient('test_api_key', 'test user agent')
+        p = ProductResource(cli, '46')
+
+        gen = p.list(prefetch=2)
+        self.assertEqual([{'id': 1}], next(gen))
+        gen.close()
+
+        self.assertLessEqual(requests_mock.get.call_count, 4)
+
+
+    def test_prefetch_reads_ahead_of_the_current_page(self):
+        cli = APIClient('test_api_key', 'test user agent')
+        p = ProductResource(cli, '46')
+        requested = []
+
+        def get_page(extra, page, **kwargs):
+            requested.append(page)
+            return Mock(status_code=200, headers={}, links={'next': {'url': 'next'}},
+                        content=json.dumps([{'id': page}]))
+
+        p._get_page = get_page
+        gen = p.list(prefetch=1)
+        self.assertEqual([{'id': 1}], next(gen))
+
+        # Page 1 is still held by the caller.
+        for _ in range(100):
+            if 2 in requested:
+                break
+            time.sleep(0.01)
+        gen.close()
+
+        self.assertIn(2, requested)
+
+class ListResourceListAllTest(unittest.TestCase):
+
+    @patch('tiendanube.api.requests.Session')
+    def test_list_all_fans_out_from_total_count(self, session_mock):
+        requests_mock = session_mock.return_value
+        pages = [[{'id': 2 * i}, {'id': 2 * i + 1}] for i in range(6)]
+        requests_mock.get.side_effect = paged_responses(
+            pages, headers={'x-total-count': '12'})
+        cli = APIClient('test_api_key', 'test user agent')
+        p = ProductResource(cli, '46')
+
+        res = list(p.list_all(filters={'per_page': 2}, parallel=3))
+
+        self.assertEqual(pages, res)
+        self.assertEqual(6, requests_mock.get.call_count)
+
+    @patch('tiendanube.api.requests.Session')
+    def test_list_all_unordered(self, session_mock):
+        requests_mock = session_mock.return_value
+        pages = [[{'id': i}] for i in range(1, 6)]
+        requests_mock.get.side_effect = paged_responses(
+            pages, headers={'x-total-count': '5'})
+        cli = APIClient('test_api_key', 'test user agent')
+        p = ProductResource(cli, '46')
+
+        res = list(p.list_all(parallel=2, ordered=False))
+
+        self.assertEqual(pages[0], res[0])
+        self.assertEqual(sorted(pages, key=lambda page: page[0]['id']),
+                         sorted(res, key=lambda page: page[0]['id']))
+
+    @patch('tiendanube.api.requests.Session')
+    def test_list_all_without_total_count(self, session_mock):
+        requests_mock = session_mock.return_value
+        pages = [[{'id': i}] for i in range(1, 4)]
+        requests_mock.get.side_effect = paged_responses(pages)
+        cli = APIClient('test_api_key', 'test user agent')
+        p = ProductResource(cli, '46')
+
+        res = list(p.list_all(parallel=3))
+
+        self.assertEqual(pages, res)
+        self.assertEqual(3, requests_mock.get.call_count)
+
+
+class ResourceRetryTest(unittest.TestCase):
+
+    @patch('tiendanube.resources.base.time')
+    @patch('tiendanube.api.requests.Session')
+    def test_list_retries_failed_page(self, session_mock, time_mock):
+        requests_mock = session_mock.return_value
+        serve = paged_responses([[{'id': 1}], [{'id': 2}], [{'id': 3}]])
+        failures = [Mock(status_code=502, reason='Bad Gateway', text='',
+                         headers={})]
+
+        def get(url, params=None, **kwargs):
+            if (params or {}).get('page') == 2 and failures:
+                return failures.pop()
+            return serve(url, params=params, **kwargs)
+        requests_mock.get.side_effect = get
+        cli = APIClient('test_api_key', 'test user agent',
+                        retry_policy=RetryPolicy(jitter=False))
+        p = ProductResource(cli, '46')
+
+        res = list(p.list())
+
+        self.assertEqual([[{'id': 1}], [{'id': 2}], [{'id': 3}]], res)
+        self.assertEqual(4, requests_mock.get.call_count)
+        time_mock.sleep.assert_called_once_with(0.5)
+
+    @patch('tiendanube.resources.base.time')
+    @patch('tiendanube.api.requests.Session')
+    def test_failed_stream_is_closed_before_retrying(self, session_mock,
+                                                     time_mock):
+        requests_mock = session_mock.return_value
+        failed = Mock(status_code=502, reason='Bad Gateway', text='',
+                      headers={})
+        body = json.dumps([{'id': 1}]).encode('utf-8')
+        ok = Mock(status_code=200, headers={}, links={})
+        ok.iter_content.return_value = iter([body])
+        requests_mock.get.side_effect = [failed, ok]
+        cli = APIClient('test_api_key', 'test user agent',
+                        retry_policy=RetryPolicy(jitter=False))
+        p = ProductResource(cli, '46')
+
+        res = [list(page) for page in p.list(stream=True)]
+
+        self.assertEqual([[{'id': 1}]], res)
+        failed.close.assert_called_once_with()
+        self.assertTrue(requests_mock.get.call_args[1]['stream'])
+
+    @patch('tiendanube.resources.base.time')
+    @patch('tiendanube.api.requests.Session')
+    def test_gives_up_after_max_attempts(self, session_mock, time_mock):
+        requests_mock = session_mock.return_value
+        requests_mock.get.return_value = Mock(
+            status_code=503, reason='Unavailable', text='', headers={})
+        cli = APIClient('test_api_key', 'test user agent',
+                        retry_policy=RetryPolicy(max_attempts=2))
+        p = ProductResource(cli, '46')
+
+        with self.assertRaises(APIError) as cm:
+            p.get(1)
+
+        self.assertEqual(503, cm.exception.code)
+        self.assertEqual(2, requests_mock.get.call_count)
+
+    @patch('tiendanube.resources.base.time')
+    @patch('tiendanube.api.requests.Session')
+    def test_post_is_not_retried_on_server_error(self, session_mock, time_mock):
+        requests_mock = session_mock.return_value
+        requests_mock.post.return_value = Mock(
+            status_code=502, reason='Bad Gateway', text='', headers={})
+        cli = APIClient('test_api_key', 'test user agent')
+        p = ProductResource(cli, '46')
+
+        with self.assertRaises(APIError):
+            p.add({'name': 'new'})
+
+        self.assertEqual(1, requests_mock.post.call_count)
+
+    @patch('tiendanube.resources.base.time')
+    @patch('tiendanube.api.requests.Session')
+    def test_resource_policy_overrides_client(self, session_mock, time_mock):
+        requests_mock = session_mock.return_value
+        requests_mock.get.return_value = Mock(
+            status_code=503, reason='Unavailable', text='', headers={})
+        cli = APIClient('test_api_key', 'test user agent')
+        p = ProductResource(cli, '46')
+        p.retry_policy = NO_RETRY
+
+        with self.assertRaises(APIError):
+            p.get(1)
+
+        self.assertEqual(1, requests_mock.get.call_count)
+
+
+class ListResourceStreamTest(unittest.TestCase):
+
+    def streamed(self, items, next_page=False):
+        body = json.dumps(items).encode('utf-8')
+        response = Mock(status_code=200, headers={})
+        response.iter_content.return_value = iter(
+            [body[i:i + 5] for i in range(0, len(body), 5)])
+        response.links = {'next': {'url': 'next'}} if next_page else {}
+        return response
+
+    @patch('tiendanube.api.requests.Session')
+    def test_stream_yields_items_lazily(self, session_mock):
+        requests_mock = session_mock.return_value
+        first = self.streamed([{'id': 46, 'name': 'test prod'},
+                               {'id': 47, 'name': 'test prod 2'}], True)
+        second = self.streamed([{'id': 48, 'name': 'test prod 3'}])
+        requests_mock.get.side_effect = [first, second]
+        cli = APIClient('test_api_key', 'test user agent')
+        p = ProductResource(cli, '46')
+
+        pages = p.list(fields='id,name', stream=True)
+        items = next(pages)
+        self.assertEqual('test prod', next(items).name)
+        self.assertEqual([{'id': 47, 'name': 'test prod 2'}], list(items))
+        self.assertEqual([[{'id': 48, 'name': 'test prod 3'}]],
+                         [list(page) for page in pages])
+
+        requests_mock.get.assert_called_with(
+            url='https://api.tiendanube.com/v1/46/products',
+            headers={'Authentication': 'bearer test_api_key', 'User-Agent': 'test user agent'},
+            params={'fields': 'id,name', 'page': 2},
+            stream=True
+        )
+        self.assertTrue(first.close.called)
+
+    @patch('tiendanube.api.requests.Session')
+    def test_stream_releases_unread_page(self, session_mock):
+        requests_mock = session_mock.return_value
+        first = self.streamed([{'id': 46}, {'id': 47}], True)
+        second = self.streamed([{'id': 48}])
+        requests_mock.get.side_effect = [first, second]
+        cli = APIClient('test_api_key', 'test user agent')
+        p = ProductResource(cli, '46')
+
+        pages = p.list(stream=True)
+        next(next(pages))
+        self.assertEqual([{'id': 48}], list(next(pages)))
+
+        self.assertTrue(first.close.called)
+
+    def test_stream_and_prefetch_are_exclusive(self):
+        p = ProductResource(APIClient('test_api_key', 'test user agent'), '46')
+
+        with self.assertRaises(ValueError):
+            p.list(stream=True, prefetch=2)
+
+
+class IterItemsTest(unittest.TestCase):
+
+    @patch('tiendanube.api.requests.Session')
+    def test_iter_items_flattens_pages(self, session_mock):
+        requests_mock = session_mock.return_value
+        requests_mock.get.side_effect = paged_responses(
+            [[{'id': 1}, {'id': 2}], [{'id': 3}], [{'id': 4}]])
+        cli = APIClient('test_api_key', 'test user agent')
+        p = ProductResource(cli, '46')
+
+        res = list(p.iter_items(fields='id'))
+
+        self.assertEqual([{'id': 1}, {'id': 2}, {'id': 3}, {'id': 4}], res)
+
+    @patch('tiendanube.api.requests.Session')
+    def test_iter_items_limit_stops_fetching(self, session_mock):
+        requests_mock = session_mock.return_value
+        requests_mock.get.side_effect = paged_responses(
+            [[{'id': 1}, {'id': 2}], [{'id': 3}, {'id': 4}], [{'id': 5}]])
+        cli = APIClient('test_api_key', 'test user agent')
+        p = ProductResource(cli, '46')
+
+        res = list(p.iter_items(limit=3))
+
+        self.assertEqual([{'id': 1}, {'id': 2}, {'id': 3}], res)
+        self.assertEqual(2, requests_mock.get.call_count)
+
+    @patch('tiendanube.api.requests.Session')
+    def test_iter_items_streamed(self, session_mock):
+        requests_mock = session_mock.return_value
+        response = Mock(status_code=200, headers={}, links={})
+        response.iter_content.return_value = iter(
+            [json.dumps([{'id': 1}, {'id': 2}, {'id': 3}]).encode('utf-8')])
+        requests_mock.get.return_value = response
+        cli = APIClient('test_api_key', 'test user agent')
+        p = ProductResource(cli, '46')
+
+        res = list(p.iter_items(limit=2, stream=True))
+
+        self.assertEqual([{'id': 1}, {'id': 2}], res)
+        self.assertTrue(response.close.called)
+
+    @patch('tiendanube.api.requests.Session')
+    def test_iter_items_subresource(self, session_mock):
+        requests_mock = session_mock.return_value
+        response_mock = Mock()
+        response_mock.status_code = 200
+        response_mock.content = json.dumps([{'id': 1}, {'id': 2}])
+        response_mock.links = {}
+        requests_mock.get.return_value = response_mock
+        cli = APIClient('test_api_key', 'test user agent')
+        p = ProductResource(cli, '46')
+
+        res = list(p.variants.iter_items(991))
+
+        self.assertEqual([{'id': 1}, {'id': 2}], res)
+        requests_mock.get.assert_called_with(
+            url='https://api.tiendanube.com/v1/46/products/991/variants',
+            headers={'Authentication': 'bearer test_api_key', 'User-Agent': 'test user agent'},
+            params=None
+        )
+
+
+    @patch('tiendanube.api.requests.Session')
+    def test_subresource_list_follows_pages(self, session_mock):
+        requests_mock = session_mock.return_value
+        requests_mock.get.side_effect = paged_responses([[{'id': 1}], [{'id': 2}]])
+        cli = APIClient('test_api_key', 'test user agent')
+        p = ProductResource(cli, '46')
+
+        pages = list(p.variants.list(991, fields='id'))
+
+        self.assertEqual([[{'id': 1}], [{'id': 2}]], pages)
+        requests_mock.get.assert_called_with(
+            url='https://api.tiendanube.com/v1/46/products/991/variants',
+            headers={'Authentication': 'bearer test_api_key', 'User-Agent': 'test user agent'},
+            params={'fields': 'id', 'page': 2}
+        )
+
+    @patch('tiendanube.api.requests.Session')
+    def test_subresource_list_for(self, session_mock):
+        requests_mock = session_mock.return_value
+
+        def get(url, params=None, **kwargs):
+            product_id = int(url.split('/')[-2])
+            page = (params or {}).get('page', 1)
+            return Mock(status_code=200, headers={},
+                        links={'next': {'url': url}} if page == 1 else {},
+                        content=json.dumps([{'id': product_id * 10 + page}]))
+
+        requests_mock.get.side_effect = get
+        cli = APIClient('test_api_key', 'test user agent')
+        p = ProductResource(cli, '46')
+
+        res = list(p.variants.list_for([1, 2, 3], parallel=2))
+
+        self.assertEqual([(1, [11, 12]), (2, [21, 22]), (3, [31, 32])],
+                         [(id, [v.id for v in items]) for id, items in res])
+        self.assertEqual(6, requests_mock.get.call_count)
+
+class ResultModeTest(unittest.TestCase):
+
+    @patch('tiendanube.api.requests.Session')
+    def test_raw_and_dict_per_call(self, session_mock):
+        requests_mock = session_mock.return_value
+        body = json.dumps({'id': 991, 'name': 'test prod'}).encode('utf-8')
+        response_mock = Mock(status_code=200, content=body, links={})
+        requests_mock.get.return_value = response_mock
+        cli = APIClient('test_api_key', 'test user agent')
+        p = ProductResource(cli, '46')
+
+        self.assertIs(body, p.get(991, raw=True))
+        res = p.get(991, as_dict=True)
+        self.assertIs(dict, type(res))
+        self.assertEqual({'id': 991, 'name': 'test prod'}, res)
+
+    @patch('tiendanube.api.requests.Session')
+    def test_result_mode_per_client(self, session_mock):
+        requests_mock = session_mock.return_value
+        body = json.dumps([{'id': 46}]).encode('utf-8')
+        requests_mock.get.return_value = Mock(status_code=200, content=body,
+                                              links={})
+        cli = APIClient('test_api_key', 'test user agent', result_mode='raw')
+        p = ProductResource(cli, '46')
+
+        self.assertEqual([body], list(p.list()))
+        self.assertEqual([{'id': 46}], next(p.list(as_dict=True)))
+        self.assertEqual(body, StoreResource(cli, '46').get())
+
+    @patch('tiendanube.api.requests.Session')
+    def test_raw_writes(self, session_mock):
+        requests_mock = session_mock.return_value
+        body = json.dumps({'id': 991}).encode('utf-8')
+        requests_mock.put.return_value = Mock(status_code=200, content=body)
+        cli = APIClient('test_api_key', 'test user agent')
+        p = ProductResource(cli, '46')
+
+        self.assertIs(body, p.update({'id': 991, 'name': 'x'}, raw=True))
+        self.assertIs(body, p.variants.update(991, {'id': 1}, raw=True))
+
+    @patch('tiendanube.api.requests.Session')
+    def test_list_all_raw_pages(self, session_mock):
+        requests_mock = session_mock.return_value
+        pages = [[{'id': 1}, {'id': 2}], [{'id': 3}, {'id': 4}], [{'id': 5}]]
+        requests_mock.get.side_effect = paged_responses(
+            pages, headers={'x-total-count': '5'})
+        cli = APIClient('test_api_key', 'test user agent')
+        p = ProductResource(cli, '46')
+
+        res = list(p.list_all(raw=True))
+
+        self.assertEqual([json.dumps(page) for page in pages], res)
+
+    def test_raw_items_are_rejected(self):
+        cli = APIClient('test_api_key', 'test user agent')
+        p = ProductResource(cli, '46')
+
+        with self.assertRaises(ValueError):
+            p.iter_items(raw=True)
+        with self.assertRaises(ValueError):
+            APIClient('test_api_key', 'test user agent', result_mode='xml')
+
+
+class GetManyTest(unittest.TestCase):
+
+    @patch('tiendanube.api.requests.Session')
+    def test_get_many_uses_ids_filter(self, session_mock):
+        requests_mock = session_mock.return_value
+
+        def get(url, params=None, **kwargs):
+            ids = [int(i) for i in params['ids'].split(',') if int(i) < 100]
+            return Mock(status_code=200, headers={}, links={},
+                        content=json.dumps([{'id': i} for i in ids]))
+        requests_mock.get.side_effect = get
+        cli = APIClient('test_api_key', 'test user agent')
+        p = ProductResource(cli, '46')
+
+        found, missing = p.get_many([1, 2, 3, 500, 4], chunk_size=2)
+
+        self.assertEqual({1: {'id': 1}, 2: {'id': 2}, 3: {'id': 3},
+                          4: {'id': 4}}, found)
+        self.assertEqual([500], missing)
+        self.assertEqual(3, requests_mock.get.call_count)
+        requests_mock.get.assert_any_call(
+            url='https://api.tiendanube.com/v1/46/products',
+            headers={'Authentication': 'bearer test_api_key', 'User-Agent': 'test user agent'},
+            params={'ids': '1,2', 'per_page': 2}
+        )
+
+    @patch('tiendanube.api.requests.Session')
+    def test_get_many_falls_back_to_single_gets(self, session_mock):
+        requests_mock = session_mock.return_value
+
+        def get(url, params=None, **kwargs):
+            id = url.rsplit('/', 1)[1]
+            if id == '404':
+                return Mock(status_code=404, reason='Not Found', text='',
+                            headers={})
+            return Mock(status_code=200, headers={},
+                        content=json.dumps({'id': int(id)}))
+        requests_mock.get.side_effect = get
+        cli = APIClient('test_api_key', 'test user agent')
+        o = OrderResource(cli, '46')
+
+        found, missing = o.get_many(['1', '404', '2'], parallel=2)
+
+        self.assertEqual({'1': {'id': 1}, '2': {'id': 2}}, found)
+        self.assertEqual(['404'], missing)
+
+    @patch('tiendanube.api.requests.Session')
+    def test_get_many_when_filter_is_ignored(self, session_mock):
+        requests_mock = session_mock.return_value
+
+        def get(url, params=None, **kwargs):
+            if url.endswith('/products'):
+                return Mock(status_code=200, headers={}, links={},
+                            content=json.dumps([{'id': 7}, {'id': 8}]))
+            return Mock(status_code=200, headers={},
+                        content=json.dumps({'id': int(url.rsplit('/', 1)[1])}))
+        requests_mock.get.side_effect = get
+        cli = APIClient('test_api_key', 'test user agent')
+        p = ProductResource(cli, '46')
+
+        found, missing = p.get_many([1, 2], records=True)
+
+        self.assertEqual([1, 2], sorted(found))
+        self.assertEqual(2, found[2].id)
+        self.assertEqual([], missing)
+
+    @patch('tiendanube.api.requests.Session')
+    def test_get_many_does_not_walk_an_unfiltered_list(self, session_mock):
+        requests_mock = session_mock.return_value
+        pages = paged_responses([[{'id': i}] for i in range(100, 150)])
+
+        def get(url, params=None, **kwargs):
+            if url.endswith('/products'):
+                return pages(url, params=params, **kwargs)
+            return Mock(status_code=200, headers={},
+                        content=json.dumps({'id': int(url.rsplit('/', 1)[1])}))
+        requests_mock.get.side_effect = get
+        cli = APIClient('test_api_key', 'test user agent')
+        p = ProductResource(cli, '46')
+
+        found, missing = p.get_many([1, 2, 3])
+
+        self.assertEqual([1, 2, 3], sorted(found))
+        self.assertEqual(4, requests_mock.get.call_count)
+
+    @patch('tiendanube.api.requests.Session')
+    def test_get_many_caps_chunks_at_max_per_page(self, session_mock):
+        requests_mock = session_mock.return_value
+
+        def get(url, params=None, **kwargs):
+            ids = params['ids'].split(',')
+            return Mock(status_code=200, headers={}, links={},
+                        content=json.dumps([{'id': int(i)} for i in ids]))
+        requests_mock.get.side_effect = get
+        cli = APIClient('test_api_key', 'test user agent')
+        p = ProductResource(cli, '46')
+
+        found, _ = p.get_many(range(450), chunk_size=1000)
+
+        self.assertEqual(450, len(found))
+        self.assertEqual(3, requests_mock.get.call_count)
+        self.assertEqual([200, 200, 50], sorted(
+            (c[1]['params']['per_page'] for c in requests_mock.get.call_args_list),
+            reverse=True))
+
+    @patch('tiendanube.api.requests.Session')
+    def test_get_many_fields_keep_ids(self, session_mock):
+        requests_mock = session_mock.return_value
+
+        def get(url, params=None, **kwargs):
+            self.assertEqual('name,id', params['fields'])
+            if url.endswith('/products'):
+                ids = params['ids'].split(',')
+                return Mock(status_code=200, headers={}, links={},
+                            content=json.dumps([{'id': int(i), 'name': 'p'} for i in ids]))
+            return Mock(status_code=200, headers={},
+                        content=json.dumps({'id': int(url.rsplit('/', 1)[1]), 'name': 'o'}))
+        requests_mock.get.side_effect = get
+        cli = APIClient('test_api_key', 'test user agent')
+
+        found, _ = ProductResource(cli, '46').get_many([1, 2], fields='name')
+
+        self.assertEqual({1: {'id': 1, 'name': 'p'}, 2: {'id': 2, 'name': 'p'}}, found)
+        self.assertEqual(1, requests_mock.get.call_count)
+
+        found, _ = OrderResource(cli, '46').get_many([3], fields='name')
+
+        self.assertEqual({3: {'id': 3, 'name': 'o'}}, found)
+
+class BulkWriteTest(unittest.TestCase):
+
+    @patch('tiendanube.resources.base.time')
+    @patch('tiendanube.api.requests.Session')
+    def test_bulk_update_variants_reports_each_item(self, session_mock,
+                                                    time_mock):
+        requests_mock = session_mock.return_value
+
+        def put(url, data=None, **kwargs):
+            if url.endswith('/variants/2'):
+                return Mock(status_code=422, reason='Unprocessable', text='',
+                            headers={})
+            return Mock(status_code=200, text=data, headers={})
+        requests_mock.put.side_effect = put
+        cli = APIClient('test_api_key', 'test user agent')
+        p = ProductResource(cli, '46')
+        items = ((991, {'id': i, 'price': '10.00'}) for i in range(1, 5))
+
+        results = list(p.variants.bulk_update(items, concurrency=2,
+                                              ordered=True))
+
+        self.assertEqual([1, 2, 3, 4], [r.item[1]['id'] for r in results])
+        self.assertEqual([True, False, True, True], [r.ok for r in results])
+        self.assertEqual('10.00', results[0].result.price)
+        self.assertEqual(422, results[1].error.code)
+        self.assertEqual(4, requests_mock.put.call_count)
+
+    @patch('tiendanube.api.requests.Session')
+    def test_bulk_add_pulls_items_lazily(self, session_mock):
+        requests_mock = session_mock.return_value
+        requests_mock.post.side_effect = lambda url, data=None, **kwargs: Mock(
+            status_code=201, text=data, headers={})
+        cli = APIClient('test_api_key', 'test user agent')
+        c = CustomerResource(cli, '46')
+        produced = []
+
+        def items():
+            for i in range(100):
+                produced.append(i)
+                yield {'name': 'customer {}'.format(i)}
+
+        results = c.bulk_add(items(), concurrency=3)
+        next(results)
+        results.close()
+
+        self.assertLessEqual(len(produced), 6)
+
+    @patch('tiendanube.api.requests.Session')
+    def test_bulk_delete_images(self, session_mock):
+        requests_mock = session_mock.return_value
+        requests_mock.delete.return_value = Mock(status_code=200, text='{}',
+                                                 headers={})
+        cli = APIClient('test_api_key', 'test user agent')
+        p = ProductResource(cli, '46')
+
+        results = list(p.images.bulk_delete([(991, {'id': 5})]))
+
+        self.assertTrue(results[0].ok)
+        requests_mock.delete.assert_called_with(
+            url='https://api.tiendanube.com/v1/46/products/991/images/5',
+            headers={'Authentication': 'bearer test_api_key', 'User-Agent': 'test user agent'}
+        )
+
+
+class ExpandTest(unittest.TestCase):
+
+    def respond(self, url, params=None, **kwargs):
+        path = url.split('/v1/46/')[1]
+        if path.endswith('/variants'):
+            body = [{'id': 10, 'sku': 'A'}]
+        elif path.endswith('/images'):
+            body = [{'id': 20, 'src': 'a.png'}]
+        elif path == 'products':
+            page = (params or {}).get('page', 1)
+            body = [{'id': page * 100 + 1}, {'id': page * 100 + 2}]
+        else:
+            body = {'id': int(path.split('/')[1])}
+        links = {'next': {'url': url}} if path == 'products' and not params else {}
+        return Mock(status_code=200, headers={}, links=links,
+                    content=json.dumps(body))
+
+    @patch('tiendanube.api.requests.Session')
+    def test_get_expand(self, session_mock):
+        requests_mock = session_mock.return_value
+        requests_mock.get.side_effect = self.respond
+        p = ProductResource(APIClient('test_api_key', 'test user agent'), '46')
+
+        res = p.get(991, expand=['variants', 'images'])
+
+        self.assertEqual(3, requests_mock.get.call_count)
+        self.assertEqual([{'id': 10, 'sku': 'A'}], res['variants'])
+        self.assertEqual('A', res.variants[0].sku)
+        self.assertEqual([{'id': 20, 'src': 'a.png'}], res.subresources.images.list())
+        self.assertEqual(3, requests_mock.get.call_count)
+        self.assertEqual(res, pickle.loads(pickle.dumps(res)))
+        self.assertEqual(res['images'], json.loads(json.dumps(res))['images'])
+        self.assertEqual('A', p.get(991, as_dict=True, expand=['variants'])['variants'][0]['sku'])
+        self.assertEqual('A', p.get(991, records=True, expand=['variants']).variants[0].sku)
+        self.assertRaises(ValueError, p.get, 991, raw=True, expand=['variants'])
+        self.assertRaises(ValueError, p.get, 991, expand=['options'])
+
+    @patch('tiendanube.api.requests.Session')
+    def test_lazy_subresources_are_cached(self, session_mock):
+        requests_mock = session_mock.return_value
+        requests_mock.get.side_effect = self.respond
+        p = ProductResource(APIClient('test_api_key', 'test user agent'), '46')
+
+        res = p.get(991, expand=['variants'])
+        self.assertEqual(2, requests_mock.get.call_count)
+        self.assertNotIn('images', res)
+
+        images = res.subresources.images
+        self.assertIs(images, res.subresources.images)
+        self.assertEqual([20], [i.id for i in images.list()])
+        self.assertEqual([20], [i.id for i in images.list()])
+        self.assertEqual(3, requests_mock.get.call_count)
+        self.assertEqual([10], [v.id for v in res.subresources.variants.list()])
+        self.assertEqual(3, requests_mock.get.call_count)
+
+    @patch('tiendanube.api.requests.Session')
+    def test_results_without_expand_are_untouched(self, session_mock):
+        requests_mock = session_mock.return_value
+        requests_mock.get.return_value = Mock(
+            status_code=200, headers={}, links={},
+            content=json.dumps({'id': 991, 'variants': [{'id': 10}]}))
+        p = ProductResource(APIClient('test_api_key', 'test user agent'), '46')
+
+        res = p.get(991)
+
+        self.assertIs(Munch, type(res))
+        self.assertEqual([{'id': 10}], res.variants)
+        self.assertEqual(res, pickle.loads(pickle.dumps(res)))
+
+    @patch('tiendanube.api.requests.Session')
+    def test_list_expand(self, session_mock):
+        requests_mock = session_mock.return_value
+        requests_mock.get.side_effect = self.respond
+        p = ProductResource(APIClient('test_api_key', 'test user agent'), '46')
+
+        pages = list(p.list(expand=['variants'], parallel=2))
+
+        self.assertEqual([[101, 102], [201, 202]], [[i.id for i in page] for page in pages])
+        self.assertTrue(all(item.variants[0].sku == 'A'
+                            for page in pages for item in page))
+        # Two pages and one variants list per product.
+        self.assertEqual(6, requests_mock.get.call_count)
+        self.assertIs(Munch, type(next(p.iter_items())))
+
+
+class CheckpointTest(unittest.TestCase):
+
+    PAGES = [[{'id': 1, 'updated_at': '2024-03-01T10:00:00-0300'},
+              {'id': 2, 'updated_at': '2024-03-01T09:00:00-0300'}],
+             [{'id': 3, 'updated_at': '2024-03-01T11:00:00-0300'}],
+             [{'id': 4, 'updated_at': '2024-03-01T12:00:00-0300'}]]
+
+    @patch('tiendanube.api.requests.Session')
+    def test_resume_from_checkpoint(self, session_mock):
+        requests_mock = session_mock.return_value
+        requests_mock.get.side_effect = paged_responses(self.PAGES)
+        cli = APIClient('test_api_key', 'test user agent')
+        o = OrderResource(cli, '46')
+
+        pages = o.list({'status': 'open'}, 'id,updated_at')
+        self.assertEqual(1, pages.checkpoint.page)
+        next(pages)
+        next(pages)
+        # Page 2 is being processed when the export stops.
+        saved = json.loads(json.dumps(pages.checkpoint.to_dict()))
+        pages.close()
+
+        self.assertEqual({'resource': 'orders', 'filters': {'status': 'open'},
+                          'fields': 'id,updated_at', 'pagination': 'page',
+                          'page': 2, 'since_id': 2,
+                          'updated_at': '2024-03-01T10:00:00-0300',
+                          'done': False}, saved)
+
+        requests_mock.get.reset_mock()
+        resumed = o.list(resume_from=saved)
+
+        self.assertEqual([[3], [4]], [[i.id for i in page] for page in resumed])
+        self.assertEqual({'status': 'open', 'fields': 'id,updated_at', 'page': 2},
+                         requests_mock.get.call_args_list[0][1]['params'])
+        self.assertTrue(resumed.checkpoint.done)
+        self.assertEqual(4, resumed.checkpoint.since_id)
+        self.assertEqual(4, resumed.checkpoint.page)
+
+        requests_mock.get.reset_mock()
+        self.assertEqual([], list(o.list(resume_from=resumed.checkpoint)))
+        self.assertEqual(0, requests_mock.get.call_count)
+
+    @patch('tiendanube.api.requests.Session')
+    def test_checkpoint_with_prefetch_and_records(self, session_mock):
+        requests_mock = session_mock.return_value
+        requests_mock.get.side_effect = paged_responses(self.PAGES)
+        cli = APIClient('test_api_key', 'test user agent')
+        o = OrderResource(cli, '46')
+
+        pages = o.list(prefetch=2, records=True)
+        next(pages)
+        next(pages)
+        checkpoint = pages.checkpoint.copy()
+        pages.close()
+
+        resumed = o.list(resume_from=checkpoint, records=True)
+        self.assertEqual([[3], [4]], [[i.id for i in page] for page in resumed])
+
+    def test_checkpoint_must_match(self):
+        cli = APIClient('test_api_key', 'test user agent')
+        o = OrderResource(cli, '46')
+        checkpoint = o.list({'status': 'open'}).checkpoint
+
+        self.assertRaises(ValueError, o.list, {'status': 'closed'},
+                          resume_from=checkpoint)
+        self.assertRaises(ValueError, CustomerResource(cli, '46').list,
+                          resume_from=checkpoint)
+
+
+class KeysetPaginationTest(unittest.TestCase):
+
+    def keyset_responses(self, ids, per_page=2):
+        def get(url, params=None, **kwargs):
+            since_id = (params or {}).get('since_id', 0)
+            rest = [i for i in ids if i > since_id]
+            if not rest:
+                return Mock(status_code=404, reason='Not Found', text='{}', headers={})
+            return Mock(status_code=200, headers={},
+                        links={'next': {'url': url}} if len(rest) > per_page else {},
+                        content=json.dumps([{'id': i} for i in rest[:per_page]]))
+        return get
+
+    @patch('tiendanube.api.requests.Session')
+    def test_keyset_pages(self, session_mock):
+        requests_mock = session_mock.return_value
+        requests_mock.get.side_effect = self.keyset_responses([3, 5, 8, 13, 21])
+        cli = APIClient('test_api_key', 'test user agent')
+        o = OrderResource(cli, '46')
+
+        pages = o.list({'status': 'open'}, 'id', pagination='keyset')
+
+        self.assertEqual([[3, 5], [8, 13], [21]],
+                         [[i.id for i in page] for page in pages])
+        self.assertEqual(
+            [{'status': 'open', 'fields': 'id'},
+             {'status': 'open', 'fields': 'id', 'since_id': 5},
+             {'status': 'open', 'fields': 'id', 'since_id': 13}],
+            [c[1]['params'] for c in requests_mock.get.call_args_list])
+        self.assertTrue(pages.checkpoint.done)
+
+    @patch('tiendanube.api.requests.Session')
+    def test_keyset_resume_and_since_id_filter(self, session_mock):
+        requests_mock = session_mock.return_value
+        requests_mock.get.side_effect = self.keyset_responses([3, 5, 8, 13, 21])
+        cli = APIClient('test_api_key', 'test user agent')
+        o = OrderResource(cli, '46')
+
+        pages = o.list({'since_id': 4}, pagination='keyset')
+        self.assertEqual([5, 8], [i.id for i in next(pages)])
+        next(pages)
+        checkpoint = pages.checkpoint.to_dict()
+        pages.close()
+
+        self.assertEqual(({}, 8), (checkpoint['filters'], checkpoint['since_id']))
+        resumed = o.list(resume_from=checkpoint)
+        self.assertEqual([[13, 21]], [[i.id for i in page] for page in resumed])
+        self.assertRaises(ValueError, o.list, resume_from=checkpoint,
+                          pagination='page')
+
+    @patch('tiendanube.api.requests.Session')
+    def test_keyset_per_resource_and_404_end(self, session_mock):
+        requests_mock = session_mock.return_value
+        requests_mock.get.side_effect = self.keyset_responses([1, 2])
+        cli = APIClient('test_api_key', 'test user agent')
+        o = OrderResource(cli, '46')
+        o.pagination = 'keyset'
+
+        self.assertEqual([[1, 2]], [[i.id for i in page] for page in o.list()])
+        self.assertEqual([], list(o.list({'since_id': 2})))
+        self.assertRaises(ValueError, o.list, prefetch=2)
+
+    @patch('tiendanube.api.requests.Session')
+    def test_keyset_sorts_products_by_creation(self, session_mock):
+        requests_mock = session_mock.return_value
+        requests_mock.get.side_effect = self.keyset_responses([1, 2, 3])
+        cli = APIClient('test_api_key', 'test user agent')
+        p = ProductResource(cli, '46')
+
+        self.assertEqual([[1, 2], [3]],
+                         [[i['id'] for i in page]
+                          for page in p.list(pagination='keyset', as_dict=True)])
+        self.assertEqual(
+            [{'sort_by': 'created-at-ascending'},
+             {'sort_by': 'created-at-ascending', 'since_id': 2}],
+            [c[1]['params'] for c in requests_mock.get.call_args_list])
+
+    @patch('tiendanube.api.requests.Session')
+    def test_keyset_rejects_pages_out_of_order(self, session_mock):
+        requests_mock = session_mock.return_value
+
+        def get(url, params=None, **kwargs):
+            if 'since_id' not in (params or {}):
+                ids = [3, 5]
+            else:
+                ids = [9, 4]
+            return Mock(status_code=200, headers={},
+                        links={'next': {'url': url}},
+                        content=json.dumps([{'id': i} for i in ids]))
+        requests_mock.get.side_effect = get
+        cli = APIClient('test_api_key', 'test user agent')
+        o = OrderResource(cli, '46')
+
+        pages = o.list(pagination='keyset')
+        self.assertEqual([3, 5], [i.id for i in next(pages)])
+        self.assertRaises(PaginationError, next, pages)
+        self.assertEqual(5, pages.checkpoint.since_id)
+
+        requests_mock.get.side_effect = lambda url, **kwargs: Mock(
+            status_code=200, headers={}, links={},
+            iter_content=Mock(return_value=iter([b'[{"id": 8}, {"id": 2}]'])))
+        with self.assertRaises(PaginationError):
+            for page in o.list({'since_id': 1}, pagination='keyset', stream=True):
+                list(page)
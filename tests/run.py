@@ -1,5 +1,17 @@
 # -*- coding: utf-8 -*-
 from resources import *
+from api import *
+from aio import *
+from jsonstream import *
+from serializers import *
+from records import *
+from cache import *
+from singleflight import *
+from sync import *
+from mirror import *
+from webhooks import *
+from multistore import *
+from urls import *
 
 
 if __name__ == '__main__':
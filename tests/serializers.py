@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+import datetime
+import json
+import unittest
+
+from mock import Mock, patch
+from pytz import utc
+
+from tiendanube.api import APIClient
+from tiendanube.resources import ProductResource
+from tiendanube.serializers import (JSONSerializer, OrjsonSerializer,
+                                    get_serializer, orjson)
+
+
+class SerializerTest(unittest.TestCase):
+
+    def test_default_is_stdlib(self):
+        self.assertIsInstance(get_serializer(), JSONSerializer)
+        self.assertEqual('json', get_serializer('json').name)
+
+    def test_unknown_serializer(self):
+        with self.assertRaises(ValueError):
+            get_serializer('pickle')
+
+    def test_datetimes_are_isoformatted(self):
+        date = datetime.datetime(2024, 3, 1, 10, 30, 5, 120, tzinfo=utc)
+        payload = {'id': 1, 'updated_at': date, 'name': u'ñandú'}
+
+        for name in ['json', 'auto']:
+            serializer = get_serializer(name)
+            decoded = serializer.loads(serializer.dumps(payload))
+            self.assertEqual(date.isoformat(), decoded['updated_at'])
+            self.assertEqual(u'ñandú', decoded['name'])
+
+    @unittest.skipIf(orjson is None, 'orjson is not installed')
+    def test_auto_prefers_orjson(self):
+        self.assertIsInstance(get_serializer('auto'), OrjsonSerializer)
+
+    @patch('tiendanube.api.requests.Session')
+    def test_client_uses_serializer(self, session_mock):
+        requests_mock = session_mock.return_value
+        response_mock = Mock()
+        response_mock.status_code = 201
+        response_mock.text = json.dumps({'id': 46})
+        requests_mock.post.return_value = response_mock
+        serializer = Mock(wraps=JSONSerializer())
+        cli = APIClient('test_api_key', 'test user agent', serializer=serializer)
+        p = ProductResource(cli, '46')
+
+        res = p.add({'name': 'test prod'})
+
+        self.assertEqual({'id': 46}, res)
+        serializer.dumps.assert_called_once_with({'name': 'test prod'})
+        serializer.loads.assert_called_once_with(response_mock.text)
@@ -0,0 +1,97 @@
+import asyncio
+import json
+import threading
+import time
+import unittest
+
+from mock import Mock, patch
+
+from tiendanube.api import APIClient
+from tiendanube.resources import ProductResource
+from tiendanube.singleflight import AsyncSingleFlight, SingleFlight
+
+
+def run_threads(count, target):
+    results = [None] * count
+
+    def run(i):
+        try:
+            results[i] = target()
+        except Exception as e:
+            results[i] = e
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+class SingleFlightTest(unittest.TestCase):
+
+    def test_concurrent_calls_share_one_result(self):
+        group = SingleFlight()
+        calls = []
+
+        def fn():
+            calls.append(1)
+            time.sleep(0.1)
+            return 'result'
+
+        results = run_threads(5, lambda: group.do('key', fn))
+
+        self.assertEqual(['result'] * 5, results)
+        self.assertEqual(1, len(calls))
+
+    def test_errors_reach_every_caller(self):
+        group = SingleFlight()
+
+        def fn():
+            time.sleep(0.1)
+            raise ValueError('boom')
+
+        results = run_threads(3, lambda: group.do('key', fn))
+
+        self.assertTrue(all(isinstance(r, ValueError) for r in results))
+
+    def test_sequential_calls_are_not_shared(self):
+        group = SingleFlight()
+        fn = Mock(return_value=1)
+
+        group.do('key', fn)
+        group.do('key', fn)
+
+        self.assertEqual(2, fn.call_count)
+
+    def test_async_calls_share_one_result(self):
+        group = AsyncSingleFlight()
+        calls = []
+
+        async def fn():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return 'result'
+
+        async def main():
+            return await asyncio.gather(*[group.do('key', fn) for _ in range(5)])
+
+        self.assertEqual(['result'] * 5, asyncio.run(main()))
+        self.assertEqual(1, len(calls))
+        self.assertEqual({}, group._calls)
+
+    @patch('tiendanube.api.requests.Session')
+    def test_client_coalesces_identical_gets(self, session_mock):
+        requests_mock = session_mock.return_value
+
+        def get(**kwargs):
+            time.sleep(0.1)
+            return Mock(status_code=200, headers={},
+                        content=json.dumps({'id': 991}))
+        requests_mock.get.side_effect = get
+        cli = APIClient('test_api_key', 'test user agent')
+        p = ProductResource(cli, '46')
+
+        results = run_threads(5, lambda: p.get(991))
+
+        self.assertEqual([{'id': 991}] * 5, results)
+        self.assertEqual(1, requests_mock.get.call_count)
@@ -0,0 +1,102 @@
+import datetime
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from mock import Mock, patch
+
+from tiendanube.api import APIClient
+from tiendanube.resources import OrderResource
+from tiendanube.sync import (IncrementalSync, JSONFileWatermarkStore,
+                             MemoryWatermarkStore, parse_datetime)
+
+
+def order(id, minute):
+    return {'id': id, 'updated_at': '2024-03-01T10:{:02d}:00-0300'.format(minute)}
+
+
+class ParseDatetimeTest(unittest.TestCase):
+
+    def test_formats(self):
+        expected = datetime.datetime(2024, 3, 1, 13, 0, tzinfo=datetime.timezone.utc)
+
+        for value in ['2024-03-01T10:00:00-0300', '2024-03-01T10:00:00-03:00',
+                      '2024-03-01T13:00:00Z', '2024-03-01T13:00:00']:
+            self.assertEqual(expected, parse_datetime(value))
+
+
+class IncrementalSyncTest(unittest.TestCase):
+
+    def setUp(self):
+        patcher = patch('tiendanube.api.requests.Session')
+        self.requests_mock = patcher.start().return_value
+        self.addCleanup(patcher.stop)
+        self.pages = []
+        self.requests_mock.get.side_effect = self.get
+        self.orders = OrderResource(APIClient('test_api_key', 'test user agent'), '46')
+
+    def get(self, url, params=None, **kwargs):
+        page = (params or {}).get('page', 1)
+        return Mock(status_code=200, headers={},
+                    links={'next': {'url': url}} if page < len(self.pages) else {},
+                    content=json.dumps(self.pages[page - 1] if self.pages else []))
+
+    def test_runs_pull_only_changes(self):
+        store = MemoryWatermarkStore()
+        sync = IncrementalSync(self.orders, store,
+                               overlap=datetime.timedelta(minutes=5))
+        self.pages = [[order(1, 0), order(2, 10)], [order(2, 10), order(3, 20)]]
+
+        first = list(sync.changes())
+
+        self.assertEqual([1, 2, 3], [o.id for o in first])
+        self.assertNotIn('updated_at_min',
+                         self.requests_mock.get.call_args_list[0][1]['params'] or {})
+        self.assertEqual('2024-03-01T10:20:00-03:00',
+                         store.load('46', 'orders')['updated_at'])
+
+        # The overlap lists order 3 again, only order 4 is new.
+        self.pages = [[order(3, 20), order(4, 22)]]
+        second = list(sync.changes(filters={'status': 'open'}))
+
+        self.assertEqual([4], [o.id for o in second])
+        params = self.requests_mock.get.call_args[1]['params']
+        self.assertEqual('open', params['status'])
+        self.assertEqual('2024-03-01T10:15:00-03:00', params['updated_at_min'])
+
+    def test_unfinished_runs_are_not_committed(self):
+        store = MemoryWatermarkStore()
+        sync = IncrementalSync(self.orders, store)
+        self.pages = [[order(1, 0), order(2, 10)]]
+
+        changes = sync.changes()
+        next(changes)
+        changes.close()
+
+        self.assertIsNone(store.load('46', 'orders'))
+
+    def test_fields_include_sync_keys(self):
+        sync = IncrementalSync(self.orders, MemoryWatermarkStore())
+
+        list(sync.changes(fields='number'))
+
+        self.assertEqual('number,id,updated_at',
+                         self.requests_mock.get.call_args[1]['params']['fields'])
+
+
+class JSONFileWatermarkStoreTest(unittest.TestCase):
+
+    def test_round_trip(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        path = os.path.join(directory, 'marks.json')
+
+        JSONFileWatermarkStore(path).save('46', 'orders', {'updated_at': 'x'})
+        JSONFileWatermarkStore(path).save('47', 'orders', {'updated_at': 'y'})
+
+        store = JSONFileWatermarkStore(path)
+        self.assertEqual({'updated_at': 'x'}, store.load('46', 'orders'))
+        self.assertEqual({'updated_at': 'y'}, store.load('47', 'orders'))
+        self.assertIsNone(store.load('46', 'products'))
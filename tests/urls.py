@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+import random
+import unittest
+
+from furl import furl
+
+from tiendanube.api import APIClient
+from tiendanube.urls import build_url
+
+
+def furl_url(endpoint, version, id, resource, options):
+    url = furl(endpoint)
+    url.path.segments = [version, id]
+    if resource:
+        url.path.segments.append(resource)
+    url.path.segments.extend(options)
+    return str(url)
+
+
+class BuildUrlTest(unittest.TestCase):
+
+    SEGMENTS = ['123', 'variants', 'a b', 'a/b', '100%', 'ñandú', '?x=1',
+                '#top', "it's", 'a+b;c=d', '~user@host:1', '', 42, 'a\n',
+                '\n', 'a\r\n', '\x00', 'tab\there']
+
+    def test_same_as_furl(self):
+        for options in ([], ['123'], ['123', 'images', '9', 'cmd']):
+            for resource in ['products', '', None]:
+                self.assertEqual(
+                    furl_url(APIClient.API_ENDPOINT, 'v1', '46', resource, options),
+                    build_url(APIClient.API_ENDPOINT, 'v1', '46', resource, options))
+
+    def test_escaping_same_as_furl(self):
+        rand = random.Random(0)
+        chars = [chr(c) for c in range(0, 128)] + ['ñ', 'é', '€']
+        segments = self.SEGMENTS + [''.join(rand.choice(chars) for _ in range(8))
+                                    for _ in range(200)]
+        for segment in segments:
+            self.assertEqual(
+                furl_url('https://api.tiendanube.com', 'v1', '46', 'orders',
+                         [segment]),
+                build_url('https://api.tiendanube.com', 'v1', '46', 'orders',
+                          [segment]))
+
+    def test_endpoint(self):
+        self.assertEqual('http://127.0.0.1:8080/v1/46/store',
+                         build_url('http://127.0.0.1:8080/', 'v1', '46', 'store'))
+        self.assertEqual('https://api.tiendanube.com/v1/46/products/1/variants',
+                         APIClient('key', 'agent').get_url(
+                             '46', 'products', resource_id='1',
+                             subresource='variants', command=None))
@@ -0,0 +1,159 @@
+import json
+import queue
+import time
+import unittest
+
+from mock import Mock, patch
+
+from tiendanube.cache import MemoryCache
+from tiendanube.client import NubeClient
+from tiendanube.mirror import StoreMirror
+from tiendanube.webhooks import (Debouncer, InvalidSignature, WebhookError,
+                                 WebhookEvent, WebhookProcessor, WebhookServer,
+                                 parse_event, send_event, sign,
+                                 verify_signature)
+
+
+def body(event, id, store_id=46):
+    return json.dumps({'store_id': store_id, 'event': event, 'id': id})
+
+
+class SignatureTest(unittest.TestCase):
+
+    def test_verify(self):
+        signature = sign(b'{"id": 1}', 'secret')
+
+        self.assertTrue(verify_signature(b'{"id": 1}', signature, 'secret'))
+        self.assertTrue(verify_signature('{"id": 1}', signature.upper(), 'secret'))
+        self.assertFalse(verify_signature(b'{"id": 2}', signature, 'secret'))
+        self.assertFalse(verify_signature(b'{"id": 1}', signature, 'other'))
+        self.assertFalse(verify_signature(b'{"id": 1}', None, 'secret'))
+
+    def test_parse_event(self):
+        data = body('product/updated', 7)
+        headers = {'X-Linkedstore-Hmac-Sha256': sign(data, 'secret')}
+
+        event = parse_event(data, headers, 'secret')
+
+        self.assertEqual(WebhookEvent('46', 'product/updated', 'products',
+                                      'updated', 7), event)
+        self.assertIsNone(parse_event(body('app/uninstalled', None)).resource)
+        self.assertRaises(InvalidSignature, parse_event, data, {}, 'secret')
+        self.assertRaises(WebhookError, parse_event, '{"id": 1}')
+
+
+class DebouncerTest(unittest.TestCase):
+
+    def test_collapses_bursts(self):
+        batches = []
+        debouncer = Debouncer(batches.append, delay=60)
+        debouncer.add(parse_event(body('product/updated', 1)))
+        debouncer.add(parse_event(body('product/updated', 2)))
+        debouncer.add(parse_event(body('product/deleted', 1)))
+
+        self.assertEqual([], debouncer.flush())
+        self.assertEqual(2, len(debouncer))
+
+        events = debouncer.flush(force=True)
+
+        self.assertEqual([(2, 'updated'), (1, 'deleted')],
+                         [(e.id, e.action) for e in events])
+        self.assertEqual([events], batches)
+
+    def test_due_events(self):
+        batches = []
+        debouncer = Debouncer(batches.append, delay=0)
+        debouncer.add(parse_event(body('order/paid', 3)))
+
+        self.assertEqual([3], [e.id for e in debouncer.flush()])
+        self.assertEqual(0, len(debouncer))
+
+
+    def test_max_wait(self):
+        debouncer = Debouncer(lambda events: None, delay=60, max_wait=0)
+        debouncer.add(parse_event(body('product/updated', 1)))
+        debouncer.add(parse_event(body('product/updated', 1)))
+
+        self.assertEqual([1], [e.id for e in debouncer.flush()])
+
+    def test_failed_batches_are_retried(self):
+        batches = []
+
+        def callback(events):
+            batches.append(events)
+            if len(batches) == 1:
+                raise ValueError('API down')
+
+        debouncer = Debouncer(callback, delay=0, interval=0.01)
+        debouncer.add(parse_event(body('product/updated', 1)))
+        with self.assertLogs('tiendanube.webhooks', 'ERROR'):
+            debouncer.start()
+            for _ in range(200):
+                if len(batches) > 1:
+                    break
+                time.sleep(0.01)
+            debouncer.stop()
+
+        self.assertEqual([[1], [1]], [[e.id for e in b] for b in batches])
+        self.assertEqual(0, len(debouncer))
+
+class WebhookProcessorTest(unittest.TestCase):
+
+    def setUp(self):
+        patcher = patch('tiendanube.api.requests.Session')
+        self.requests_mock = patcher.start().return_value
+        self.addCleanup(patcher.stop)
+        self.client = NubeClient('test_api_key', cache=MemoryCache())
+        self.mirror = StoreMirror(self.client.get_store('46'), ':memory:')
+        self.addCleanup(self.mirror.close)
+
+    def test_refreshes_in_one_batch(self):
+        self.mirror.apply('products', {'id': 3, 'variants': []})
+        self.requests_mock.get.return_value = Mock(
+            status_code=200, headers={}, links={},
+            content=json.dumps([{'id': 1, 'variants': [{'id': 10, 'sku': 'A'}]}]))
+        changed, deleted = [], []
+        processor = WebhookProcessor(
+            self.client, {'46': self.mirror},
+            on_change=lambda *args: changed.append(args),
+            on_delete=lambda *args: deleted.append(args))
+
+        processor([parse_event(body('product/updated', 1)),
+                   parse_event(body('product/updated', 2)),
+                   parse_event(body('product/deleted', 3)),
+                   parse_event(body('app/uninstalled', None))])
+
+        self.assertEqual(1, self.requests_mock.get.call_count)
+        self.assertEqual('1,2',
+                         self.requests_mock.get.call_args[1]['params']['ids'])
+        self.assertEqual([('46', 'products', 1)],
+                         [(s, r, o['id']) for s, r, o in changed])
+        self.assertEqual([('46', 'products', 3), ('46', 'products', 2)], deleted)
+        self.assertEqual([1], [p.id for p in self.mirror.products_by_sku('A')])
+        self.assertIsNone(self.mirror.get('products', 3))
+
+    def test_invalidates_cache(self):
+        self.requests_mock.get.return_value = Mock(
+            status_code=200, headers={}, links={}, content='{"id": 1}')
+        products = self.client.get_store('46').products
+        products.get(1)
+
+        WebhookProcessor(self.client, refresh=False)(
+            [parse_event(body('product/updated', 1))])
+        products.get(1)
+
+        self.assertEqual(2, self.requests_mock.get.call_count)
+
+
+class WebhookServerTest(unittest.TestCase):
+
+    def test_round_trip(self):
+        events = queue.Queue()
+        with WebhookServer('secret', events.put) as server:
+            ok = send_event(server.url, 'secret', 46, 'order/created', 9)
+            forged = send_event(server.url, 'other', 46, 'order/created', 9)
+
+        self.assertEqual(200, ok.status_code)
+        self.assertEqual(401, forged.status_code)
+        self.assertEqual(('46', 'orders', 9), events.get_nowait().key)
+        self.assertTrue(events.empty())
@@ -0,0 +1,3 @@
+# -*- coding: utf-8 -*-
+from .api import AsyncAPIClient
+from .client import AsyncNubeClient, AsyncStore
@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+import asyncio
+import copy
+
+try:
+    import aiohttp
+except ImportError:  # pragma: no cover
+    aiohttp = None
+
+from ..api import BaseAPIClient, BufferedResponse
+from ..cache import get_cache_key
+from ..singleflight import AsyncSingleFlight
+
+
+class AsyncAPIClient(BaseAPIClient):
+
+    def __init__(self, api_key, user_agent, pool_limit=100, pool_maxsize=10,
+                 keep_alive=15, rate_limiter=None, retry_policy=None,
+                 serializer=None, result_mode='munch', cache=None,
+                 coalesce=True, credentials=None):
+        """
+        Non-blocking counterpart of ``APIClient`` backed by an
+        ``aiohttp.ClientSession``. ``pool_limit`` caps the connections open
+        at once, ``pool_maxsize`` the connections per host and
+        ``keep_alive`` the seconds an idle connection is kept. Requests are
+        paced per store by ``rate_limiter`` without blocking the loop, and
+        cached in ``cache``, coalesced and authenticated per store with
+        ``credentials`` as with ``APIClient``.
+        """
+        if aiohttp is None:
+            raise ImportError(
+                'aiohttp is required for the asyncio client: '
+                'pip install tiendanube[async]')
+        super(AsyncAPIClient, self).__init__(api_key, user_agent, rate_limiter,
+                                             retry_policy, serializer,
+                                             result_mode, cache,
+                                             AsyncSingleFlight() if coalesce else None,
+                                             credentials)
+        # A copy, the policy may be shared with sync clients.
+        self.retry_policy = copy.copy(self.retry_policy)
+        self.retry_policy.exceptions = tuple(self.retry_policy.exceptions) + (
+            aiohttp.ClientConnectionError, asyncio.TimeoutError)
+        self.pool_limit = pool_limit
+        self.pool_maxsize = pool_maxsize
+        self.keep_alive = keep_alive
+        self._session = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def close(self):
+        """
+        Close every pooled connection.
+        """
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    def _get_session(self):
+        # The session binds to the running loop, so it is built on first use.
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.pool_limit,
+                limit_per_host=self.pool_maxsize,
+                keepalive_timeout=self.keep_alive
+            )
+            self._session = aiohttp.ClientSession(connector=connector)
+        return self._session
+
+    async def make_request(self, id, resource, **kwargs):
+        verb = kwargs.get('verb', 'GET').lower()
+        url = self.get_url(id, resource, **kwargs)
+        payload = kwargs.get('extra') or kwargs.get('data')
+
+        if self.single_flight is not None and verb == 'get':
+            return await self.single_flight.do(
+                get_cache_key(url, payload),
+                lambda: self._request(id, resource, verb, url, payload, kwargs))
+        return await self._request(id, resource, verb, url, payload, kwargs)
+
+    async def _request(self, id, resource, verb, url, payload, kwargs):
+        headers = self.get_headers(id)
+
+        key, entry = self._get_cached(verb, url, payload, kwargs)
+        if entry is not None:
+            if entry.fresh:
+                return entry.to_response()
+            headers.update(entry.validators)
+
+        response = await self._send(id, verb.upper(), url, payload, headers)
+
+        if key is not None:
+            return self._store_cached(key, entry, response)
+        if self.cache is not None and verb != 'get':
+            self._invalidate(id, resource, kwargs)
+        return response
+
+    async def _send(self, id, verb, url, payload, headers):
+        params = {'headers': headers}
+        if verb in ['POST', 'PUT']:
+            params['headers']['Content-Type'] = 'application/json; charset=utf-8'
+            params['data'] = self.serializer.dumps(payload)
+        elif verb == 'GET' and payload:
+            params['params'] = payload
+
+        for _ in range(self.rate_limiter.max_requeues + 1):
+            delay = self.rate_limiter.reserve(id)
+            if delay:
+                await asyncio.sleep(delay)
+            async with self._get_session().request(verb, url, **params) as response:
+                content = await response.read()
+                response = BufferedResponse(response.status, response.reason,
+                                            content, response.headers)
+            self.rate_limiter.update(id, response.status_code, response.headers)
+            if response.status_code != 429:
+                break
+        return response
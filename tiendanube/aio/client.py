@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+import asyncio
+from itertools import islice
+
+from ..client import Store, StoreResult, _get_total
+from .api import AsyncAPIClient
+from .resources import (AsyncCategoryResource, AsyncCustomerResource,
+                        AsyncOrderResource, AsyncProductResource,
+                        AsyncStoreResource, AsyncScriptResource,
+                        AsyncWebhookResource)
+
+
+class AsyncStore(Store):
+
+    def __init__(self, http_client, store_id):
+        self.store = AsyncStoreResource(http_client, store_id)
+        self.customers = AsyncCustomerResource(http_client, store_id)
+        self.products = AsyncProductResource(http_client, store_id)
+        self.categories = AsyncCategoryResource(http_client, store_id)
+        self.orders = AsyncOrderResource(http_client, store_id)
+        self.scripts = AsyncScriptResource(http_client, store_id)
+        self.webhooks = AsyncWebhookResource(http_client, store_id)
+
+    async def get_info(self):
+        return await self.store.get()
+
+
+class AsyncNubeClient(object):
+
+    def __init__(self, api_key, user_agent='MyNubeApp (mynubeapp.com)',
+                 **options):
+        self._http_client = AsyncAPIClient(api_key, user_agent, **options)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def close(self):
+        await self._http_client.close()
+
+    def get_store(self, store_id):
+        return AsyncStore(self._http_client, str(store_id))
+
+    async def map_stores(self, store_ids, fn, concurrency=8, progress=None,
+                         cancel=None):
+        """
+        Asyncio counterpart of ``NubeClient.map_stores``: await
+        ``fn(store)`` on every store, ``concurrency`` at a time, and yield a
+        ``StoreResult`` per store as they complete. Setting ``cancel`` or
+        closing the generator cancels the stores still running.
+        """
+        total = _get_total(store_ids)
+        iterator = iter(store_ids)
+        pending = {}
+
+        def submit(count):
+            for store_id in islice(iterator, count):
+                if cancel is not None and cancel.is_set():
+                    return
+                task = asyncio.ensure_future(fn(self.get_store(store_id)))
+                pending[task] = store_id
+
+        done = 0
+        try:
+            submit(concurrency)
+            while pending:
+                finished, _ = await asyncio.wait(
+                    list(pending), return_when=asyncio.FIRST_COMPLETED)
+                results = []
+                for task in finished:
+                    error = task.exception()
+                    results.append(StoreResult(pending.pop(task),
+                                               None if error else task.result(),
+                                               error))
+                submit(len(finished))
+                for result in results:
+                    done += 1
+                    if progress is not None:
+                        progress(result, done, total)
+                    yield result
+                    if cancel is not None and cancel.is_set():
+                        return
+        finally:
+            for task in pending:
+                task.cancel()
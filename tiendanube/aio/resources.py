@@ -0,0 +1,201 @@
+# -*- coding: utf-8 -*-
+import asyncio
+
+from ..resources.base import ListSubResource, Resource, _get_extra
+from ..resources.records import (Category, Customer, Order, Product,
+                                 Record)
+from ..resources.exceptions import APIError
+
+
+class AsyncResource(Resource):
+
+    async def _make_request(self, resource, **kwargs):
+        policy = self._get_retry_policy()
+        verb = kwargs.get('verb', 'GET')
+        attempt = 1
+        while True:
+            try:
+                response = await self._http_client.make_request(self.store_id, resource, **kwargs)
+            except Exception as e:
+                if not policy.should_retry(verb, attempt, error=e):
+                    raise
+                await asyncio.sleep(policy.get_delay(attempt))
+                attempt = attempt + 1
+                continue
+
+            if response.status_code in [200, 201]:
+                return response
+            if not policy.should_retry(verb, attempt, response.status_code):
+                raise APIError('{}. {}'.format(response.reason, response.text),
+                               response.status_code)
+            await asyncio.sleep(policy.get_delay(attempt, response))
+            attempt = attempt + 1
+
+
+class AsyncListResource(AsyncResource):
+    """
+    Results follow the same ``raw``, ``as_dict`` and ``records`` options as
+    ``ListResource``.
+    """
+
+    record_class = Record
+
+    async def get(self, id, raw=False, as_dict=False, records=False):
+        mode = self._get_mode(raw, as_dict, records)
+        response = await self._make_request(self.resource_name, resource_id=str(id))
+        return self._decode(response, mode)
+
+    async def list(self, filters=None, fields=None, raw=False, as_dict=False,
+                   records=False):
+        """
+        Iterate asynchronously over the pages of the resource.
+        """
+        mode = self._get_mode(raw, as_dict, records)
+        async for page in self._iter_pages(mode, self.resource_name,
+                                           _get_extra(filters, fields)):
+            yield page
+
+    async def _iter_pages(self, mode, resource, extra, **kwargs):
+        page = 1
+        while True:
+            response = await self._make_request(resource, extra=extra, **kwargs)
+            yield self._decode(response, mode)
+            if not response.links.get('next'):
+                break
+            page = page + 1
+            extra = dict(extra, page=page)
+
+    async def add(self, resource_dict, raw=False, as_dict=False,
+                  records=False):
+        mode = self._get_mode(raw, as_dict, records)
+        response = await self._make_request(self.resource_name, data=resource_dict, verb='post')
+        return self._decode(response, mode, text=True)
+
+    async def update(self, resource_update_dict, raw=False, as_dict=False,
+                     records=False):
+        res_id = str(resource_update_dict['id'])
+        mode = self._get_mode(raw, as_dict, records)
+        response = await self._make_request(self.resource_name, resource_id=res_id,
+                                            data=resource_update_dict, verb='put')
+        return self._decode(response, mode, text=True)
+
+    async def command(self, resource_update_dict, raw=False, as_dict=False,
+                      records=False, **kwargs):
+        res_id = str(resource_update_dict['id'])
+        mode = self._get_mode(raw, as_dict, records)
+        response = await self._make_request(self.resource_name, resource_id=res_id,
+                                            data=resource_update_dict, verb='post',
+                                            **kwargs)
+        return self._decode(response, mode, text=True)
+
+    async def delete(self, resource_delete_dict, raw=False, as_dict=False,
+                     records=False):
+        res_id = str(resource_delete_dict['id'])
+        mode = self._get_mode(raw, as_dict, records)
+        response = await self._make_request(self.resource_name, resource_id=res_id,
+                                            verb='delete')
+        return self._decode(response, mode, text=True)
+
+
+class AsyncListSubResource(AsyncListResource):
+
+    def __init__(self, resource, subresource):
+        super(AsyncListSubResource, self).__init__(resource._http_client, resource.store_id)
+        self.resource_name = resource.resource_name
+        self.subresource = subresource
+        self.record_class = ListSubResource.record_classes.get(subresource, Record)
+
+    async def get(self, resource_id, id, raw=False, as_dict=False,
+                  records=False):
+        mode = self._get_mode(raw, as_dict, records)
+        response = await self._make_request(
+            self.resource_name,
+            resource_id=str(resource_id),
+            subresource=self.subresource,
+            subresource_id=str(id))
+        return self._decode(response, mode)
+
+    async def list(self, resource_id, filters=None, fields=None, raw=False,
+                   as_dict=False, records=False):
+        """
+        Iterate asynchronously over the pages of subresources of a resource.
+        """
+        mode = self._get_mode(raw, as_dict, records)
+        async for page in self._iter_pages(mode, self.resource_name,
+                                           _get_extra(filters, fields),
+                                           resource_id=str(resource_id),
+                                           subresource=self.subresource):
+            yield page
+
+    async def add(self, resource_id, subresource_dict, raw=False,
+                  as_dict=False, records=False):
+        mode = self._get_mode(raw, as_dict, records)
+        response = await self._make_request(
+            self.resource_name,
+            resource_id=str(resource_id),
+            subresource=self.subresource,
+            data=subresource_dict,
+            verb='post')
+        return self._decode(response, mode, text=True)
+
+    async def update(self, resource_id, subresource_update_dict, raw=False,
+                     as_dict=False, records=False):
+        mode = self._get_mode(raw, as_dict, records)
+        response = await self._make_request(
+            self.resource_name,
+            resource_id=str(resource_id),
+            subresource=self.subresource,
+            subresource_id=subresource_update_dict['id'],
+            data=subresource_update_dict,
+            verb='put')
+        return self._decode(response, mode, text=True)
+
+
+class AsyncCategoryResource(AsyncListResource):
+
+    resource_name = 'categories'
+    record_class = Category
+
+
+class AsyncCustomerResource(AsyncListResource):
+
+    resource_name = 'customers'
+    record_class = Customer
+
+
+class AsyncOrderResource(AsyncListResource):
+
+    resource_name = 'orders'
+    record_class = Order
+
+
+class AsyncProductResource(AsyncListResource):
+
+    resource_name = 'products'
+    record_class = Product
+
+    def __init__(self, http_client, store_id):
+        super(AsyncProductResource, self).__init__(http_client, store_id)
+        self.images = AsyncListSubResource(self, 'images')
+        self.variants = AsyncListSubResource(self, 'variants')
+
+
+class AsyncScriptResource(AsyncListResource):
+
+    resource_name = 'scripts'
+
+
+class AsyncStoreResource(AsyncResource):
+
+    async def get(self, raw=False, as_dict=False, records=False):
+        """
+        Get a single store.
+        """
+        mode = self._get_mode(raw, as_dict, records)
+        response = await self._make_request('store')
+        return self._decode(response, mode)
+
+
+class AsyncWebhookResource(AsyncListResource):
+
+    resource_name = 'webhooks'
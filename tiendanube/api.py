@@ -1,54 +1,264 @@
 # -*- coding: utf-8 -*-
 import json
+import threading
+import time
+
 import requests
-from furl import furl
+from requests.adapters import HTTPAdapter
+from requests.utils import parse_header_links
+
+from .cache import CacheEntry, get_cache_key
+from .ratelimit import RateLimiter
+from .retry import RetryPolicy
+from .serializers import get_serializer
+from .singleflight import SingleFlight
+from .urls import build_url
 
 
-def _do_verb(verb, url, payload, headers):
+def _do_verb(session, verb, url, payload, headers, stream=False,
+             dumps=json.dumps):
     params = {
         'url': url,
         'headers': headers
     }
-    method = getattr(requests, verb)
+    if stream:
+        params['stream'] = True
+    method = getattr(session, verb)
 
     if verb in ['post', 'put']:
         params['headers']['Content-Type'] = 'application/json; charset=utf-8'
-        params['data'] = json.dumps(payload)
+        params['data'] = dumps(payload)
     elif verb == 'get':
         params['params'] = payload
 
     return method(**params)
 
 
-class APIClient(object):
+class BufferedResponse(object):
+    """
+    A fully read response exposing the parts of ``requests.Response`` the
+    resources rely on.
+    """
+
+    def __init__(self, status_code, reason, content, headers):
+        self.status_code = status_code
+        self.reason = reason
+        self.content = content
+        self.headers = headers
+
+    @property
+    def text(self):
+        return self.content.decode('utf-8')
+
+    @property
+    def links(self):
+        header = self.headers.get('link')
+        if not header:
+            return {}
+        return {link.get('rel') or link.get('url'): link
+                for link in parse_header_links(header)}
+
+    def close(self):
+        pass
+
+
+class BaseAPIClient(object):
     API_VERSION = 'v1'
     API_ENDPOINT = 'https://api.tiendanube.com'
     ARGS = ['resource_id', 'subresource', 'subresource_id', 'command']
 
-    def __init__(self, api_key, user_agent):
+    RESULT_MODES = ['munch', 'records', 'dict', 'raw']
+
+    def __init__(self, api_key, user_agent, rate_limiter=None,
+                 retry_policy=None, serializer=None, result_mode='munch',
+                 cache=None, single_flight=None, credentials=None):
         headers = {
             'Authentication': 'bearer {}'.format(api_key),
             'User-Agent': user_agent
         }
         self.headers = headers
+        self.rate_limiter = rate_limiter or RateLimiter()
+        self.retry_policy = retry_policy or RetryPolicy()
+        if serializer is None or isinstance(serializer, str):
+            serializer = get_serializer(serializer)
+        self.serializer = serializer
+        if result_mode not in self.RESULT_MODES:
+            raise ValueError('Unknown result mode: {}'.format(result_mode))
+        self.result_mode = result_mode
+        self.cache = cache
+        self.single_flight = single_flight
+        self.credentials = credentials
+
+    def get_headers(self, id):
+        """
+        The headers of a request to store ``id``, authenticated with its own
+        token when ``credentials`` are given.
+        """
+        headers = dict(self.headers)
+        if self.credentials is not None:
+            headers['Authentication'] = 'bearer {}'.format(self.credentials(id))
+        return headers
 
     def get_options(self, args):
         return [args[k] for k in self.ARGS if k in args and args[k]]
 
+    def get_url(self, id, resource, **kwargs):
+        return build_url(self.API_ENDPOINT, self.API_VERSION, id, resource,
+                         self.get_options(kwargs))
+
+    def _get_cached(self, verb, url, payload, kwargs):
+        """
+        Return the cache key of a request and its cached entry, if any.
+        """
+        if self.cache is None or verb != 'get' or kwargs.get('stream'):
+            return None, None
+        key = get_cache_key(url, payload)
+        return key, self.cache.get(key)
+
+    def _store_cached(self, key, entry, response):
+        if response.status_code == 304 and entry is not None:
+            entry.expires = time.time() + self.cache.ttl
+            self.cache.set(key, entry)
+            return entry.to_response()
+        if response.status_code == 200:
+            self.cache.set(key, CacheEntry.from_response(response, self.cache.ttl))
+        return response
+
+    def _invalidate(self, id, resource, kwargs):
+        """
+        Drop the cached lists of a written resource, the object itself and
+        everything below it.
+        """
+        base = self.get_url(id, resource)
+        self.cache.delete_prefix(base + '?')
+        if kwargs.get('resource_id'):
+            url = self.get_url(id, resource, resource_id=kwargs['resource_id'])
+            self.cache.delete_prefix(url + '?')
+            self.cache.delete_prefix(url + '/')
+
+
+class APIClient(BaseAPIClient):
+
+    def __init__(self, api_key, user_agent, pool_connections=10,
+                 pool_maxsize=10, pool_block=False, keep_alive=None,
+                 rate_limiter=None, retry_policy=None, serializer=None,
+                 result_mode='munch', cache=None, coalesce=True,
+                 credentials=None, scheduler=None):
+        """
+        Every request goes through a single ``requests.Session`` so TCP/TLS
+        connections are reused between calls. ``pool_connections`` is the
+        number of hosts to keep pools for, ``pool_maxsize`` the connections
+        kept per host and ``keep_alive`` the seconds an idle pool is trusted
+        before its connections are dropped and opened again.
+
+        Requests are paced per store by ``rate_limiter``, a ``RateLimiter``
+        built with the API defaults unless one is given. Failed requests are
+        retried by resources according to ``retry_policy``. Bodies are
+        encoded and decoded by ``serializer``, a serializer instance or the
+        name of one (see ``tiendanube.serializers.get_serializer``).
+        ``result_mode`` is what resources return by default: ``'munch'``
+        objects, lightweight ``'records'``, plain ``'dict'`` JSON or the
+        ``'raw'`` undecoded body.
+
+        Given a ``cache`` backend from ``tiendanube.cache``, GET responses
+        are served from it while fresh and revalidated with their ETag or
+        Last-Modified once stale. Writes drop the entries they affect.
+
+        With ``coalesce`` set, identical GETs issued at the same time by
+        several threads share a single request and its response.
+
+        To serve many stores from one client, ``credentials`` is a callable
+        returning the token of a store id, used instead of ``api_key``, and
+        ``scheduler`` a ``FairScheduler`` sharing the connections among
+        stores.
+        """
+        super(APIClient, self).__init__(api_key, user_agent, rate_limiter,
+                                        retry_policy, serializer, result_mode,
+                                        cache,
+                                        SingleFlight() if coalesce else None,
+                                        credentials)
+        self.scheduler = scheduler
+        self.keep_alive = keep_alive
+        self._last_used = None
+        self._lock = threading.Lock()
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_connections,
+                              pool_maxsize=pool_maxsize,
+                              pool_block=pool_block)
+        self._session.mount('https://', adapter)
+        self._session.mount('http://', adapter)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """
+        Close every pooled connection.
+        """
+        self._session.close()
+
+    def _get_session(self):
+        now = time.monotonic()
+        with self._lock:
+            if (self.keep_alive is not None and self._last_used is not None
+                    and now - self._last_used > self.keep_alive):
+                self._session.close()
+            self._last_used = now
+        return self._session
+
     def make_request(self, id, resource, **kwargs):
         verb = kwargs.get('verb', 'GET').lower()
+        url = self.get_url(id, resource, **kwargs)
+        payload = kwargs.get('extra') or kwargs.get('data')
 
-        url = furl(self.API_ENDPOINT)
-        url.path.segments = [
-            self.API_VERSION,
-            id
-        ]
+        if (self.single_flight is not None and verb == 'get' and
+                not kwargs.get('stream')):
+            def fetch():
+                response = self._request(id, resource, verb, url, payload, kwargs)
+                # Read the body once, before other threads share the response.
+                response.content
+                return response
+            return self.single_flight.do(get_cache_key(url, payload), fetch)
+        return self._request(id, resource, verb, url, payload, kwargs)
 
-        if resource:
-            url.path.segments.append(resource)
+    def _request(self, id, resource, verb, url, payload, kwargs):
+        headers = self.get_headers(id)
 
-        url.path.segments.extend(self.get_options(kwargs))
+        key, entry = self._get_cached(verb, url, payload, kwargs)
+        if entry is not None:
+            if entry.fresh:
+                return entry.to_response()
+            headers.update(entry.validators)
 
-        payload = kwargs.get('extra') or kwargs.get('data')
+        response = self._send(id, verb, url, payload, headers,
+                              kwargs.get('stream', False))
+
+        if key is not None:
+            return self._store_cached(key, entry, response)
+        if self.cache is not None and verb != 'get':
+            self._invalidate(id, resource, kwargs)
+        return response
 
-        return _do_verb(verb, str(url), payload=payload, headers=self.headers)
+    def _send(self, id, verb, url, payload, headers, stream):
+        response = None
+        for _ in range(self.rate_limiter.max_requeues + 1):
+            if response is not None:
+                # Free the throttled response's connection before requeuing.
+                response.close()
+            self.rate_limiter.acquire(id)
+            if self.scheduler is not None:
+                self.scheduler.acquire(id)
+            try:
+                response = _do_verb(self._get_session(), verb, url,
+                                    payload=payload, headers=dict(headers),
+                                    stream=stream, dumps=self.serializer.dumps)
+            finally:
+                if self.scheduler is not None:
+                    self.scheduler.release()
+            self.rate_limiter.update(id, response.status_code, response.headers)
+            if response.status_code != 429:
+                break
+        return response
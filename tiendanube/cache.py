@@ -0,0 +1,235 @@
+# -*- coding: utf-8 -*-
+import hashlib
+import os
+import pickle
+import shutil
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+
+try:
+    from urllib.parse import quote, urlencode
+except ImportError:  # pragma: no cover
+    from urllib import quote, urlencode
+
+from requests.structures import CaseInsensitiveDict
+
+# Response headers kept with a cached body.
+CACHED_HEADERS = ['etag', 'last-modified', 'link', 'x-total-count']
+
+
+def get_cache_key(url, params=None):
+    """
+    Key of a GET request. Every key holds a ``?`` so the entries of one path
+    can be told apart from those of the paths below it.
+    """
+    query = urlencode(sorted(params.items()), doseq=True) if params else ''
+    return '{}?{}'.format(url, query)
+
+
+class CacheEntry(object):
+
+    def __init__(self, content, headers, expires):
+        self.content = content
+        self.headers = headers
+        self.expires = expires
+
+    @classmethod
+    def from_response(cls, response, ttl):
+        headers = {}
+        for name in CACHED_HEADERS:
+            try:
+                value = response.headers.get(name)
+            except AttributeError:
+                value = None
+            if isinstance(value, str):
+                headers[name] = value
+        return cls(response.content, headers, time.time() + ttl)
+
+    @property
+    def fresh(self):
+        return time.time() < self.expires
+
+    @property
+    def validators(self):
+        """
+        Conditional request headers to revalidate a stale entry.
+        """
+        validators = {}
+        if 'etag' in self.headers:
+            validators['If-None-Match'] = self.headers['etag']
+        if 'last-modified' in self.headers:
+            validators['If-Modified-Since'] = self.headers['last-modified']
+        return validators
+
+    def to_response(self):
+        # Imported here, the API module depends on this one.
+        from .api import BufferedResponse
+        return BufferedResponse(200, 'OK', self.content,
+                                CaseInsensitiveDict(self.headers))
+
+
+class CacheBackend(object):
+    """
+    Storage for cached responses.
+
+    Subclass it to share a cache between processes, e.g. on Redis or
+    memcached: entries are picklable and keys are strings. ``ttl`` is the
+    seconds a response is served without asking the API again.
+    """
+
+    def __init__(self, ttl=60):
+        self.ttl = ttl
+
+    def get(self, key):
+        """
+        Return the entry under ``key``, fresh or stale, or ``None``.
+        """
+        raise NotImplementedError
+
+    def set(self, key, entry):
+        raise NotImplementedError
+
+    def delete_prefix(self, prefix):
+        """
+        Drop every entry whose key starts with ``prefix``.
+        """
+        raise NotImplementedError
+
+    def clear(self):
+        raise NotImplementedError
+
+
+class MemoryCache(CacheBackend):
+    """
+    In-process LRU cache holding up to ``maxsize`` responses.
+    """
+
+    def __init__(self, maxsize=1024, ttl=60):
+        super(MemoryCache, self).__init__(ttl)
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key, entry):
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def delete_prefix(self, prefix):
+        with self._lock:
+            for key in [k for k in self._entries if k.startswith(prefix)]:
+                del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class DiskCache(CacheBackend):
+    """
+    Cache keeping one pickled file per response under ``directory``, so it
+    survives restarts and can be shared by processes on the same host.
+
+    Files are laid out in one directory per path segment of the key, so
+    ``delete_prefix`` drops whole directories from their names and only
+    reads the files of a single path when the prefix reaches into a query.
+    """
+
+    def __init__(self, directory, ttl=60):
+        super(DiskCache, self).__init__(ttl)
+        self.directory = directory
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+
+    def _get_dir(self, path):
+        # The 'd' keeps empty segments and '.' or '..' usable as names.
+        return os.path.join(self.directory, *[
+            'd' + quote(segment, safe='') for segment in path.split('/')])
+
+    def _get_path(self, key):
+        name = hashlib.sha1(key.encode('utf-8')).hexdigest()
+        return os.path.join(self._get_dir(key.split('?', 1)[0]),
+                            name + '.cache')
+
+    def _read(self, path):
+        try:
+            with open(path, 'rb') as f:
+                return pickle.load(f)
+        except (IOError, OSError, EOFError, pickle.UnpicklingError):
+            return None, None
+
+    def _entries(self, directory):
+        try:
+            names = os.listdir(directory)
+        except OSError:
+            return []
+        return [os.path.join(directory, name) for name in names
+                if name.endswith('.cache')]
+
+    def _remove(self, path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def get(self, key):
+        stored_key, entry = self._read(self._get_path(key))
+        return entry if stored_key == key else None
+
+    def set(self, key, entry):
+        path = self._get_path(key)
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+        try:
+            fd, tmp = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        except FileNotFoundError:
+            # Another thread or process dropped the directory meanwhile.
+            os.makedirs(directory, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        with os.fdopen(fd, 'wb') as f:
+            pickle.dump((key, entry), f, pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+
+    def delete_prefix(self, prefix):
+        if '?' in prefix:
+            path, query = prefix.split('?', 1)
+            for entry in self._entries(self._get_dir(path)):
+                if query:
+                    key, _ = self._read(entry)
+                    if key is None or not key.startswith(prefix):
+                        continue
+                self._remove(entry)
+            return
+        # Every key below a directory whose segment starts with the last
+        # one of the prefix matches, and none of the parent's own keys do.
+        segments = prefix.split('/')
+        parent = (self._get_dir('/'.join(segments[:-1]))
+                  if len(segments) > 1 else self.directory)
+        start = 'd' + quote(segments[-1], safe='')
+        try:
+            names = os.listdir(parent)
+        except OSError:
+            return
+        for name in names:
+            path = os.path.join(parent, name)
+            if name.startswith(start) and os.path.isdir(path):
+                shutil.rmtree(path, ignore_errors=True)
+
+    def clear(self):
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            if name.startswith('d') and os.path.isdir(path):
+                shutil.rmtree(path, ignore_errors=True)
+            elif name.endswith('.cache'):
+                self._remove(path)
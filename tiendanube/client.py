@@ -1,9 +1,57 @@
 # -*- coding: utf-8 -*-
+import threading
+from collections import OrderedDict, namedtuple
+
 from .api import APIClient
+from .concurrency import bounded_map
 from .resources import (CategoryResource, CustomerResource,
                         OrderResource, ProductResource,
                         StoreResource, ScriptResource,
                         WebhookResource)
+from .scheduler import FairScheduler
+
+
+class StoreResult(namedtuple('StoreResult', ['store_id', 'result', 'error'])):
+    """
+    Outcome of a job run on one store by ``map_stores``: what the job
+    returned or the error it raised.
+    """
+
+    @property
+    def ok(self):
+        return self.error is None
+
+
+def _get_total(store_ids):
+    try:
+        return len(store_ids)
+    except TypeError:
+        return None
+
+
+def _map_stores(get_store, store_ids, fn, concurrency, ordered, progress,
+                cancel):
+    total = _get_total(store_ids)
+
+    def ids():
+        for store_id in store_ids:
+            if cancel is not None and cancel.is_set():
+                return
+            yield store_id
+
+    def call(store_id):
+        return fn(get_store(store_id))
+
+    done = 0
+    for store_id, future in bounded_map(call, ids(), concurrency, ordered):
+        error = future.exception()
+        result = StoreResult(store_id, None if error else future.result(), error)
+        done += 1
+        if progress is not None:
+            progress(result, done, total)
+        yield result
+        if cancel is not None and cancel.is_set():
+            return
 
 
 class Store(object):
@@ -20,6 +68,13 @@ class Store(object):
     def get_info(self):
         return self.store.get()
 
+    def mirror(self, path, **kwargs):
+        """
+        Open the local SQLite mirror of this store kept at ``path``.
+        """
+        from .mirror import StoreMirror
+        return StoreMirror(self, path, **kwargs)
+
     def __getitem__(self, key):
         return self.__dict__[key]
 
@@ -41,8 +96,112 @@ class Store(object):
 
 class NubeClient(object):
 
-    def __init__(self, api_key, user_agent='MyNubeApp (mynubeapp.com)'):
-        self._http_client = APIClient(api_key, user_agent)
+    def __init__(self, api_key, user_agent='MyNubeApp (mynubeapp.com)',
+                 **options):
+        self._http_client = APIClient(api_key, user_agent, **options)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self._http_client.close()
 
     def get_store(self, store_id):
         return Store(self._http_client, str(store_id))
+
+    def map_stores(self, store_ids, fn, concurrency=8, ordered=False,
+                   progress=None, cancel=None):
+        """
+        Run ``fn(store)`` on every store of ``store_ids``, ``concurrency``
+        at a time, and yield a ``StoreResult`` per store as they complete
+        (in input order when ``ordered`` is set).
+
+        A failing store is reported in its result and does not stop the
+        others. Requests keep going through the per-store rate limiter.
+        ``progress(result, done, total)`` is called after each store, with
+        ``total`` None when ``store_ids`` has no length. Setting the
+        ``cancel`` event, or closing the generator, stops starting new
+        stores; the ones already running finish in the background.
+        """
+        return _map_stores(self.get_store, store_ids, fn, concurrency,
+                           ordered, progress, cancel)
+
+
+class MultiStoreClient(object):
+    """
+    One client for many stores, each with its own token.
+
+    Every store shares one connection pool and one ``FairScheduler``.
+    Freed connections are handed to the stores in turn, so a busy store
+    does not starve the rest. Each store is still paced by its own bucket
+    of the rate limiter. ``tokens`` maps store ids to their tokens, or is a
+    callable returning the token of a store id, called on every request.
+    ``Store`` objects are built on first use and the ``max_stores`` most
+    recently used are kept.
+    """
+
+    def __init__(self, tokens=None, user_agent='MyNubeApp (mynubeapp.com)',
+                 max_stores=1024, max_concurrent=10, **options):
+        if callable(tokens):
+            self._token_loader, self._tokens = tokens, {}
+        else:
+            self._token_loader = None
+            self._tokens = dict((str(k), v) for k, v in (tokens or {}).items())
+        self.max_stores = max_stores
+        self._stores = OrderedDict()
+        self._lock = threading.Lock()
+        options.setdefault('pool_maxsize', max_concurrent)
+        options.setdefault('scheduler', FairScheduler(max_concurrent))
+        self._http_client = APIClient(None, user_agent,
+                                      credentials=self.get_token, **options)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self._http_client.close()
+
+    def add_store(self, store_id, token):
+        self._tokens[str(store_id)] = token
+
+    def remove_store(self, store_id):
+        store_id = str(store_id)
+        with self._lock:
+            self._tokens.pop(store_id, None)
+            self._stores.pop(store_id, None)
+
+    def get_token(self, store_id):
+        if self._token_loader is not None:
+            return self._token_loader(store_id)
+        try:
+            return self._tokens[store_id]
+        except KeyError:
+            raise KeyError('No token for store {}'.format(store_id))
+
+    def get_store(self, store_id):
+        store_id = str(store_id)
+        if self._token_loader is None and store_id not in self._tokens:
+            raise KeyError('No token for store {}'.format(store_id))
+        with self._lock:
+            store = self._stores.pop(store_id, None)
+            if store is None:
+                store = Store(self._http_client, store_id)
+            self._stores[store_id] = store
+            while len(self._stores) > self.max_stores:
+                self._stores.popitem(last=False)
+        return store
+
+    def map_stores(self, store_ids, fn, concurrency=8, ordered=False,
+                   progress=None, cancel=None):
+        """
+        Like ``NubeClient.map_stores``. The fair scheduler keeps the
+        stores with more requests from delaying the rest.
+        """
+        return _map_stores(self.get_store, store_ids, fn, concurrency,
+                           ordered, progress, cancel)
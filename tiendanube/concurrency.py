@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from itertools import islice
+
+
+def bounded_map(fn, iterable, workers, ordered=True):
+    """
+    Call ``fn`` on every item of ``iterable`` using ``workers`` threads and
+    yield ``(item, future)`` pairs once each call is done.
+
+    At most ``workers`` calls are in flight and ``iterable`` is only advanced
+    when a slot frees up, so slow consumers hold back the producer. Results
+    come back in input order when ``ordered`` is true, otherwise as they
+    complete. Closing the generator cancels the calls not yet started.
+    """
+    executor = ThreadPoolExecutor(max_workers=workers)
+    iterator = iter(iterable)
+    pending = deque() if ordered else {}
+
+    def submit(items):
+        for item in items:
+            future = executor.submit(fn, item)
+            if ordered:
+                pending.append((item, future))
+            else:
+                pending[future] = item
+
+    try:
+        submit(islice(iterator, workers))
+        while pending:
+            if ordered:
+                item, future = pending.popleft()
+                wait([future])
+                done = [(item, future)]
+            else:
+                finished, _ = wait(list(pending), return_when=FIRST_COMPLETED)
+                done = [(pending.pop(future), future) for future in finished]
+            submit(islice(iterator, len(done)))
+            for item, future in done:
+                yield item, future
+    finally:
+        futures = pending if not ordered else [f for _, f in pending]
+        for future in futures:
+            future.cancel()
+        executor.shutdown(wait=False)
@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+import codecs
+import json
+
+_WHITESPACE = ' \t\n\r'
+
+
+class _Buffer(object):
+
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+        self._decoder = codecs.getincrementaldecoder('utf-8')()
+        self.text = ''
+        self.pos = 0
+        self.exhausted = False
+
+    def read(self, size=0):
+        """
+        Read chunks until more than ``size`` characters are pending. Returns
+        whether that many are available.
+        """
+        if self.pos:
+            self.text = self.text[self.pos:]
+            self.pos = 0
+        while not self.exhausted and len(self.text) <= size:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                self.exhausted = True
+                self.text += self._decoder.decode(b'', True)
+            else:
+                self.text += self._decoder.decode(chunk)
+        return len(self.text) > size
+
+    def peek(self):
+        while True:
+            while self.pos < len(self.text) and self.text[self.pos] in _WHITESPACE:
+                self.pos = self.pos + 1
+            if self.pos < len(self.text) or not self.read():
+                return self.text[self.pos:self.pos + 1]
+
+
+def iter_array(chunks, decoder=None):
+    """
+    Yield the elements of a JSON array whose encoded text arrives as an
+    iterable of byte chunks.
+
+    Only the element being decoded and the unread part of the current chunk
+    are held in memory, instead of the whole document.
+    """
+    decode = (decoder or json.JSONDecoder()).raw_decode
+    buf = _Buffer(chunks)
+    if buf.peek() != '[':
+        raise ValueError('Expected a JSON array')
+    buf.pos = buf.pos + 1
+
+    first = True
+    while True:
+        char = buf.peek()
+        if char == ']':
+            return
+        if not first:
+            if char != ',':
+                raise ValueError('Expected "," or "]" in JSON array')
+            buf.pos = buf.pos + 1
+            buf.peek()
+        first = False
+
+        while True:
+            try:
+                item, end = decode(buf.text, buf.pos)
+                # A value running to the end of the buffer may be cut short.
+                if end < len(buf.text) or buf.exhausted:
+                    break
+            except ValueError:
+                if buf.exhausted:
+                    raise
+            pending = len(buf.text) - buf.pos
+            buf.read(2 * pending)
+        buf.pos = end
+        yield item
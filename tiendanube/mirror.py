@@ -0,0 +1,269 @@
+# -*- coding: utf-8 -*-
+import datetime
+import json
+import sqlite3
+import threading
+
+from munch import munchify
+
+from .sync import IncrementalSync, WatermarkStore, parse_datetime
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS products (
+    id INTEGER PRIMARY KEY, updated_at TEXT, data TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS variants (
+    id INTEGER PRIMARY KEY, product_id INTEGER, sku TEXT, updated_at TEXT,
+    data TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS customers (
+    id INTEGER PRIMARY KEY, email TEXT, updated_at TEXT, data TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS orders (
+    id INTEGER PRIMARY KEY, number INTEGER, customer_id INTEGER, email TEXT,
+    updated_at TEXT, data TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS categories (
+    id INTEGER PRIMARY KEY, parent INTEGER, updated_at TEXT,
+    data TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS handles (
+    resource TEXT NOT NULL, object_id INTEGER NOT NULL, lang TEXT,
+    handle TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS sync_state (
+    store_id TEXT NOT NULL, resource TEXT NOT NULL, state TEXT NOT NULL,
+    PRIMARY KEY (store_id, resource));
+CREATE INDEX IF NOT EXISTS products_updated_at ON products (updated_at);
+CREATE INDEX IF NOT EXISTS variants_product_id ON variants (product_id);
+CREATE INDEX IF NOT EXISTS variants_sku ON variants (sku);
+CREATE INDEX IF NOT EXISTS variants_updated_at ON variants (updated_at);
+CREATE INDEX IF NOT EXISTS customers_email ON customers (email);
+CREATE INDEX IF NOT EXISTS customers_updated_at ON customers (updated_at);
+CREATE INDEX IF NOT EXISTS orders_customer_id ON orders (customer_id);
+CREATE INDEX IF NOT EXISTS orders_email ON orders (email);
+CREATE INDEX IF NOT EXISTS orders_updated_at ON orders (updated_at);
+CREATE INDEX IF NOT EXISTS categories_updated_at ON categories (updated_at);
+CREATE INDEX IF NOT EXISTS handles_handle ON handles (handle, resource);
+CREATE INDEX IF NOT EXISTS handles_object ON handles (resource, object_id);
+'''
+
+
+def _to_utc(value):
+    # Stored in UTC so the text columns sort and compare chronologically.
+    return parse_datetime(value).astimezone(datetime.timezone.utc).isoformat()
+
+
+def _get_timestamp(obj):
+    value = obj.get('updated_at')
+    return _to_utc(value) if value else None
+
+
+def _get_handles(obj):
+    handle = obj.get('handle')
+    if isinstance(handle, dict):
+        return [(lang, value) for lang, value in handle.items() if value]
+    if handle:
+        return [(None, handle)]
+    return []
+
+
+class SQLiteWatermarkStore(WatermarkStore):
+    """
+    Keeps the sync states in the mirror database itself, so they always
+    match its contents.
+    """
+
+    def __init__(self, mirror):
+        self.mirror = mirror
+
+    def load(self, store_id, resource):
+        row = self.mirror._fetchone(
+            'SELECT state FROM sync_state WHERE store_id = ? AND resource = ?',
+            (str(store_id), resource))
+        return json.loads(row[0]) if row else None
+
+    def save(self, store_id, resource, state):
+        # The objects a sync has not written yet go in the same transaction,
+        # so the watermark never gets ahead of the stored objects.
+        with self.mirror._lock, self.mirror._db:
+            self.mirror._write_pending()
+            self.mirror._db.execute(
+                'INSERT OR REPLACE INTO sync_state VALUES (?, ?, ?)',
+                (str(store_id), resource, json.dumps(state)))
+
+
+class StoreMirror(object):
+    """
+    Local SQLite copy of a store's products (with their variants),
+    customers, orders and categories, indexed for the lookups that would
+    otherwise page through the API: id, sku, handle, email and updated_at.
+
+    ``sync`` pulls the changes since the last pull, and ``apply`` and
+    ``remove`` keep the copy fresh from webhooks in between.
+    """
+
+    RESOURCES = ['products', 'customers', 'orders', 'categories']
+
+    # Objects written per transaction by ``sync``.
+    batch_size = 500
+
+    def __init__(self, store, path, overlap=None):
+        self.store = store
+        self.store_id = store.store.store_id
+        self.path = path
+        self.overlap = overlap
+        self._lock = threading.RLock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._pending = []
+        with self._lock:
+            self._db.executescript(SCHEMA)
+        self.watermarks = SQLiteWatermarkStore(self)
+
+    def close(self):
+        self._db.close()
+
+    def _fetchone(self, sql, params=()):
+        with self._lock:
+            return self._db.execute(sql, params).fetchone()
+
+    def _fetchall(self, sql, params=()):
+        with self._lock:
+            return self._db.execute(sql, params).fetchall()
+
+    def sync(self, resources=None):
+        """
+        Pull what changed in each of ``resources`` (all by default) since
+        the previous sync, and return how many objects were stored per
+        resource. Objects are written ``batch_size`` at a time, each batch
+        in one transaction.
+        """
+        counts = {}
+        for name in resources or self.RESOURCES:
+            if name not in self.RESOURCES:
+                raise ValueError('Unknown resource: {}'.format(name))
+            kwargs = {}
+            if self.overlap is not None:
+                kwargs['overlap'] = self.overlap
+            sync = IncrementalSync(self.store[name], self.watermarks, **kwargs)
+            counts[name] = 0
+            try:
+                for obj in sync.changes(as_dict=True):
+                    with self._lock:
+                        self._pending.append((name, obj))
+                        if len(self._pending) >= self.batch_size:
+                            self._flush()
+                    counts[name] = counts[name] + 1
+            finally:
+                self._flush()
+        return counts
+
+    def _flush(self):
+        with self._lock, self._db:
+            self._write_pending()
+
+    def _write_pending(self):
+        # Called with the lock held, inside a transaction.
+        pending, self._pending = self._pending, []
+        for resource, obj in pending:
+            self._write(resource, obj)
+
+    def apply(self, resource, obj):
+        """
+        Store ``obj``, the full JSON of an object of ``resource``.
+        """
+        if resource not in self.RESOURCES:
+            raise ValueError('Unknown resource: {}'.format(resource))
+        with self._lock, self._db:
+            self._write(resource, obj)
+
+    def _write(self, resource, obj):
+        id = obj['id']
+        data = json.dumps(obj)
+        updated_at = _get_timestamp(obj)
+        db = self._db
+        if resource == 'products':
+            db.execute('INSERT OR REPLACE INTO products VALUES (?, ?, ?)',
+                       (id, updated_at, data))
+            db.execute('DELETE FROM variants WHERE product_id = ?', (id,))
+            db.executemany(
+                'INSERT OR REPLACE INTO variants VALUES (?, ?, ?, ?, ?)',
+                [(v['id'], id, v.get('sku'), _get_timestamp(v), json.dumps(v))
+                 for v in obj.get('variants') or []])
+        elif resource == 'customers':
+            db.execute('INSERT OR REPLACE INTO customers VALUES (?, ?, ?, ?)',
+                       (id, obj.get('email'), updated_at, data))
+        elif resource == 'orders':
+            customer = obj.get('customer') or {}
+            db.execute('INSERT OR REPLACE INTO orders VALUES (?, ?, ?, ?, ?, ?)',
+                       (id, obj.get('number'), customer.get('id'),
+                        obj.get('contact_email') or customer.get('email'),
+                        updated_at, data))
+        elif resource == 'categories':
+            db.execute('INSERT OR REPLACE INTO categories VALUES (?, ?, ?, ?)',
+                       (id, obj.get('parent'), updated_at, data))
+        db.execute('DELETE FROM handles WHERE resource = ? AND object_id = ?',
+                   (resource, id))
+        db.executemany('INSERT INTO handles VALUES (?, ?, ?, ?)',
+                       [(resource, id, lang, handle)
+                        for lang, handle in _get_handles(obj)])
+
+    def remove(self, resource, id):
+        """
+        Drop an object deleted from the store.
+        """
+        if resource not in self.RESOURCES:
+            raise ValueError('Unknown resource: {}'.format(resource))
+        with self._lock, self._db:
+            self._db.execute('DELETE FROM {} WHERE id = ?'.format(resource), (id,))
+            if resource == 'products':
+                self._db.execute('DELETE FROM variants WHERE product_id = ?', (id,))
+            self._db.execute('DELETE FROM handles WHERE resource = ? AND object_id = ?',
+                             (resource, id))
+
+    def _load(self, rows):
+        return [munchify(json.loads(row[0])) for row in rows]
+
+    def get(self, resource, id):
+        if resource not in self.RESOURCES + ['variants']:
+            raise ValueError('Unknown resource: {}'.format(resource))
+        found = self._load(self._fetchall(
+            'SELECT data FROM {} WHERE id = ?'.format(resource), (id,)))
+        return found[0] if found else None
+
+    def variants_by_sku(self, sku):
+        return self._load(self._fetchall(
+            'SELECT data FROM variants WHERE sku = ?', (sku,)))
+
+    def products_by_sku(self, sku):
+        return self._load(self._fetchall(
+            'SELECT p.data FROM products p WHERE p.id IN '
+            '(SELECT product_id FROM variants WHERE sku = ?) ORDER BY p.id', (sku,)))
+
+    def by_handle(self, resource, handle):
+        if resource not in self.RESOURCES:
+            raise ValueError('Unknown resource: {}'.format(resource))
+        return self._load(self._fetchall(
+            'SELECT r.data FROM {} r WHERE r.id IN (SELECT object_id FROM handles '
+            'WHERE handle = ? AND resource = ?) ORDER BY r.id'.format(resource),
+            (handle, resource)))
+
+    def products_by_handle(self, handle):
+        return self.by_handle('products', handle)
+
+    def customers_by_email(self, email):
+        return self._load(self._fetchall(
+            'SELECT data FROM customers WHERE email = ? ORDER BY id', (email,)))
+
+    def orders_for_customer(self, customer_id):
+        return self._load(self._fetchall(
+            'SELECT data FROM orders WHERE customer_id = ? ORDER BY id',
+            (customer_id,)))
+
+    def orders_by_email(self, email):
+        return self._load(self._fetchall(
+            'SELECT data FROM orders WHERE email = ? ORDER BY id', (email,)))
+
+    def updated_since(self, resource, since):
+        """
+        Objects of ``resource`` changed at or after the ``since`` datetime.
+        """
+        if resource not in self.RESOURCES + ['variants']:
+            raise ValueError('Unknown resource: {}'.format(resource))
+        return self._load(self._fetchall(
+            'SELECT data FROM {} WHERE updated_at >= ? ORDER BY updated_at'.format(resource),
+            (_to_utc(since),)))
@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+import threading
+import time
+
+
+def _get_number(headers, name):
+    try:
+        return float(headers.get(name))
+    except (AttributeError, TypeError, ValueError):
+        return None
+
+
+class _Bucket(object):
+
+    def __init__(self, capacity, leak_rate):
+        self.capacity = capacity
+        self.leak_rate = leak_rate
+        self.level = 0.0
+        self.updated = time.monotonic()
+
+    def leak(self, now):
+        self.level = max(0.0, self.level - (now - self.updated) * self.leak_rate)
+        self.updated = now
+
+
+class RateLimiter(object):
+    """
+    Client side model of the API leaky bucket, kept per store.
+
+    Every request reserves a slot in its store's bucket and is told how long
+    to wait before it may go out, so callers queue up instead of hitting 429s.
+    The model is corrected with the ``x-rate-limit-*`` headers of each
+    response. ``margin`` slots are kept free to stay just under the limit and
+    a 429 is sent again up to ``max_requeues`` times once the bucket drains.
+    """
+
+    def __init__(self, capacity=40, leak_rate=2.0, margin=1, max_requeues=3):
+        self.capacity = capacity
+        self.leak_rate = leak_rate
+        self.margin = margin
+        self.max_requeues = max_requeues
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def _get_bucket(self, store_id):
+        bucket = self._buckets.get(store_id)
+        if bucket is None:
+            bucket = self._buckets[store_id] = _Bucket(self.capacity, self.leak_rate)
+        return bucket
+
+    def reserve(self, store_id):
+        """
+        Take a slot for ``store_id`` and return the seconds to wait before
+        using it.
+        """
+        with self._lock:
+            bucket = self._get_bucket(store_id)
+            bucket.leak(time.monotonic())
+            bucket.level += 1
+            excess = bucket.level - (bucket.capacity - self.margin)
+            return max(0.0, excess / bucket.leak_rate)
+
+    def acquire(self, store_id):
+        delay = self.reserve(store_id)
+        if delay:
+            time.sleep(delay)
+
+    def update(self, store_id, status_code, headers):
+        """
+        Correct the bucket of ``store_id`` with what the API reported.
+        """
+        limit = _get_number(headers, 'x-rate-limit-limit')
+        remaining = _get_number(headers, 'x-rate-limit-remaining')
+        reset = _get_number(headers, 'x-rate-limit-reset')
+        with self._lock:
+            bucket = self._get_bucket(store_id)
+            bucket.leak(time.monotonic())
+            if limit:
+                bucket.capacity = limit
+            if limit is not None and remaining is not None:
+                used = limit - remaining
+                if reset and used > 0:
+                    # x-rate-limit-reset is the time, in ms, to fully drain.
+                    bucket.leak_rate = used / (reset / 1000.0)
+                bucket.level = max(bucket.level, used)
+            if status_code == 429:
+                bucket.level = max(bucket.level, bucket.capacity)
@@ -1,28 +1,34 @@
 # -*- coding: utf-8 -*-
-import json
 
 from .base import ListResource, Resource, ListSubResource
 from .decorators import subresources
+from .records import Category, Customer, Order, Product
 
 class CategoryResource(ListResource):
 
     resource_name = 'categories'
+    record_class = Category
 
 
 class CustomerResource(ListResource):
 
     resource_name = 'customers'
+    record_class = Customer
 
 
 class OrderResource(ListResource):
 
     resource_name = 'orders'
+    record_class = Order
 
 
-# @subresources(['variants', 'images'])
+@subresources(['variants', 'images'])
 class ProductResource(ListResource):
 
     resource_name = 'products'
+    record_class = Product
+    ids_filter = 'ids'
+    keyset_sort = {'sort_by': 'created-at-ascending'}
 
     def __init__(self ,http_client, store_id):
         super(ProductResource, self).__init__(http_client, store_id)
@@ -37,11 +43,13 @@ class ScriptResource(ListResource):
 
 class StoreResource(Resource):
 
-    def get(self):
+    def get(self, raw=False, as_dict=False, records=False):
         """
         Get a single store.
         """
-        return json.loads(self._make_request('store').content)
+        mode = self._get_mode(raw, as_dict, records)
+        response = self._make_request('store')
+        return self._decode(response, mode)
 
 
 class WebhookResource(ListResource):
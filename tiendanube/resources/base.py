@@ -1,10 +1,17 @@
 # -*- coding: utf-8 -*-
+import copy
 import datetime
-import json
+import time
+from collections import OrderedDict, deque, namedtuple
+from concurrent.futures import ThreadPoolExecutor
 
 from munch import munchify
 
-from .exceptions import APIError
+from ..concurrency import bounded_map
+from ..jsonstream import iter_array
+from .exceptions import APIError, PaginationError
+from .pagination import Checkpoint, PageIterator
+from .records import Image, Record, Variant, to_records
 
 
 def _get_value(val):
@@ -13,117 +20,657 @@ def _get_value(val):
     return val
 
 
+def _get_extra(filters, fields):
+    extra = dict()
+    if filters:
+        extra = {k: _get_value(v) for k, v in filters.items()}
+    if fields:
+        extra['fields'] = fields
+    return extra
+
+
+def _check_keyset(items, since_id):
+    # Keyset pages move on from the highest id seen, so any item out of
+    # ascending order would leave others behind unnoticed.
+    for item in items:
+        id = item.get('id')
+        if id is None or (since_id is not None and id <= since_id):
+            raise PaginationError(
+                'Keyset page not in ascending id order: {} after {}'.format(
+                    id, since_id))
+        since_id = id
+        yield item
+
+
+def _get_total(response):
+    try:
+        return int(response.headers.get('x-total-count'))
+    except (TypeError, ValueError):
+        return None
+
+
+class BulkResult(namedtuple('BulkResult', ['item', 'result', 'error'])):
+    """
+    Outcome of one item of a bulk write: the API response or the error
+    raised while writing it.
+    """
+
+    @property
+    def ok(self):
+        return self.error is None
+
+
+def _drain(page):
+    # Pop items off the page so each one is released once consumed.
+    page.reverse()
+    while page:
+        yield page.pop()
+
+
+def _iter_items(pages, limit=None):
+    count = 0
+    try:
+        if limit is not None and limit <= 0:
+            return
+        for page in pages:
+            if isinstance(page, list):
+                page = _drain(page)
+            for item in page:
+                yield item
+                count = count + 1
+                if limit is not None and count >= limit:
+                    return
+    finally:
+        close = getattr(pages, 'close', None)
+        if close:
+            close()
+
+
 class Resource(object):
 
+    # Overrides the retry policy of the API client for this resource only.
+    retry_policy = None
+
     def __init__(self, api_client, store_id):
         self.store_id = store_id
         self._http_client = api_client
 
+    def _loads(self, data):
+        return self._http_client.serializer.loads(data)
+
+    def _get_mode(self, raw=False, as_dict=False, records=False):
+        if raw:
+            return 'raw'
+        if as_dict:
+            return 'dict'
+        if records:
+            return 'records'
+        return getattr(self._http_client, 'result_mode', 'munch')
+
+    def _get_wrap(self, mode):
+        if mode == 'raw':
+            raise ValueError('Raw bodies cannot be split into items')
+        if mode == 'dict':
+            return lambda data: data
+        if mode == 'records':
+            record_class = getattr(self, 'record_class', Record)
+            return lambda data: to_records(data, record_class)
+        return munchify
+
+    def _decode(self, response, mode, text=False):
+        if mode == 'raw':
+            return response.content
+        data = self._loads(response.text if text else response.content)
+        return self._get_wrap(mode)(data)
+
+    def _get_retry_policy(self):
+        return self.retry_policy or self._http_client.retry_policy
+
     def _make_request(self, resource, **kwargs):
-        response = self._http_client.make_request(self.store_id, resource, **kwargs)
+        policy = self._get_retry_policy()
+        verb = kwargs.get('verb', 'GET')
+        attempt = 1
+        while True:
+            try:
+                response = self._http_client.make_request(self.store_id, resource, **kwargs)
+            except Exception as e:
+                if not policy.should_retry(verb, attempt, error=e):
+                    raise
+                time.sleep(policy.get_delay(attempt))
+                attempt = attempt + 1
+                continue
 
-        if response.status_code not in [200, 201]:
-            raise APIError('{}. {}'.format(response.reason, response.text),
-                           response.status_code)
-        return response
+            if response.status_code in [200, 201]:
+                return response
+            if not policy.should_retry(verb, attempt, response.status_code):
+                raise APIError('{}. {}'.format(response.reason, response.text),
+                               response.status_code)
+            # Give a streamed response's connection back to the pool.
+            response.close()
+            time.sleep(policy.get_delay(attempt, response))
+            attempt = attempt + 1
 
 
 class ListResource(Resource):
+    """
+    Every method returns ``Munch`` objects unless the API client was built
+    with another ``result_mode`` or the call asks for ``raw=True`` (the
+    undecoded body), ``as_dict=True`` (plain decoded JSON) or
+    ``records=True`` (lightweight records of ``record_class``).
+    """
+
+    # Size of the chunks read from the connection by streamed pages.
+    stream_chunk_size = 64 * 1024
 
-    def get(self, id):
-        return munchify(json.loads(self._make_request(self.resource_name, resource_id=str(id)).content))
+    # Type of the items returned when ``records=True`` is asked for.
+    record_class = Record
 
-    def list(self, filters=None, fields=None):
+    # List filter taking comma separated ids, when the endpoint has one.
+    ids_filter = None
+
+    # Most items the API returns in one page.
+    max_per_page = 200
+
+    # How ``list`` walks the pages by default: ``'page'`` numbers or
+    # ``'keyset'``, asking for the items after the last id seen.
+    pagination = 'page'
+
+    # Filters making the list come in ascending id order, as keyset pages
+    # need, when the endpoint does not already sort it that way.
+    keyset_sort = None
+
+    def get(self, id, raw=False, as_dict=False, records=False):
+        mode = self._get_mode(raw, as_dict, records)
+        return self._decode(self._make_request(self.resource_name, resource_id=str(id)), mode)
+
+    def list(self, filters=None, fields=None, prefetch=0, stream=False,
+             raw=False, as_dict=False, records=False, resume_from=None,
+             pagination=None):
         """
         Get the list of customers for a store.
+
+        With ``prefetch`` set, up to that many following pages are requested
+        on a worker pool while the current one is being consumed. Pages are
+        still yielded in order.
+
+        With ``stream`` set, each page is an iterator decoding its items one
+        at a time straight from the connection, so only one item is held in
+        memory. A page has to be consumed before the next one is requested.
+
+        The returned iterator keeps its position in ``checkpoint``. Passing
+        that checkpoint, or its ``to_dict()``, as ``resume_from`` carries
+        on from where it stopped, with the same filters and fields.
+
+        ``pagination`` overrides the resource's: ``'keyset'`` requests each
+        page with ``since_id`` set to the highest id of the previous one
+        instead of a page number, which keeps deep pages as fast as the
+        first and does not skip or repeat items when earlier ones change
+        meanwhile. Keyset pages cannot be prefetched, and a page whose ids
+        are not increasing raises ``PaginationError`` rather than skip
+        items.
         """
-        extra = dict()
-        if filters:
-            extra = {k: _get_value(v) for k, v in filters.items()}
-        if fields:
-            extra['fields'] = fields
-        params = {
-            'resource': self.resource_name,
-            'extra': extra
-        }
-        page = 1
+        checkpoint = self._get_checkpoint(filters, fields, resume_from,
+                                          pagination)
+        extra = checkpoint.get_extra()
+        mode = self._get_mode(raw, as_dict, records)
+        if checkpoint.done:
+            pages = (page for page in ())
+        elif checkpoint.pagination == 'keyset':
+            if prefetch:
+                raise ValueError('keyset pagination cannot prefetch pages')
+            pages = self._keyset_pages(extra, mode, stream, checkpoint)
+        elif stream:
+            if prefetch:
+                raise ValueError('stream and prefetch cannot be combined')
+            pages = self._stream_pages(extra, self._get_wrap(mode), checkpoint)
+        elif prefetch:
+            pages = self._prefetch_pages(extra, mode, prefetch, checkpoint)
+        else:
+            pages = self._iter_pages(extra, mode, checkpoint.page, checkpoint)
+        return PageIterator(pages, checkpoint)
+
+    def _get_checkpoint_name(self):
+        return self.resource_name
+
+    def _get_checkpoint(self, filters, fields, resume_from, pagination=None):
+        name = self._get_checkpoint_name()
+        if resume_from is None:
+            extra = _get_extra(filters, None)
+            pagination = pagination or self.pagination
+            since_id = None
+            if pagination == 'keyset':
+                since_id = extra.pop('since_id', None)
+            return Checkpoint(name, extra, fields, pagination,
+                              since_id=since_id)
+        if isinstance(resume_from, dict):
+            resume_from = Checkpoint.from_dict(resume_from)
+        if resume_from.resource != name:
+            raise ValueError('Checkpoint of {} cannot resume {}'.format(
+                resume_from.resource, name))
+        if ((filters or fields) and
+                _get_extra(filters, fields) != resume_from.get_extra()):
+            raise ValueError('Filters and fields differ from the checkpoint')
+        if pagination and pagination != resume_from.pagination:
+            raise ValueError('Checkpoint uses {} pagination'.format(
+                resume_from.pagination))
+        return resume_from.copy()
+
+    def iter_items(self, filters=None, fields=None, limit=None, **kwargs):
+        """
+        Iterate over the items of every page instead of over the pages.
+
+        Items are dropped from their page as they are handed out and no more
+        pages are requested once ``limit`` items have been yielded. Any other
+        keyword, such as ``prefetch``, ``stream`` or ``records``, is passed
+        to ``list``.
+        """
+        if kwargs.get('raw'):
+            raise ValueError('Raw bodies cannot be split into items')
+        return _iter_items(self.list(filters, fields, **kwargs), limit)
+
+    def _get_page(self, extra, page, **kwargs):
+        if page > 1:
+            extra = dict(extra, page=page)
+        return self._make_request(self.resource_name, extra=extra, **kwargs)
+
+    def _stream_items(self, response, wrap, checkpoint=None, keyset=False):
+        items = iter_array(response.iter_content(self.stream_chunk_size))
+        if keyset:
+            items = _check_keyset(items, checkpoint.since_id)
+        try:
+            for item in items:
+                if checkpoint is not None:
+                    checkpoint.see(item)
+                yield wrap(item)
+        finally:
+            response.close()
+
+    def _stream_pages(self, extra, wrap, checkpoint):
+        page = checkpoint.page
         while True:
-            response = self._make_request(**params)
-            yield munchify(json.loads(response.content))
+            response = self._get_page(extra, page, stream=True)
+            items = self._stream_items(response, wrap, checkpoint)
+            try:
+                yield items
+            finally:
+                # Release the connection of a page the caller left unread.
+                items.close()
+                response.close()
+            checkpoint.advance(page + 1)
             if not response.links.get('next'):
+                checkpoint.finish()
                 break
+            page = page + 1
+
+    def _iter_pages(self, extra, mode, page=1, checkpoint=None):
+        while True:
+            response = self._get_page(extra, page)
+            decoded = self._decode(response, mode)
+            if checkpoint is not None and mode != 'raw':
+                checkpoint.see_page(decoded)
+            yield decoded
+            if checkpoint is not None:
+                checkpoint.advance(page + 1)
+            if not response.links.get('next'):
+                if checkpoint is not None:
+                    checkpoint.finish()
+                break
+            page = page + 1
+
+    def _keyset_pages(self, extra, mode, stream, checkpoint):
+        wrap = self._get_wrap(mode)
+        while True:
+            page_extra = dict(self.keyset_sort or {}, **extra)
+            if checkpoint.since_id is not None:
+                page_extra['since_id'] = checkpoint.since_id
+            try:
+                response = self._get_page(page_extra, 1, stream=stream)
+            except APIError as e:
+                # The API answers 404 when nothing is left after since_id.
+                if e.code != 404 or checkpoint.since_id is None:
+                    raise
+                checkpoint.finish()
+                return
+            since_id = checkpoint.since_id
+            if stream:
+                items = self._stream_items(response, wrap, checkpoint,
+                                           keyset=True)
+                try:
+                    yield items
+                finally:
+                    items.close()
+                    response.close()
             else:
-                page = page + 1
-                params.get('extra').update({
-                    'page': page
-                })
+                page = self._decode(response, mode)
+                data = self._loads(page) if mode == 'raw' else page
+                checkpoint.see_page(list(_check_keyset(data, since_id)))
+                yield page
+            checkpoint.advance()
+            # An unread streamed page leaves since_id where it was; asking
+            # again would return the same page.
+            if (checkpoint.since_id == since_id or
+                    not response.links.get('next')):
+                checkpoint.finish()
+                break
+
+    def list_all(self, filters=None, fields=None, parallel=4, ordered=True,
+                 raw=False, as_dict=False, records=False):
+        """
+        Get every page of the list, fetching them ``parallel`` at a time.
+
+        The page count is worked out from the ``x-total-count`` header of the
+        first page. Pages are yielded in page order, or as soon as each one
+        arrives when ``ordered`` is false. Without the header the pages are
+        walked sequentially through their ``next`` links.
+        """
+        extra = _get_extra(filters, fields)
+        mode = self._get_mode(raw, as_dict, records)
+        response = self._get_page(extra, 1)
+        first_page = self._decode(response, mode)
+        yield first_page
+        if not response.links.get('next'):
+            return
+
+        total = _get_total(response)
+        if total is None:
+            for page in self._iter_pages(extra, mode, 2):
+                yield page
+            return
 
+        per_page = extra.get('per_page')
+        if not per_page:
+            per_page = len(self._loads(first_page) if mode == 'raw' else first_page)
+        last_page = -(-total // int(per_page))
 
-    def add(self, resource_dict):
-        return munchify(json.loads(self._make_request(self.resource_name, data=resource_dict, verb='post').text))
+        def fetch(page):
+            return self._decode(self._get_page(extra, page), mode)
 
-    def update(self, resource_update_dict):
+        for page, future in bounded_map(fetch, range(2, last_page + 1),
+                                        parallel, ordered):
+            yield future.result()
+
+    def get_many(self, ids, chunk_size=30, parallel=4, fields=None,
+                 as_dict=False, records=False):
+        """
+        Get several objects at once.
+
+        Returns a ``(found, missing)`` tuple: a dict of the objects keyed by
+        the given ids and the list of ids that do not exist. Where the
+        resource has an ``ids_filter`` the ids are looked up ``chunk_size``
+        at a time (at most ``max_per_page``) through the list endpoint,
+        otherwise each one is fetched on its own. Either way ``parallel`` requests run at once, and only
+        ``fields`` (plus ``id``) are requested when given.
+        """
+        wanted = OrderedDict((str(id), id) for id in ids)
+        mode = self._get_mode(False, as_dict, records)
+        wrap = self._get_wrap(mode)
+        found = {}
+        if fields:
+            # Both paths need the ids to match the items to the request.
+            names = fields.split(',')
+            if 'id' not in names:
+                fields = ','.join(names + ['id'])
+
+        def fetch_chunk(chunk):
+            extra = _get_extra({self.ids_filter: ','.join(chunk),
+                                'per_page': len(chunk)}, fields)
+            response = self._get_page(extra, 1)
+            items = self._decode(response, 'dict')
+            if any(str(item.get('id')) not in chunk for item in items):
+                # The endpoint ignored the filter, look the ids up one by one
+                # instead of walking every page of the list.
+                return None
+            if response.links.get('next'):
+                for page in self._iter_pages(extra, 'dict', 2):
+                    items.extend(page)
+            return items
+
+        def fetch_one(id):
+            try:
+                return self._decode(self._make_request(
+                    self.resource_name, resource_id=id,
+                    extra=_get_extra(None, fields)), mode)
+            except APIError as e:
+                if e.code == 404:
+                    return None
+                raise
+
+        single = list(wanted)
+        chunk_size = min(chunk_size, self.max_per_page)
+        if self.ids_filter:
+            chunks = [single[i:i + chunk_size]
+                      for i in range(0, len(single), chunk_size)]
+            single = []
+            for chunk, future in bounded_map(fetch_chunk, chunks, parallel):
+                items = future.result()
+                if items is None:
+                    single.extend(chunk)
+                    continue
+                for item in items:
+                    found[wanted[str(item['id'])]] = wrap(item)
+
+        for id, future in bounded_map(fetch_one, single, parallel):
+            item = future.result()
+            if item is not None:
+                found[wanted[id]] = item
+
+        missing = [id for id in wanted.values() if id not in found]
+        return found, missing
+
+    def _prefetch_pages(self, extra, mode, prefetch, checkpoint):
+        executor = ThreadPoolExecutor(max_workers=prefetch + 1)
+        pending = deque()
+        next_page = checkpoint.page
+
+        def fill(size):
+            nonlocal next_page
+            while len(pending) < size:
+                pending.append(executor.submit(self._get_page, extra, next_page))
+                next_page = next_page + 1
+
+        try:
+            fill(prefetch + 1)
+            page = checkpoint.page
+            while True:
+                response = pending.popleft().result()
+                if response.links.get('next'):
+                    # Keep ``prefetch`` pages in flight while this one is
+                    # being consumed.
+                    fill(prefetch)
+                decoded = self._decode(response, mode)
+                if mode != 'raw':
+                    checkpoint.see_page(decoded)
+                yield decoded
+                checkpoint.advance(page + 1)
+                if not response.links.get('next'):
+                    checkpoint.finish()
+                    break
+                page = page + 1
+        finally:
+            # Speculative requests past the last page are discarded unread.
+            for future in pending:
+                future.cancel()
+            executor.shutdown(wait=False)
+
+    def add(self, resource_dict, raw=False, as_dict=False, records=False):
+        mode = self._get_mode(raw, as_dict, records)
+        return self._decode(self._make_request(self.resource_name, data=resource_dict, verb='post'), mode, text=True)
+
+    def update(self, resource_update_dict, raw=False, as_dict=False,
+               records=False):
         res_id = str(resource_update_dict['id'])
-        return munchify(json.loads(self._make_request(self.resource_name, resource_id=res_id, data=resource_update_dict, verb='put').text))
+        mode = self._get_mode(raw, as_dict, records)
+        return self._decode(self._make_request(self.resource_name, resource_id=res_id, data=resource_update_dict, verb='put'), mode, text=True)
 
-    def command(self, resource_update_dict, **kwargs):
+    def command(self, resource_update_dict, raw=False, as_dict=False,
+                records=False, **kwargs):
         res_id = str(resource_update_dict['id'])
-        return munchify(
-            json.loads(
-                self._make_request(
-                    self.resource_name, resource_id=res_id,
-                    data=resource_update_dict, verb='post', **kwargs
-                ).text
-            )
+        mode = self._get_mode(raw, as_dict, records)
+        return self._decode(
+            self._make_request(
+                self.resource_name, resource_id=res_id,
+                data=resource_update_dict, verb='post', **kwargs
+            ),
+            mode, text=True
         )
 
-    def delete(self, resource_delete_dict):
+    def delete(self, resource_delete_dict, raw=False, as_dict=False,
+               records=False):
         res_id = str(resource_delete_dict['id'])
-        return munchify(json.loads(self._make_request(self.resource_name, resource_id=res_id, verb='delete').text))
+        mode = self._get_mode(raw, as_dict, records)
+        return self._decode(self._make_request(self.resource_name, resource_id=res_id, verb='delete'), mode, text=True)
+
+    def bulk_add(self, items, concurrency=8, ordered=False, **kwargs):
+        """
+        Add every item of ``items`` running up to ``concurrency`` requests at
+        once, and yield a ``BulkResult`` per item.
+
+        ``items`` may be any iterable, including a generator; it is only
+        advanced as requests complete, so the producer is held back while
+        all slots are busy. Failures are reported in their result instead of
+        stopping the run. Results come as they complete unless ``ordered``
+        is set. Other keywords are passed to ``add``.
+        """
+        return self._bulk(self.add, items, concurrency, ordered, kwargs)
+
+    def bulk_update(self, items, concurrency=8, ordered=False, **kwargs):
+        """
+        Like ``bulk_add``, calling ``update`` for each item.
+        """
+        return self._bulk(self.update, items, concurrency, ordered, kwargs)
+
+    def bulk_delete(self, items, concurrency=8, ordered=False, **kwargs):
+        """
+        Like ``bulk_add``, calling ``delete`` for each item.
+        """
+        return self._bulk(self.delete, items, concurrency, ordered, kwargs)
+
+    def _call_bulk(self, method, item, kwargs):
+        return method(item, **kwargs)
+
+    def _bulk(self, method, items, concurrency, ordered, kwargs):
+        def call(item):
+            return self._call_bulk(method, item, kwargs)
+
+        for item, future in bounded_map(call, items, concurrency, ordered):
+            error = future.exception()
+            yield BulkResult(item, None if error else future.result(), error)
 
 
 class ListSubResource(ListResource):
+    """
+    The bulk methods take ``(resource_id, subresource_dict)`` pairs.
+    """
+
+    # Record types of the subresources known to have one.
+    record_classes = {
+        'images': Image,
+        'variants': Variant,
+    }
 
     def __init__(self, resource, subresource):
         super(ListSubResource, self).__init__(resource._http_client, resource.store_id)
         self.resource_name = resource.resource_name
         self.subresource = subresource
+        self.record_class = self.record_classes.get(subresource, Record)
 
-    def get(self, resource_id, id):
-        return munchify(json.loads(self._make_request(
+    def get(self, resource_id, id, raw=False, as_dict=False, records=False):
+        mode = self._get_mode(raw, as_dict, records)
+        return self._decode(self._make_request(
             self.resource_name,
             resource_id=str(resource_id),
             subresource=self.subresource,
-            subresource_id=str(id)).content)
-        )
+            subresource_id=str(id)), mode)
 
-    def list(self, resource_id, filters={}, fields={}):
+    def list(self, resource_id, filters=None, fields=None, prefetch=0,
+             stream=False, raw=False, as_dict=False, records=False,
+             resume_from=None, pagination=None):
         """
-        Get the list of customers for a store.
+        Get the pages of subresources of a resource, following the ``next``
+        links with the same ``prefetch``, ``stream``, ``resume_from`` and
+        ``pagination`` options as ``ListResource.list``.
         """
-        extra = {k:_get_value(v) for k,v in filters.items()}
-        if fields:
-            extra['fields'] = fields
-        return munchify(json.loads(self._make_request(
-            self.resource_name,
-            resource_id=str(resource_id),
-            subresource=self.subresource,
-            extra=extra).content)
-        )
+        return super(ListSubResource, self._bind(resource_id)).list(
+            filters, fields, prefetch=prefetch, stream=stream, raw=raw,
+            as_dict=as_dict, records=records, resume_from=resume_from,
+            pagination=pagination)
+
+    def iter_items(self, resource_id, filters=None, fields=None, limit=None,
+                   **kwargs):
+        """
+        Iterate over the subresources of a resource one at a time, across
+        every page.
+        """
+        if kwargs.get('raw'):
+            raise ValueError('Raw bodies cannot be split into items')
+        return _iter_items(self.list(resource_id, filters, fields, **kwargs),
+                           limit)
+
+    def list_for(self, resource_ids, filters=None, fields=None, parallel=4,
+                 ordered=True, **kwargs):
+        """
+        Get every subresource of several resources, listing ``parallel``
+        resources at a time, and yield ``(resource_id, items)`` pairs in
+        input order, or as each one completes when ``ordered`` is false.
+        Other keywords are passed to ``iter_items``.
+        """
+        def fetch(resource_id):
+            return list(self.iter_items(resource_id, filters, fields, **kwargs))
+
+        for resource_id, future in bounded_map(fetch, resource_ids, parallel,
+                                               ordered):
+            yield resource_id, future.result()
+
+    def _bind(self, resource_id):
+        # A copy listing the subresources of one resource through the page
+        # helpers of ListResource.
+        bound = copy.copy(self)
+        bound._resource_id = str(resource_id)
+        return bound
+
+    def _get_checkpoint_name(self):
+        return '{}/{}/{}'.format(self.resource_name, self._resource_id,
+                                 self.subresource)
 
-    def add(self, resource_id, subresource_dict):
-        return munchify(json.loads(self._make_request(
+    def _get_page(self, extra, page, **kwargs):
+        if page > 1:
+            extra = dict(extra, page=page)
+        return self._make_request(self.resource_name,
+                                  resource_id=self._resource_id,
+                                  subresource=self.subresource,
+                                  extra=extra, **kwargs)
+
+    def add(self, resource_id, subresource_dict, raw=False, as_dict=False,
+            records=False):
+        mode = self._get_mode(raw, as_dict, records)
+        return self._decode(self._make_request(
             self.resource_name,
             resource_id=str(resource_id),
             subresource=self.subresource,
             data=subresource_dict,
-            verb='post').text))
+            verb='post'), mode, text=True)
 
-    def update(self, resource_id, subresource_update_dict):
-        return munchify(json.loads(self._make_request(
+    def update(self, resource_id, subresource_update_dict, raw=False,
+               as_dict=False, records=False):
+        mode = self._get_mode(raw, as_dict, records)
+        return self._decode(self._make_request(
             self.resource_name,
             resource_id=str(resource_id),
             subresource=self.subresource,
             subresource_id=subresource_update_dict['id'],
             data=subresource_update_dict,
-            verb='put').text))
+            verb='put'), mode, text=True)
+
+    def delete(self, resource_id, subresource_delete_dict, raw=False,
+               as_dict=False, records=False):
+        mode = self._get_mode(raw, as_dict, records)
+        return self._decode(self._make_request(
+            self.resource_name,
+            resource_id=str(resource_id),
+            subresource=self.subresource,
+            subresource_id=str(subresource_delete_dict['id']),
+            verb='delete'), mode, text=True)
+
+    def _call_bulk(self, method, item, kwargs):
+        resource_id, subresource_dict = item
+        return method(resource_id, subresource_dict, **kwargs)
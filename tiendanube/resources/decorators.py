@@ -1,21 +1,187 @@
 # -*- coding: utf-8 -*-
+from munch import Munch
+
+from ..concurrency import bounded_map
 from .base import ListSubResource
+from .pagination import PageIterator
+
+
+class BoundSubResource(object):
+    """
+    The subresource of one object. ``list`` loads every item on first use
+    and keeps them; the other methods pass the object id along.
+    """
+
+    def __init__(self, subresource, resource_id, items=None):
+        self.subresource = subresource
+        self.resource_id = resource_id
+        self._items = items
+
+    def list(self, refresh=False):
+        if self._items is None or refresh:
+            self._items = list(self.subresource.iter_items(self.resource_id))
+        return self._items
+
+    def get(self, id, **kwargs):
+        return self.subresource.get(self.resource_id, id, **kwargs)
+
+    def add(self, subresource_dict, **kwargs):
+        return self.subresource.add(self.resource_id, subresource_dict, **kwargs)
+
+    def update(self, subresource_update_dict, **kwargs):
+        return self.subresource.update(self.resource_id, subresource_update_dict,
+                                       **kwargs)
+
+    def delete(self, subresource_delete_dict, **kwargs):
+        return self.subresource.delete(self.resource_id, subresource_delete_dict,
+                                       **kwargs)
+
+    def __repr__(self):
+        return '<{} {}/{}/{}>'.format(type(self).__name__,
+                                      self.subresource.resource_name,
+                                      self.resource_id,
+                                      self.subresource.subresource)
+
+
+def _get_subresource(resource, name):
+    subresource = getattr(resource, name, None)
+    if not isinstance(subresource, ListSubResource):
+        subresource = ListSubResource(resource, name)
+        setattr(resource, name, subresource)
+    return subresource
+
+
+class SubResources(object):
+    """
+    The ``BoundSubResource`` of each subresource of an expanded object,
+    built on first access and kept. Expanded subresources start with the
+    items fetched along with the object.
+    """
+
+    def __init__(self, resource, obj, names):
+        self._resource = resource
+        self._obj = obj
+        self._names = names
+        self._bound = {}
+
+    def __getattr__(self, name):
+        if name.startswith('_') or name not in self._names:
+            raise AttributeError(name)
+        bound = self._bound.get(name)
+        if bound is None:
+            items = self._obj.get(name)
+            bound = BoundSubResource(_get_subresource(self._resource, name),
+                                     self._obj['id'],
+                                     items if isinstance(items, list) else None)
+            self._bound[name] = bound
+        return bound
+
+
+class ExpandedMunch(Munch):
+    """
+    A ``Munch`` returned by ``get`` or ``list`` with ``expand``. Its data is
+    that of a plain ``Munch``, with the expanded subresources stored under
+    their names; ``subresources`` gives access to every subresource of the
+    object. Copies and pickles keep only the data.
+    """
+
+    @property
+    def subresources(self):
+        try:
+            return object.__getattribute__(self, '_subresources')
+        except AttributeError:
+            raise AttributeError('subresources')
 
 
 def subresources(subresource_names):
+    """
+    Let ``get`` and ``list`` of a ``ListResource`` take ``expand``, a list
+    of ``subresource_names`` whose items are fetched along with the objects
+    and stored in them: the parent and subresources concurrently for
+    ``get``, and up to ``parallel`` at a time for the objects of each
+    ``list`` page. Results without ``expand`` are left as they are.
+    """
     def _decorated(klass):
         orig_get = klass.get
+        orig_list = klass.list
 
-        def get_wrapper(self, id):
-            obj = orig_get(self, id)
-            for subresource in subresource_names:
-                setattr(
-                    obj,
-                    subresource,
-                    ListSubResource(self, id, subresource)
-                )
+        def check(expand, mode):
+            unknown = set(expand) - set(subresource_names)
+            if unknown:
+                raise ValueError('Cannot expand {}'.format(', '.join(sorted(unknown))))
+            if mode == 'raw':
+                raise ValueError('Raw bodies cannot be expanded')
+
+        def wrap_expanded(self, data, mode):
+            obj = self._get_wrap(mode)(data)
+            if mode == 'munch':
+                obj = ExpandedMunch(obj)
+                object.__setattr__(obj, '_subresources',
+                                   SubResources(self, obj, subresource_names))
             return obj
 
+        def fetch_items(self, id, name):
+            return list(_get_subresource(self, name).iter_items(id, as_dict=True))
+
+        def get_wrapper(self, id, raw=False, as_dict=False, records=False,
+                        expand=None):
+            if not expand:
+                return orig_get(self, id, raw=raw, as_dict=as_dict,
+                                records=records)
+            mode = self._get_mode(raw, as_dict, records)
+            check(expand, mode)
+
+            def fetch(name):
+                if name is None:
+                    return orig_get(self, id, as_dict=True)
+                return fetch_items(self, id, name)
+
+            results = [future.result() for _, future in
+                       bounded_map(fetch, [None] + list(expand), len(expand) + 1)]
+            data = results[0]
+            for name, items in zip(expand, results[1:]):
+                data[name] = items
+            return wrap_expanded(self, data, mode)
+
+        def expand_page(self, page, expand, mode, parallel):
+            pairs = [(item, name) for item in page for name in expand]
+
+            def fetch(pair):
+                return fetch_items(self, pair[0]['id'], pair[1])
+
+            for (item, name), future in bounded_map(fetch, pairs, parallel):
+                item[name] = future.result()
+            return [wrap_expanded(self, item, mode) for item in page]
+
+        def expand_pages(self, pages, expand, mode, parallel):
+            try:
+                for page in pages:
+                    yield expand_page(self, page, expand, mode, parallel)
+            finally:
+                pages.close()
+
+        def list_wrapper(self, filters=None, fields=None, prefetch=0,
+                         stream=False, raw=False, as_dict=False, records=False,
+                         resume_from=None, pagination=None, expand=None,
+                         parallel=4):
+            if not expand:
+                return orig_list(self, filters, fields, prefetch=prefetch,
+                                 stream=stream, raw=raw, as_dict=as_dict,
+                                 records=records, resume_from=resume_from,
+                                 pagination=pagination)
+            mode = self._get_mode(raw, as_dict, records)
+            check(expand, mode)
+            if stream:
+                raise ValueError('stream and expand cannot be combined')
+            pages = orig_list(self, filters, fields, prefetch=prefetch,
+                              as_dict=True, resume_from=resume_from,
+                              pagination=pagination)
+            return PageIterator(expand_pages(self, pages, expand, mode, parallel),
+                                pages.checkpoint)
+
+        get_wrapper.__doc__ = orig_get.__doc__
+        list_wrapper.__doc__ = orig_list.__doc__
         klass.get = get_wrapper
+        klass.list = list_wrapper
         return klass
-    return _decorated
\ No newline at end of file
+    return _decorated
@@ -4,3 +4,8 @@ class APIError(Exception):
 
     def __init__(self, message, code):
         Exception.__init__(self, '{}. Status code: {}'.format(message, code))
+        self.code = code
+
+
+class PaginationError(Exception):
+    pass
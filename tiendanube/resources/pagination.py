@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+from ..sync import parse_datetime
+
+PAGINATIONS = ('page', 'keyset')
+
+
+class Checkpoint(object):
+    """
+    Where a listing stands: the ``filters`` and ``fields`` it was started
+    with, the next ``page`` to request, and the highest ``since_id`` and
+    latest ``updated_at`` among the items already handed out.
+
+    A page counts as handed out once the caller asks for the next one, so
+    resuming repeats at most the page being processed when the process
+    stopped. ``to_dict`` and ``from_dict`` turn it into plain JSON and back.
+    """
+
+    def __init__(self, resource, filters=None, fields=None, pagination='page',
+                 page=1, since_id=None, updated_at=None, done=False):
+        if pagination not in PAGINATIONS:
+            raise ValueError('Unknown pagination: {}'.format(pagination))
+        self.resource = resource
+        self.filters = dict(filters or {})
+        self.fields = fields or None
+        self.pagination = pagination
+        self.page = page
+        self.since_id = since_id
+        self.updated_at = updated_at
+        self.done = done
+        self._last_id = None
+        self._last_updated_at = None
+
+    def to_dict(self):
+        return {
+            'resource': self.resource,
+            'filters': dict(self.filters),
+            'fields': self.fields,
+            'pagination': self.pagination,
+            'page': self.page,
+            'since_id': self.since_id,
+            'updated_at': self.updated_at,
+            'done': self.done,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(**data)
+
+    def copy(self):
+        return self.from_dict(self.to_dict())
+
+    def get_extra(self):
+        extra = dict(self.filters)
+        if self.fields:
+            extra['fields'] = self.fields
+        return extra
+
+    def see(self, item):
+        """
+        Note an item of the page being handed out.
+        """
+        id = item.get('id')
+        if id is not None and (self._last_id is None or id > self._last_id):
+            self._last_id = id
+        updated_at = item.get('updated_at')
+        if updated_at and (self._last_updated_at is None or
+                           parse_datetime(updated_at) >
+                           parse_datetime(self._last_updated_at)):
+            self._last_updated_at = updated_at
+
+    def see_page(self, items):
+        if isinstance(items, list):
+            for item in items:
+                self.see(item)
+
+    def advance(self, page=None):
+        """
+        Mark the page handed out as done, ``page`` being the next one.
+        """
+        if self._last_id is not None and (self.since_id is None or
+                                          self._last_id > self.since_id):
+            self.since_id = self._last_id
+        if self._last_updated_at is not None:
+            self.updated_at = self._last_updated_at
+        self._last_id = self._last_updated_at = None
+        if page is not None:
+            self.page = page
+
+    def finish(self):
+        self.done = True
+
+    def __eq__(self, other):
+        return (isinstance(other, Checkpoint) and
+                self.to_dict() == other.to_dict())
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __repr__(self):
+        return 'Checkpoint({!r})'.format(self.to_dict())
+
+
+class PageIterator(object):
+    """
+    The pages of a listing along with its ``checkpoint``.
+    """
+
+    def __init__(self, pages, checkpoint):
+        self._pages = pages
+        self.checkpoint = checkpoint
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        return next(self._pages)
+
+    def close(self):
+        self._pages.close()
@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+
+
+def to_records(data, record_class):
+    """
+    Wrap a decoded response, either one object or a page of them, in
+    ``record_class`` records.
+    """
+    if isinstance(data, dict):
+        return record_class(data)
+    if isinstance(data, list):
+        return [to_records(item, record_class) for item in data]
+    return data
+
+
+class Record(object):
+    """
+    Lightweight, read-only view of an API object.
+
+    Attribute and item access read straight from the decoded JSON. Nested
+    objects are wrapped in their record type only when first accessed and
+    then cached, so fields that are never read cost nothing.
+    """
+
+    __slots__ = ('_data', '_cache')
+
+    # Record type of the nested objects held under each field.
+    fields = {}
+
+    def __init__(self, data):
+        self._data = data
+        self._cache = None
+
+    def __getattr__(self, name):
+        # Private and special names are never JSON fields, and reading
+        # ``_data`` here before it is set would recurse.
+        if name.startswith('_'):
+            raise AttributeError(name)
+        try:
+            return self[name]
+        except KeyError:
+            raise AttributeError(name)
+
+    def __reduce__(self):
+        return type(self), (self._data,)
+
+    def __getitem__(self, key):
+        value = self._data[key]
+        if not isinstance(value, (dict, list)):
+            return value
+        if self._cache is None:
+            self._cache = {}
+        elif key in self._cache:
+            return self._cache[key]
+        value = self._cache[key] = to_records(value, self.fields.get(key, Record))
+        return value
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def __iter__(self):
+        return iter(self._data)
+
+    def __len__(self):
+        return len(self._data)
+
+    def __eq__(self, other):
+        if isinstance(other, Record):
+            other = other._data
+        return self._data == other
+
+    def __ne__(self, other):
+        return not self == other
+
+    __hash__ = None
+
+    def __repr__(self):
+        return '{}({!r})'.format(type(self).__name__, self._data)
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def keys(self):
+        return self._data.keys()
+
+    def to_dict(self):
+        """
+        Return the decoded JSON the record wraps.
+        """
+        return self._data
+
+
+class Image(Record):
+    __slots__ = ()
+
+
+class Variant(Record):
+    __slots__ = ()
+
+
+class Category(Record):
+    __slots__ = ()
+
+
+class Customer(Record):
+    __slots__ = ()
+
+
+class Product(Record):
+    __slots__ = ()
+    fields = {
+        'variants': Variant,
+        'images': Image,
+        'categories': Category,
+    }
+
+
+class Order(Record):
+    __slots__ = ()
+    fields = {
+        'customer': Customer,
+    }
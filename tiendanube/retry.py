@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+import datetime
+import random
+from email.utils import parsedate_to_datetime
+
+import requests
+
+# Errors of a request that never got an answer. The asyncio client adds
+# those of aiohttp to its own policy.
+TRANSPORT_ERRORS = (requests.ConnectionError, requests.Timeout)
+
+
+class RetryPolicy(object):
+    """
+    Decides whether a failed request is sent again and how long to wait.
+
+    ``max_attempts`` counts the first try. Delays grow as
+    ``backoff_factor * 2 ** (attempt - 1)`` up to ``max_backoff`` seconds and
+    are drawn at random below that value when ``jitter`` is set. A
+    ``Retry-After`` header, when present, takes precedence. Responses with
+    one of ``statuses`` and transport errors are only retried for
+    ``idempotent_verbs``, except 429 which the API rejects before doing any
+    work and is therefore safe to retry for every verb.
+
+    429 is not among the default ``statuses``: the client's ``RateLimiter``
+    already sends throttled requests again, and retrying them here as well
+    would repeat its whole requeue loop on every attempt.
+    """
+
+    def __init__(self, max_attempts=3, backoff_factor=0.5, max_backoff=30,
+                 jitter=True, statuses=(500, 502, 503, 504),
+                 idempotent_verbs=('get', 'put', 'delete'),
+                 retry_after=True, exceptions=None):
+        self.max_attempts = max_attempts
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.statuses = statuses
+        self.idempotent_verbs = idempotent_verbs
+        self.retry_after = retry_after
+        self.exceptions = exceptions or TRANSPORT_ERRORS
+
+    def should_retry(self, verb, attempt, status_code=None, error=None):
+        if attempt >= self.max_attempts:
+            return False
+        if error is not None:
+            return (isinstance(error, self.exceptions) and
+                    verb.lower() in self.idempotent_verbs)
+        if status_code not in self.statuses:
+            return False
+        return status_code == 429 or verb.lower() in self.idempotent_verbs
+
+    def get_delay(self, attempt, response=None):
+        if self.retry_after and response is not None:
+            delay = self._get_retry_after(response)
+            if delay is not None:
+                return min(delay, self.max_backoff)
+        delay = min(self.max_backoff, self.backoff_factor * 2 ** (attempt - 1))
+        if self.jitter:
+            delay = random.uniform(0, delay)
+        return delay
+
+    def _get_retry_after(self, response):
+        try:
+            value = response.headers.get('retry-after')
+        except AttributeError:
+            return None
+        if not isinstance(value, str):
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            date = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        now = datetime.datetime.now(datetime.timezone.utc)
+        return max(0.0, (date - now).total_seconds())
+
+
+NO_RETRY = RetryPolicy(max_attempts=1)
@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+import collections
+import contextlib
+import threading
+
+
+class FairScheduler(object):
+    """
+    Shares ``max_concurrent`` request slots among stores.
+
+    While slots are free requests go straight through. Once they are all
+    taken, waiting requests queue up per store and freed slots are handed
+    to the stores in turn, one request each, so a store with thousands of
+    queued requests does not starve the others.
+    """
+
+    def __init__(self, max_concurrent=10):
+        self.max_concurrent = max_concurrent
+        self._active = 0
+        self._waiting = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def active(self):
+        return self._active
+
+    def acquire(self, store_id):
+        with self._lock:
+            if self._active < self.max_concurrent and not self._waiting:
+                self._active += 1
+                return
+            event = threading.Event()
+            self._waiting.setdefault(store_id, collections.deque()).append(event)
+        event.wait()
+
+    def release(self):
+        with self._lock:
+            if not self._waiting:
+                self._active -= 1
+                return
+            # Hand the slot over to the next store, which goes to the back
+            # of the line if it has more requests waiting.
+            store_id, queue = self._waiting.popitem(last=False)
+            event = queue.popleft()
+            if queue:
+                self._waiting[store_id] = queue
+        event.set()
+
+    @contextlib.contextmanager
+    def slot(self, store_id):
+        self.acquire(store_id)
+        try:
+            yield
+        finally:
+            self.release()
@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+import datetime
+import json
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+try:
+    import ujson
+except ImportError:  # pragma: no cover
+    ujson = None
+
+
+def _default(obj):
+    # Dates go out the same way date filters do, whatever the backend.
+    if isinstance(obj, (datetime.datetime, datetime.date)):
+        return obj.isoformat()
+    raise TypeError('{!r} is not JSON serializable'.format(obj))
+
+
+class JSONSerializer(object):
+    """
+    Encodes request bodies and decodes response bodies with the standard
+    library ``json`` module.
+    """
+
+    name = 'json'
+
+    def dumps(self, obj):
+        return json.dumps(obj, default=_default)
+
+    def loads(self, data):
+        return json.loads(data)
+
+
+class OrjsonSerializer(JSONSerializer):
+
+    name = 'orjson'
+
+    def dumps(self, obj):
+        return orjson.dumps(obj, default=_default,
+                            option=orjson.OPT_PASSTHROUGH_DATETIME)
+
+    def loads(self, data):
+        return orjson.loads(data)
+
+
+class UjsonSerializer(JSONSerializer):
+
+    name = 'ujson'
+
+    def dumps(self, obj):
+        return ujson.dumps(obj, default=_default)
+
+    def loads(self, data):
+        return ujson.loads(data)
+
+
+SERIALIZERS = [
+    (OrjsonSerializer, orjson),
+    (UjsonSerializer, ujson),
+    (JSONSerializer, json),
+]
+
+
+def get_serializer(name=None):
+    """
+    Return a serializer instance.
+
+    ``name`` is one of ``'json'``, ``'orjson'`` or ``'ujson'``; ``'auto'``
+    picks the fastest installed backend. Without a name the standard
+    library is used, which keeps request bodies byte for byte the same as
+    ``json.dumps``.
+    """
+    if name is None:
+        return JSONSerializer()
+    for klass, module in SERIALIZERS:
+        if module is None:
+            if klass.name == name:
+                raise ImportError('{} is not installed'.format(name))
+            continue
+        if name in ['auto', klass.name]:
+            return klass()
+    raise ValueError('Unknown serializer: {}'.format(name))
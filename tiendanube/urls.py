@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+import re
+from functools import lru_cache
+from urllib.parse import quote
+
+from furl import furl
+
+# Characters furl leaves unquoted in path segments.
+SAFE_SEGMENT_CHARS = ":@-._~!$&'()*+,;="
+
+_SAFE_SEGMENT = re.compile(r"[A-Za-z0-9:@\-._~!$&'()*+,;=]*")
+
+
+@lru_cache(maxsize=8192)
+def base_url(endpoint, version, id, resource):
+    """
+    The URL of a resource of a store, built once per store and resource.
+    """
+    url = furl(endpoint)
+    url.path.segments = [version, id]
+    if resource:
+        url.path.segments.append(resource)
+    return str(url)
+
+
+def quote_segment(segment):
+    """
+    Quote a path segment exactly as furl does.
+    """
+    if not isinstance(segment, str):
+        segment = str(segment)
+    if _SAFE_SEGMENT.fullmatch(segment):
+        return segment
+    return quote(segment.encode('utf-8'), SAFE_SEGMENT_CHARS)
+
+
+def build_url(endpoint, version, id, resource, options=()):
+    """
+    Same as building the URL with furl from the ``version``, ``id``,
+    ``resource`` and ``options`` path segments, without parsing the
+    endpoint on every call.
+    """
+    url = base_url(endpoint, version, id, resource)
+    if not options:
+        return url
+    return url + '/' + '/'.join(quote_segment(option) for option in options)
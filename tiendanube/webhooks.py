@@ -0,0 +1,314 @@
+# -*- coding: utf-8 -*-
+import collections
+import hashlib
+import hmac
+import json
+import logging
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+SIGNATURE_HEADER = 'x-linkedstore-hmac-sha256'
+
+# Event prefixes mapped to the Store attribute of the resource.
+RESOURCES = {
+    'product': 'products',
+    'order': 'orders',
+    'category': 'categories',
+    'customer': 'customers',
+}
+
+
+class WebhookError(Exception):
+    pass
+
+
+class InvalidSignature(WebhookError):
+    pass
+
+
+def sign(body, secret):
+    """
+    The signature the API sends with ``body``: the hex HMAC-SHA256 of the
+    raw body keyed with the app secret.
+    """
+    if isinstance(body, str):
+        body = body.encode('utf-8')
+    if isinstance(secret, str):
+        secret = secret.encode('utf-8')
+    return hmac.new(secret, body, hashlib.sha256).hexdigest()
+
+
+def verify_signature(body, signature, secret):
+    if not signature:
+        return False
+    return hmac.compare_digest(sign(body, secret), signature.strip().lower())
+
+
+class WebhookEvent(collections.namedtuple('WebhookEvent',
+                                          'store_id event resource action id')):
+    """
+    A parsed notification. ``resource`` is the ``Store`` attribute the
+    event refers to, or None for events such as ``app/uninstalled``.
+    """
+
+    __slots__ = ()
+
+    @property
+    def key(self):
+        return (self.store_id, self.resource, self.id)
+
+    @property
+    def deleted(self):
+        return self.action == 'deleted'
+
+
+def parse_event(body, headers=None, secret=None):
+    """
+    Parse a webhook body into a ``WebhookEvent``.
+
+    Given the ``secret``, the signature in ``headers`` is checked first and
+    ``InvalidSignature`` raised when it does not match.
+    """
+    if secret is not None:
+        headers = dict((k.lower(), v) for k, v in (headers or {}).items())
+        if not verify_signature(body, headers.get(SIGNATURE_HEADER), secret):
+            raise InvalidSignature('Invalid webhook signature')
+    if isinstance(body, bytes):
+        body = body.decode('utf-8')
+    try:
+        data = json.loads(body)
+        name = data['event']
+        store_id = str(data['store_id'])
+    except (ValueError, TypeError, KeyError):
+        raise WebhookError('Malformed webhook body')
+    prefix, _, action = name.partition('/')
+    return WebhookEvent(store_id, name, RESOURCES.get(prefix), action,
+                        data.get('id'))
+
+
+class Debouncer(object):
+    """
+    Collapses bursts of events about the same object.
+
+    Events are held until no other event for the same store, resource and
+    id arrived for ``delay`` seconds, or for ``max_wait`` seconds since the
+    first one of the burst; the latest one is then handed to ``callback``
+    together with every other due event, as a list, so they can be
+    processed in batches. Call ``flush`` periodically or ``start`` a
+    background thread that does it.
+
+    A batch whose callback raises is queued again, unless newer events
+    arrived meanwhile, and retried after ``delay``. The background thread
+    logs the error and keeps going.
+    """
+
+    def __init__(self, callback, delay=2.0, interval=0.5, max_wait=30.0):
+        self.callback = callback
+        self.delay = delay
+        self.interval = interval
+        self.max_wait = max_wait
+        self._pending = collections.OrderedDict()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def __len__(self):
+        return len(self._pending)
+
+    def add(self, event):
+        now = time.monotonic()
+        with self._lock:
+            _, _, first = self._pending.pop(event.key, (None, None, now))
+            deadline = min(now + self.delay, first + self.max_wait)
+            self._pending[event.key] = (event, deadline, first)
+
+    def flush(self, force=False):
+        """
+        Pass the due events (every event when ``force`` is set) to the
+        callback and return them.
+        """
+        now = time.monotonic()
+        with self._lock:
+            due = [key for key, (_, deadline, _) in self._pending.items()
+                   if force or deadline <= now]
+            events = [self._pending.pop(key)[0] for key in due]
+        if events:
+            try:
+                self.callback(events)
+            except Exception:
+                self._requeue(events)
+                raise
+        return events
+
+    def _requeue(self, events):
+        deadline = time.monotonic() + self.delay
+        with self._lock:
+            for event in events:
+                if event.key not in self._pending:
+                    self._pending[event.key] = (event, deadline, deadline)
+
+    def start(self):
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self, flush=True):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if flush:
+            self.flush(force=True)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.flush()
+            except Exception:
+                logger.exception('Webhook batch failed, it will be retried')
+
+
+class WebhookProcessor(object):
+    """
+    Applies events to the SDK state instead of having every handler fetch
+    the object again.
+
+    For each batch the cached responses of the changed objects are dropped.
+    With ``refresh`` set, the objects still alive are fetched again with
+    one ``get_many`` per store and resource, then stored in the store's
+    mirror from ``mirrors`` (a mapping of store ids to ``StoreMirror``)
+    and passed to ``on_change(store_id, resource, obj)``. Deleted objects
+    are removed from the mirror and passed to ``on_delete(store_id,
+    resource, id)``.
+    """
+
+    def __init__(self, client, mirrors=None, refresh=True, on_change=None,
+                 on_delete=None, parallel=4):
+        self.client = client
+        self.mirrors = mirrors or {}
+        self.refresh = refresh
+        self.on_change = on_change
+        self.on_delete = on_delete
+        self.parallel = parallel
+
+    def __call__(self, events):
+        self.process(events)
+
+    def process(self, events):
+        groups = collections.OrderedDict()
+        for event in events:
+            if event.resource is None or event.id is None:
+                continue
+            groups.setdefault((event.store_id, event.resource), []).append(event)
+
+        for (store_id, resource), batch in groups.items():
+            self._invalidate(store_id, resource, batch)
+            deleted = [e.id for e in batch if e.deleted]
+            changed = [e.id for e in batch if not e.deleted]
+            if changed and self.refresh:
+                store = self.client.get_store(store_id)
+                found, missing = store[resource].get_many(
+                    changed, parallel=self.parallel, as_dict=True)
+                for id in changed:
+                    if id in found:
+                        self._changed(store_id, resource, found[id])
+                deleted.extend(missing)
+            for id in deleted:
+                self._deleted(store_id, resource, id)
+
+    def _invalidate(self, store_id, resource, batch):
+        http_client = self.client._http_client
+        if http_client.cache is None:
+            return
+        for event in batch:
+            http_client._invalidate(store_id, resource,
+                                    {'resource_id': str(event.id)})
+
+    def _changed(self, store_id, resource, obj):
+        mirror = self.mirrors.get(store_id)
+        if mirror is not None and resource in mirror.RESOURCES:
+            mirror.apply(resource, obj)
+        if self.on_change is not None:
+            self.on_change(store_id, resource, obj)
+
+    def _deleted(self, store_id, resource, id):
+        mirror = self.mirrors.get(store_id)
+        if mirror is not None and resource in mirror.RESOURCES:
+            mirror.remove(resource, id)
+        if self.on_delete is not None:
+            self.on_delete(store_id, resource, id)
+
+
+class WebhookServer(object):
+    """
+    A small local receiver standing in for an app's webhook endpoint, for
+    development and tests. Signed events posted to ``url`` are parsed and
+    passed to ``on_event``; bad signatures get a 401 and malformed bodies
+    a 400.
+    """
+
+    def __init__(self, secret, on_event, host='127.0.0.1', port=0):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+
+            def do_POST(self):
+                length = int(self.headers.get('Content-Length') or 0)
+                body = self.rfile.read(length)
+                try:
+                    event = parse_event(body, dict(self.headers.items()),
+                                        server.secret)
+                except InvalidSignature:
+                    self.send_response(401)
+                except WebhookError:
+                    self.send_response(400)
+                else:
+                    server.on_event(event)
+                    self.send_response(200)
+                self.end_headers()
+
+            def log_message(self, *args):
+                pass
+
+        self.secret = secret
+        self.on_event = on_event
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return 'http://{}:{}/'.format(host, port)
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever,
+                                        daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+
+def send_event(url, secret, store_id, event, id=None, session=None):
+    """
+    Post a signed event the way the API does and return the response.
+    """
+    body = json.dumps({'store_id': store_id, 'event': event, 'id': id})
+    headers = {'Content-Type': 'application/json',
+               SIGNATURE_HEADER: sign(body, secret)}
+    return (session or requests).post(url, data=body, headers=headers)